@@ -0,0 +1,95 @@
+"""
+Load test comparing the sync (threadpool + psycopg2) and async (asyncpg) endpoint
+paths. It needs the API running locally, e.g. with Docker Compose, and creates (then
+deletes) one task that both paths read concurrently.
+
+Run with:
+
+    python -m benchmarks.bench_async_load --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def _hammer(client: httpx.AsyncClient, url: str, requests: int, concurrency: int):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": requests / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "p99": quantiles[98] * 1000,
+        "errors": errors,
+    }
+
+
+async def main(base_url: str, requests: int, concurrency: int):
+    user_id = f"bench-{uuid.uuid4()}"
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        response = await client.post(
+            f"/v1/tasks/{user_id}",
+            json={
+                "name": "Load test task",
+                "status": "To Do",
+                "type": "Work",
+                "correspondenceEmailAddress": "bench@localhost",
+            },
+        )
+        response.raise_for_status()
+        task_id = response.json()["id"]
+
+        try:
+            for label, prefix in (("sync", "/v1"), ("async", "/v1/async")):
+                # Warm up the connection pools before measuring.
+                await _hammer(
+                    client, f"{prefix}/tasks/{user_id}/{task_id}", concurrency, 10
+                )
+                result = await _hammer(
+                    client,
+                    f"{prefix}/tasks/{user_id}/{task_id}",
+                    requests,
+                    concurrency,
+                )
+                print(
+                    f"{label:6} {result['rps']:9.1f} req/s  "
+                    f"p50 {result['p50']:7.1f}ms  p95 {result['p95']:7.1f}ms  "
+                    f"p99 {result['p99']:7.1f}ms  errors {result['errors']}"
+                )
+        finally:
+            await client.delete(f"/v1/tasks/{user_id}/{task_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.base_url, args.requests, args.concurrency))
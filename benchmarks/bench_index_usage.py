@@ -0,0 +1,131 @@
+"""
+Seeds a local Postgres with tasks and personal notes and asserts, via EXPLAIN, that
+the hot lookups made by the API are answered with an index instead of a sequential
+scan. Everything runs inside a transaction that is rolled back at the end, so the
+database is left as it was.
+
+Run with (migrations must be applied first):
+
+    python -m benchmarks.bench_index_usage
+"""
+import json
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+from plm.settings import PlmSettings
+from plm.services.db import get_engine
+
+USERS = 200
+TASKS_PER_USER = 500
+NOTES_PER_TASK = 2
+
+SEED_TASKS = text(
+    """
+    insert into task (name, status, type, user_id, correspondence_email_address, created_by, created_on)
+    select 'task-' || t, 'To Do', 'Work', 'bench-user-' || u, 'bench@localhost', 'bench', now()
+    from generate_series(1, :users) u, generate_series(1, :tasks_per_user) t
+    """
+)
+
+SEED_NOTES = text(
+    """
+    insert into personal_note (task_id, name, type, note, user_id, correspondence_email_address, created_by, created_on)
+    select t.id, t.name || '-note-' || n, 'Observations', 'Bench note', t.user_id, 'bench@localhost', 'bench', now()
+    from task t, generate_series(1, :notes_per_task) n
+    where t.user_id like 'bench-user-%'
+    """
+)
+
+# One entry per hot query in plm/endpoints/helpers and the list endpoints.
+QUERIES = {
+    "get_task_or_404": (
+        "select * from task where user_id = :user_id and id = :task_id",
+        "task",
+    ),
+    "task_by_name": (
+        "select * from task where name = :name and user_id = :user_id limit 1",
+        "task",
+    ),
+    "get_tasks": (
+        "select * from task where user_id = :user_id order by id limit 50",
+        "task",
+    ),
+    "get_personal_note_or_404": (
+        "select * from personal_note where user_id = :user_id and task_id = :task_id and id = :note_id",
+        "personal_note",
+    ),
+    "task_has_existing_personal_notes": (
+        "select * from personal_note where task_id = :task_id limit 1",
+        "personal_note",
+    ),
+    "get_personal_notes": (
+        "select * from personal_note where user_id = :user_id and task_id = :task_id",
+        "personal_note",
+    ),
+}
+
+
+def _scans(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _scans(child)
+
+
+def main():
+    load_dotenv()
+    engine = get_engine(PlmSettings())
+
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            start = time.perf_counter()
+            conn.execute(SEED_TASKS, {"users": USERS, "tasks_per_user": TASKS_PER_USER})
+            conn.execute(SEED_NOTES, {"notes_per_task": NOTES_PER_TASK})
+            conn.execute(text("analyze task"))
+            conn.execute(text("analyze personal_note"))
+            print(f"Seeded data in {time.perf_counter() - start:.2f}s")
+
+            task_id, name = conn.execute(
+                text(
+                    "select id, name from task where user_id = 'bench-user-100' limit 1"
+                )
+            ).one()
+            note_id = conn.execute(
+                text("select id from personal_note where task_id = :task_id limit 1"),
+                {"task_id": task_id},
+            ).scalar_one()
+            params = {
+                "user_id": "bench-user-100",
+                "task_id": task_id,
+                "note_id": note_id,
+                "name": name,
+            }
+
+            failures = []
+            for query_name, (sql, table) in QUERIES.items():
+                plan = conn.execute(
+                    text(f"explain (analyze, format json) {sql}"), params
+                ).scalar_one()
+                plan = plan if isinstance(plan, list) else json.loads(plan)
+                root = plan[0]["Plan"]
+                scans = [
+                    node for node in _scans(root) if node.get("Relation Name") == table
+                ]
+                used = ", ".join(
+                    f"{node['Node Type']} ({node.get('Index Name', '-')})"
+                    for node in scans
+                )
+                print(f"{query_name:35} {plan[0]['Execution Time']:8.3f}ms  {used}")
+
+                if any(node["Node Type"] == "Seq Scan" for node in scans):
+                    failures.append(query_name)
+        finally:
+            transaction.rollback()
+
+    assert not failures, f"Sequential scans found for: {', '.join(failures)}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measures how many entities per second can be built the ways the API builds them:
+a Task from a validated TaskCreate, as the create endpoints do, and a Task from a
+row returned by the database, as insert_returning and update_returning do. Each is
+compared with what it replaces, along with the camelCase alias lookup. It needs
+neither the API nor a database.
+
+Run with:
+
+    python -m benchmarks.bench_model_construction --count 20000
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Callable
+
+from humps import camelize
+
+from plm.models import Task, construct_entity, entity_from, to_camel
+from plm.schemas import TaskCreate, TaskResponse
+
+PAYLOAD = TaskCreate(
+    name="Construction bench task",
+    status="To Do",
+    type="Work",
+    correspondence_email_address="bench@localhost",
+)
+
+ROW = {
+    "id": 1,
+    "created_by": "bench@localhost",
+    "created_on": datetime.now(),
+    "modified_by": None,
+    "modified_on": None,
+    "name": "Construction bench task",
+    "status": "To Do",
+    "type": "Work",
+    "user_id": "bench-user",
+    "correspondence_email_address": "bench@localhost",
+}
+
+FIELDS = list(TaskResponse.__fields__)
+
+
+def _create_with_parse_obj():
+    task = Task.parse_obj(PAYLOAD)
+    task.user_id = "bench-user"
+
+
+def _create_with_entity_from():
+    entity_from(Task, PAYLOAD, user_id="bench-user")
+
+
+def _camelize_fields():
+    for field in FIELDS:
+        camelize(field)
+
+
+def _to_camel_fields():
+    for field in FIELDS:
+        to_camel(field)
+
+
+CASES = [
+    ("create, parse_obj", _create_with_parse_obj),
+    ("create, entity_from", _create_with_entity_from),
+    ("row, parse_obj", lambda: Task.parse_obj(ROW)),
+    ("row, construct_entity", lambda: construct_entity(Task, ROW)),
+    ("aliases, camelize", _camelize_fields),
+    ("aliases, to_camel", _to_camel_fields),
+]
+
+
+def _per_second(build: Callable, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        build()
+
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int):
+    for label, build in CASES:
+        # Once first, so one-off work such as configuring the mappers is not timed.
+        build()
+        print(f"{label:25} {_per_second(build, count):12,.0f}/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20_000)
+    args = parser.parse_args()
+
+    main(args.count)
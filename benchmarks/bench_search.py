@@ -0,0 +1,148 @@
+"""
+Times the filtered, sorted and searched list requests for a user with a million
+personal notes. The tasks and notes are seeded straight into a local Postgres for a
+random user, since creating them through the API would take far longer than the
+requests being measured, and deleted again at the end. It needs the API running
+locally, e.g. with Docker Compose, with migrations applied.
+
+Run with:
+
+    python -m benchmarks.bench_search --tasks 10000 --notes-per-task 100
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+import httpx
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+from plm.settings import PlmSettings
+from plm.services.db import get_engine
+
+SEED_TASKS = text(
+    """
+    insert into task (name, status, type, user_id, correspondence_email_address, created_by, created_on)
+    select
+        case when t % 100 = 0 then 'Quarterly report ' else 'Weekly review ' end || t,
+        case when t % 3 = 0 then 'Done' else 'To Do' end,
+        case when t % 2 = 0 then 'Work' else 'Personal' end,
+        :user_id, 'bench@localhost', 'bench', now() - t * interval '1 minute'
+    from generate_series(1, :tasks) t
+    """
+)
+
+# One note in ten of one task in a hundred mentions the budget, so searches for it
+# match a thousandth of the notes, as most real searches match a small part.
+SEED_NOTES = text(
+    """
+    insert into personal_note (task_id, name, type, note, user_id, correspondence_email_address, created_by, created_on)
+    select t.id, 'Note ' || n, 'Observations',
+        'Notes on the progress made so far'
+            || case when t.name like 'Quarterly%' and n % 10 = 0 then ' and the budget overrun' else '' end,
+        t.user_id, 'bench@localhost', 'bench', t.created_on + n * interval '1 second'
+    from task t, generate_series(1, :notes_per_task) n
+    where t.user_id = :user_id
+    """
+)
+
+CLEAN_UP = [
+    "delete from personal_note where user_id = :user_id",
+    "delete from task where user_id = :user_id",
+    "delete from tombstone where user_id = :user_id",
+]
+
+
+def _seed(engine, user_id: str, tasks: int, notes_per_task: int) -> int:
+    with engine.begin() as conn:
+        start = time.perf_counter()
+        conn.execute(SEED_TASKS, {"user_id": user_id, "tasks": tasks})
+        conn.execute(
+            SEED_NOTES,
+            {"user_id": user_id, "notes_per_task": notes_per_task},
+        )
+        print(
+            f"Seeded {tasks} tasks and {tasks * notes_per_task} notes "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+    with engine.connect() as conn:
+        conn.execute(text("analyze task"))
+        conn.execute(text("analyze personal_note"))
+        return conn.execute(
+            text(
+                "select min(id) from task "
+                "where user_id = :user_id and name like 'Quarterly%'"
+            ),
+            {"user_id": user_id},
+        ).scalar_one()
+
+
+def _clean_up(engine, user_id: str):
+    with engine.begin() as conn:
+        for sql in CLEAN_UP:
+            conn.execute(text(sql), {"user_id": user_id})
+
+
+def _time(client: httpx.Client, url: str, params: dict, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, params=params)
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+    body = response.json()
+    items = len(body["items"] if isinstance(body, dict) else body)
+
+    return statistics.median(timings), items
+
+
+def main(base_url: str, tasks: int, notes_per_task: int, repeat: int):
+    load_dotenv()
+    engine = get_engine(PlmSettings())
+    user_id = f"bench-{uuid.uuid4()}"
+
+    try:
+        task_id = _seed(engine, user_id, tasks, notes_per_task)
+        tasks_url = f"/v1/tasks/{user_id}"
+        notes_url = f"/v1/tasks/{user_id}/{task_id}/personal-notes"
+
+        cases = [
+            ("tasks", tasks_url, {}),
+            ("tasks by status", tasks_url, {"status": "Done"}),
+            ("tasks by status and type", tasks_url, {"status": "Done", "type": "Work"}),
+            ("tasks by name prefix", tasks_url, {"namePrefix": "Quarterly"}),
+            ("tasks sorted by -createdOn", tasks_url, {"sort": "-createdOn"}),
+            ("tasks searched", tasks_url, {"q": "quarterly report"}),
+            ("tasks searched by name", tasks_url, {"q": "report", "sort": "name"}),
+            ("task cursor by status", f"{tasks_url}/cursor", {"status": "Done"}),
+            ("notes", notes_url, {}),
+            ("notes searched", notes_url, {"q": "budget"}),
+            ("notes searched, phrase", notes_url, {"q": '"budget overrun"'}),
+            (
+                "notes created in range",
+                notes_url,
+                {"createdFrom": "2000-01-01T00:00:00Z"},
+            ),
+            ("notes sorted by -name", notes_url, {"sort": "-name"}),
+        ]
+
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            for label, url, params in cases:
+                elapsed, items = _time(client, url, params, repeat)
+                print(f"{label:30} {elapsed * 1000:9.1f}ms median, {items} items")
+    finally:
+        _clean_up(engine, user_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--notes-per-task", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.base_url, args.tasks, args.notes_per_task, args.repeat)
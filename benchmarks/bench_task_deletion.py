@@ -0,0 +1,110 @@
+"""
+Compares deleting tasks with their personal notes the way clients had to before
+(one DELETE request per note, then one per task) with a single cascading
+batch-delete request. It needs the API running locally, e.g. with Docker Compose,
+and seeds its own tasks and notes through the batch endpoints for a random user.
+
+Run with:
+
+    python -m benchmarks.bench_task_deletion --tasks 20 --notes-per-task 25
+"""
+import argparse
+import time
+import uuid
+
+import httpx
+
+
+def _seed(client: httpx.Client, user_id: str, tasks: int, notes_per_task: int):
+    response = client.post(
+        f"/v1/tasks/{user_id}:batch",
+        json={
+            "items": [
+                {
+                    "name": f"Deletion bench task {t}",
+                    "status": "To Do",
+                    "type": "Work",
+                    "correspondenceEmailAddress": "bench@localhost",
+                }
+                for t in range(tasks)
+            ]
+        },
+    )
+    response.raise_for_status()
+    task_ids = [result["item"]["id"] for result in response.json()["items"]]
+
+    notes = {}
+    for task_id in task_ids:
+        response = client.post(
+            f"/v1/tasks/{user_id}/{task_id}/personal-notes:batch",
+            json={
+                "items": [
+                    {
+                        "name": f"Deletion bench note {task_id}-{n}",
+                        "type": "Observations",
+                        "note": "Bench note",
+                        "correspondenceEmailAddress": "bench@localhost",
+                    }
+                    for n in range(notes_per_task)
+                ]
+            },
+        )
+        response.raise_for_status()
+        notes[task_id] = [result["item"]["id"] for result in response.json()["items"]]
+
+    return notes
+
+
+def _delete_one_by_one(client: httpx.Client, user_id: str, notes: dict) -> int:
+    requests = 0
+    for task_id, note_ids in notes.items():
+        for note_id in note_ids:
+            client.delete(
+                f"/v1/tasks/{user_id}/{task_id}/personal-notes/{note_id}"
+            ).raise_for_status()
+            requests += 1
+
+        client.delete(f"/v1/tasks/{user_id}/{task_id}").raise_for_status()
+        requests += 1
+
+    return requests
+
+
+def _delete_in_batch(client: httpx.Client, user_id: str, notes: dict) -> int:
+    response = client.post(
+        f"/v1/tasks/{user_id}:batch-delete",
+        json={"ids": list(notes), "cascade": True},
+    )
+    response.raise_for_status()
+    assert response.json()["deletedTasks"] == len(notes)
+
+    return 1
+
+
+def main(base_url: str, tasks: int, notes_per_task: int):
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        for label, delete in (
+            ("one by one", _delete_one_by_one),
+            ("batch", _delete_in_batch),
+        ):
+            user_id = f"bench-{uuid.uuid4()}"
+            notes = _seed(client, user_id, tasks, notes_per_task)
+
+            start = time.perf_counter()
+            requests = delete(client, user_id, notes)
+            elapsed = time.perf_counter() - start
+
+            print(
+                f"{label:10} {tasks} tasks, {tasks * notes_per_task} notes: "
+                f"{elapsed * 1000:9.1f}ms in {requests} requests"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--notes-per-task", type=int, default=25)
+    args = parser.parse_args()
+
+    main(args.base_url, args.tasks, args.notes_per_task)
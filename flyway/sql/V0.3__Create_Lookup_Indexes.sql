@@ -0,0 +1,6 @@
+-- Every lookup made by the API is scoped to a user, so lead the indexes with user_id.
+create index if not exists task_user_id_id_idx on task (user_id, id);
+create index if not exists task_user_id_name_idx on task (user_id, name);
+
+create index if not exists personal_note_task_id_idx on personal_note (task_id);
+create index if not exists personal_note_user_id_task_id_idx on personal_note (user_id, task_id);
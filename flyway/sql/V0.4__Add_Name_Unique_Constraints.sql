@@ -0,0 +1,7 @@
+-- Names are unique per user. Enforcing it here closes the race between concurrent
+-- writers and lets the API skip the lookup before every insert and rename.
+alter table task add constraint task_user_id_name_key unique (user_id, name);
+alter table personal_note add constraint personal_note_user_id_name_key unique (user_id, name);
+
+-- The unique constraint comes with its own (user_id, name) index.
+drop index if exists task_user_id_name_idx;
@@ -0,0 +1,23 @@
+create table if not exists email_job
+(
+    id integer not null generated always as identity,
+    task_id int not null,
+    user_id text not null,
+    status text not null,
+    to_address text not null,
+    message text not null,
+    attempts int not null default 0,
+    next_attempt_on timestamp not null,
+    last_error text,
+    sent_on timestamp,
+    created_by text not null,
+    created_on timestamp not null,
+    modified_by text,
+    modified_on timestamp,
+
+    constraint email_job_pkey primary key(id)
+);
+
+-- The dispatcher only ever looks for pending jobs that are due.
+create index if not exists email_job_pending_idx on email_job (next_attempt_on) where status = 'Pending';
+create index if not exists email_job_user_id_id_idx on email_job (user_id, id);
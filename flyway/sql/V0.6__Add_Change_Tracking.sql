@@ -0,0 +1,49 @@
+-- The changes feed reads each user's tasks and notes in the order they were last
+-- written, which is modified_on, or created_on for rows never updated.
+create index if not exists task_user_id_changed_on_idx on task (user_id, coalesce(modified_on, created_on), id);
+create index if not exists personal_note_user_id_changed_on_idx on personal_note (user_id, coalesce(modified_on, created_on), id);
+
+-- Deleted rows leave a tombstone, so clients syncing changes learn about deletions.
+create table if not exists tombstone
+(
+    id bigint not null generated always as identity,
+    entity_type text not null,
+    entity_id int not null,
+    task_id int,
+    user_id text not null,
+    deleted_on timestamp not null default now(),
+
+    constraint tombstone_pkey primary key(id)
+);
+
+create index if not exists tombstone_user_id_deleted_on_idx on tombstone (user_id, deleted_on, id);
+
+-- Statement-level triggers, so a bulk delete records its tombstones with a single
+-- insert rather than one per row.
+create or replace function record_task_tombstones() returns trigger as $$
+begin
+    insert into tombstone (entity_type, entity_id, user_id)
+    select 'task', id, user_id from deleted_rows;
+    return null;
+end;
+$$ language plpgsql;
+
+create or replace function record_personal_note_tombstones() returns trigger as $$
+begin
+    insert into tombstone (entity_type, entity_id, task_id, user_id)
+    select 'personal_note', id, task_id, user_id from deleted_rows;
+    return null;
+end;
+$$ language plpgsql;
+
+drop trigger if exists task_tombstone on task;
+create trigger task_tombstone
+    after delete on task
+    referencing old table as deleted_rows
+    for each statement execute function record_task_tombstones();
+
+drop trigger if exists personal_note_tombstone on personal_note;
+create trigger personal_note_tombstone
+    after delete on personal_note
+    referencing old table as deleted_rows
+    for each statement execute function record_personal_note_tombstones();
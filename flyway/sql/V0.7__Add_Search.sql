@@ -0,0 +1,15 @@
+-- Full-text search over task names and note text. The vectors are generated columns,
+-- so they are kept up to date by Postgres and only computed when a row is written.
+-- Queries must use the same 'english' configuration for the GIN indexes to apply.
+alter table task add column if not exists search_vector tsvector
+    generated always as (to_tsvector('english', coalesce(name, ''))) stored;
+alter table personal_note add column if not exists search_vector tsvector
+    generated always as (to_tsvector('english', coalesce(name, '') || ' ' || coalesce(note, ''))) stored;
+
+create index if not exists task_search_vector_idx on task using gin (search_vector);
+create index if not exists personal_note_search_vector_idx on personal_note using gin (search_vector);
+
+-- Name prefix filters are LIKE 'prefix%', which only a text_pattern_ops index can
+-- serve whatever the collation of the database.
+create index if not exists task_user_id_name_idx on task (user_id, name text_pattern_ops);
+create index if not exists personal_note_user_id_name_idx on personal_note (user_id, name text_pattern_ops);
@@ -0,0 +1,28 @@
+-- Tombstones are kept for 30 days (TOMBSTONE_RETENTION of the changes feed, which
+-- rejects older cursors). Those of a user are pruned whenever they delete again, using
+-- the (user_id, deleted_on, id) index, so no scheduled job is needed. The tombstones of
+-- a user who stops deleting stay until their next delete, which bounds them by what
+-- they deleted within the 30 days before their last delete.
+create or replace function record_task_tombstones() returns trigger as $$
+begin
+    delete from tombstone
+    where user_id in (select distinct user_id from deleted_rows)
+    and deleted_on < now() - interval '30 days';
+
+    insert into tombstone (entity_type, entity_id, user_id)
+    select 'task', id, user_id from deleted_rows;
+    return null;
+end;
+$$ language plpgsql;
+
+create or replace function record_personal_note_tombstones() returns trigger as $$
+begin
+    delete from tombstone
+    where user_id in (select distinct user_id from deleted_rows)
+    and deleted_on < now() - interval '30 days';
+
+    insert into tombstone (entity_type, entity_id, task_id, user_id)
+    select 'personal_note', id, task_id, user_id from deleted_rows;
+    return null;
+end;
+$$ language plpgsql;
@@ -1,50 +1,70 @@
 import logging
-import smtplib
+import threading
+from functools import partial
 
 from fastapi import Depends, HTTPException
 from fastapi_auth0 import Auth0User
 from sqlmodel import Session
 from sqlalchemy.future import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from plm.security import User
 from plm.enums import Permission
-from plm.services.db import SessionWithUser
-from plm.services.email_service import EmailSenderClient
+from plm.services.db import SessionWithUser, AsyncSessionWithUser
+from plm.services.email_service import connect_email_client
+from plm.services.smtp_pool import SmtpConnectionPool
 from plm.settings import PlmSettings
 
 _dependencies = {}
+_smtp_pool_lock = threading.Lock()
 
 
 def initialize_dependencies(
     settings: PlmSettings,
     engine: Engine,
+    async_engine: AsyncEngine = None,
 ):
     _dependencies["settings"] = settings
     _dependencies["engine"] = engine
+    _dependencies["async_engine"] = async_engine
 
 
 def reset_dependencies():
     # This should only be called from unit tests.
-    _dependencies = {}
+    _dependencies.clear()
+
+
+def close_dependencies():
+    smtp_pool = _dependencies.get("smtp_pool")
+    if smtp_pool:
+        smtp_pool.close()
 
 
 def get_settings():
     return _dependencies["settings"]
 
 
-def get_email_client(
+def get_db_engine() -> Engine:
+    return _dependencies["engine"]
+
+
+def get_async_db_engine() -> AsyncEngine:
+    return _dependencies.get("async_engine")
+
+
+def get_smtp_pool(
     settings: PlmSettings = Depends(get_settings),
-) -> EmailSenderClient:
-    smtp_server = settings.smtp_server
-    smtp_port = settings.smtp_port
-    smtp_username = settings.plm_email_address
-    smtp_password = settings.plm_email_password
+) -> SmtpConnectionPool:
+    # Created on first use, so nothing connects to the SMTP server at startup.
+    with _smtp_pool_lock:
+        if "smtp_pool" not in _dependencies:
+            _dependencies["smtp_pool"] = SmtpConnectionPool(
+                partial(connect_email_client, settings),
+                max_size=settings.smtp_pool_size,
+                idle_timeout=settings.smtp_pool_idle_timeout,
+            )
 
-    with EmailSenderClient(smtp_server, smtp_port) as smtp:
-        smtp.starttls()
-        smtp.login(smtp_username, smtp_password)
-        smtp.set_sender_email_address(smtp_username)
-        yield smtp
+    return _dependencies["smtp_pool"]
 
 
 async def get_auth0_user(settings: PlmSettings = Depends(get_settings)) -> Auth0User:
@@ -69,6 +89,15 @@ def get_db(user: User = Depends(get_calling_user)) -> SessionWithUser:
         yield session
 
 
+async def get_async_db(
+    user: User = Depends(get_calling_user),
+) -> AsyncSessionWithUser:
+    async with AsyncSessionWithUser(_dependencies["async_engine"]) as session:
+        logging.debug("Created a new async DB session.")
+        session.set_user(user)
+        yield session
+
+
 def get_db_without_user() -> Session:
     with Session(_dependencies["engine"]) as session:
         yield session
@@ -0,0 +1,31 @@
+from typing import Callable, Optional, Type
+
+from fastapi import Response
+from sqlmodel import SQLModel
+
+from plm.services.db import AsyncSessionWithUser
+
+
+async def run_sync_endpoint(
+    db: AsyncSessionWithUser,
+    endpoint: Callable,
+    response_model: Optional[Type[SQLModel]] = None,
+    **kwargs,
+):
+    """
+    Runs a sync endpoint on the async session. The ORM work happens on the session's
+    greenlet, so its I/O goes through asyncpg on the event loop instead of blocking a
+    threadpool worker.
+    """
+
+    def run(session):
+        result = endpoint(db=session, **kwargs)
+        # Build the response while still inside the greenlet, as attributes expired by
+        # the commit can only be reloaded from there. Responses built by the endpoint,
+        # like a 304, are returned as they are.
+        if response_model and not isinstance(result, Response):
+            return response_model.from_orm(result)
+
+        return result
+
+    return await db.run_sync(run)
@@ -0,0 +1,15 @@
+from plm.models import Task, PersonalNote, entity_from
+from plm.schemas import TaskCreate, PersonalNoteCreate
+
+# The create schemas have been validated by FastAPI already, so the entities are
+# built from them without validating again, keys and all in one step.
+
+
+def task_from_create(payload: TaskCreate, user_id: str) -> Task:
+    return entity_from(Task, payload, user_id=user_id)
+
+
+def personal_note_from_create(
+    payload: PersonalNoteCreate, user_id: str, task_id: int
+) -> PersonalNote:
+    return entity_from(PersonalNote, payload, user_id=user_id, task_id=task_id)
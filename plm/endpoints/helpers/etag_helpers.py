@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Type
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Text, cast, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlmodel import Session, select, func
+
+from plm.models import Entity
+
+# created_on and modified_on are stored without a time zone. Versions count the
+# microseconds from this naive epoch, so they convert back to the stored value exactly.
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def get_version(created_on: datetime, modified_on: Optional[datetime]) -> int:
+    # Every write stamps modified_on (or created_on) with the time of its transaction.
+    return ((modified_on or created_on) - _EPOCH) // _MICROSECOND
+
+
+def version_to_timestamp(version: int) -> datetime:
+    return _EPOCH + version * _MICROSECOND
+
+
+def make_etag(entity_id: int, created_on: datetime, modified_on: Optional[datetime]):
+    """
+    A strong ETag holding the id and the version of the entity, so an If-Match can
+    be checked in the WHERE clause of the update.
+    """
+    return f'"{entity_id}.{get_version(created_on, modified_on)}"'
+
+
+def entity_etag(entity: Entity) -> str:
+    return make_etag(entity.id, entity.created_on, entity.modified_on)
+
+
+def collection_etag(count: int, digest: Optional[str]) -> str:
+    """
+    A weak ETag of a list, from the number of its entities and a digest of the id and
+    the version of each of them. Neither the highest id nor the latest write would do:
+    a transaction that started earlier commits a lower id, and stamps an older
+    modified_on, after later ones did. Weak, since the order of the list is not
+    guaranteed.
+    """
+    return f'W/"{count}.{digest or 0}"'
+
+
+def versions_digest(model: Type[Entity]):
+    """
+    An aggregate of the md5 of the id and coalesce(modified_on, created_on) of every
+    matching row, in the order of their ids. It is NULL when no row matches.
+    """
+    version = func.coalesce(model.modified_on, model.created_on)
+    return func.md5(
+        func.string_agg(
+            cast(model.id, Text) + "." + cast(version, Text),
+            aggregate_order_by(literal_column("','"), model.id),
+        )
+    )
+
+
+def get_etag_or_404(db: Session, model: Type[Entity], criteria) -> str:
+    """
+    The ETag of the entity matching criteria, from a query that only reads its id and
+    audit timestamps. Never from the entity cache, which may hold an entry another
+    worker has changed, since answering 304 to that would leave the client with the
+    stale entity for good.
+    """
+    row = db.exec(
+        select(model.id, model.created_on, model.modified_on).where(criteria)
+    ).one_or_none()
+
+    if not row:
+        raise HTTPException(404)
+
+    return make_etag(row.id, row.created_on, row.modified_on)
+
+
+def _parse_etags(header: str) -> List[str]:
+    return [etag.strip() for etag in header.split(",") if etag.strip()]
+
+
+def is_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether the representation has to be sent despite an If-None-Match header. It
+    uses the weak comparison, so W/ prefixes are ignored.
+    """
+    if not if_none_match:
+        return True
+
+    etags = _parse_etags(if_none_match)
+    if "*" in etags:
+        return False
+
+    return etag.removeprefix("W/") not in {e.removeprefix("W/") for e in etags}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def get_if_match_timestamps(
+    if_match: Optional[str], entity_id: int
+) -> Optional[List[datetime]]:
+    """
+    The versions an If-Match header accepts for the entity, as values of
+    coalesce(modified_on, created_on), or None when the update is unconditional.
+    Weak ETags never match, since If-Match uses the strong comparison.
+    """
+    if not if_match:
+        return None
+
+    etags = _parse_etags(if_match)
+    if "*" in etags:
+        return None
+
+    timestamps = []
+    for etag in etags:
+        etag_id, _, version = etag.strip('"').partition(".")
+        if etag.startswith('"') and etag_id == str(entity_id) and version.isdigit():
+            timestamps.append(version_to_timestamp(int(version)))
+
+    return timestamps
+
+
+def version_in(model: Type[Entity], timestamps: List[datetime]):
+    # Checked in the WHERE clause of the update, so no other write can slip in between.
+    return func.coalesce(model.modified_on, model.created_on).in_(timestamps)
+
+
+def raise_precondition_failed():
+    raise HTTPException(
+        412, "The resource has been modified since it was last retrieved."
+    )
+
+
+def check_if_match(entity: Entity, timestamps: Optional[List[datetime]]):
+    if (
+        timestamps is not None
+        and (entity.modified_on or entity.created_on) not in timestamps
+    ):
+        raise_precondition_failed()
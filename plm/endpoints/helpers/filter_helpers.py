@@ -0,0 +1,121 @@
+from typing import List, Optional, Type
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Bundle
+from sqlmodel import SQLModel, func, select
+
+from plm.models import to_camel, to_snake
+from plm.schemas.filters import FilterParams
+from plm.services.db import to_audit_timestamp
+from plm.services.validation_exceptions import raise_validation_exception
+
+# The configuration of the generated search_vector columns, which queries must use
+# for the GIN indexes to apply.
+SEARCH_CONFIGURATION = "english"
+
+# Fields both tasks and personal notes can be sorted by.
+SORTABLE_FIELDS = ["id", "name", "type", "created_on", "modified_on"]
+
+SORT_DESCRIPTION = (
+    "Field to sort by, such as name, or -createdOn for descending. Searches are "
+    "sorted by relevance by default, everything else by id."
+)
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return, such as id,name,type. Fields left out are "
+    "not read from the database. All fields by default."
+)
+
+
+def search_vector(model):
+    # Not part of the models, so entities and RETURNING clauses do not carry it.
+    return literal_column(f"{model.__tablename__}.search_vector", TSVECTOR)
+
+
+def search_query(q: str):
+    # Accepts the syntax of web search engines: quotes, OR and -, and never fails.
+    return func.websearch_to_tsquery(SEARCH_CONFIGURATION, q)
+
+
+def filter_criteria(model, params: FilterParams, q: Optional[str] = None) -> List:
+    criteria = []
+
+    if params.type:
+        criteria.append(model.type.in_(params.type))
+
+    if params.name_prefix:
+        criteria.append(model.name.startswith(params.name_prefix, autoescape=True))
+
+    if params.created_from:
+        criteria.append(model.created_on >= to_audit_timestamp(params.created_from))
+
+    if params.created_to:
+        criteria.append(model.created_on < to_audit_timestamp(params.created_to))
+
+    if params.modified_from:
+        criteria.append(model.modified_on >= to_audit_timestamp(params.modified_from))
+
+    if params.modified_to:
+        criteria.append(model.modified_on < to_audit_timestamp(params.modified_to))
+
+    if q:
+        criteria.append(search_vector(model).op("@@")(search_query(q)))
+
+    return criteria
+
+
+def sort_order(
+    model, sort: Optional[str], q: Optional[str] = None, sortable=SORTABLE_FIELDS
+) -> List:
+    """
+    The ORDER BY for a sort parameter such as name or -createdOn, always ending with
+    the id so that pages are stable. Searches without a sort are ordered by rank.
+    """
+    if sort:
+        descending = sort.startswith("-")
+        field = to_snake(sort.lstrip("-"))
+
+        if field not in sortable:
+            raise_validation_exception(
+                f"Cannot sort by {sort}. Sort by one of "
+                f"{', '.join(to_camel(f) for f in sortable)}, with - for descending.",
+                "sort",
+            )
+
+        column = getattr(model, field)
+        if descending:
+            return [column.desc().nulls_last(), model.id.desc()]
+
+        return [column.asc().nulls_last(), model.id]
+
+    if q:
+        return [func.ts_rank(search_vector(model), search_query(q)).desc(), model.id]
+
+    return [model.id]
+
+
+def fieldset_select(model, fields: Optional[str], response_model: Type[SQLModel]):
+    """
+    A SELECT of only the columns of a sparse fieldset such as name,type, so large
+    columns left out are never read, or of the whole entity without one. The id is
+    always selected, as it is the key of pages and cursors.
+    """
+    if not fields:
+        return select(model)
+
+    names = [to_snake(field.strip()) for field in fields.split(",") if field.strip()]
+    unknown = [name for name in names if name not in response_model.__fields__]
+
+    if unknown:
+        raise_validation_exception(
+            f"Cannot return {', '.join(to_camel(name) for name in unknown)}. Return "
+            f"any of {', '.join(to_camel(name) for name in response_model.__fields__)}.",
+            "fields",
+        )
+
+    columns = [getattr(model, name) for name in dict.fromkeys(["id", *names])]
+
+    # Bundled, so each row comes back as one object with the selected fields as
+    # attributes, even when only the id is selected.
+    return select(Bundle(model.__tablename__, *columns))
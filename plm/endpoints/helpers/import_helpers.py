@@ -0,0 +1,341 @@
+import csv
+import io
+import json
+import logging
+import time
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+import anyio.from_thread
+from pydantic import ValidationError
+from sqlmodel import Session, text
+
+from plm.enums import ExportFormat
+from plm.models import (
+    TASK_NAME_UNIQUE_CONSTRAINT,
+    PERSONAL_NOTE_NAME_UNIQUE_CONSTRAINT,
+    to_camel,
+)
+from plm.schemas import TaskCreate, PersonalNoteCreate, ImportResponse
+from plm.services.db import get_audit_user_id
+from plm.services.validation_exceptions import collect_validation_errors
+from plm.endpoints.helpers.task_helpers import (
+    ALLOWED_TASK_STATUSES,
+    ALLOWED_TASK_TYPES,
+    check_task_status,
+    check_task_types,
+)
+from plm.endpoints.helpers.personal_note_helpers import (
+    ALLOWED_PERSONAL_NOTE_TYPES,
+    check_personal_note_types,
+)
+
+IMPORT_BATCH_SIZE = 10_000
+MAX_REPORTED_ERRORS = 100
+
+# A line, the task on it and the personal notes of that task.
+ImportRecord = Tuple[int, dict, List[dict]]
+
+_TASK_COLUMNS = ["name", "status", "type", "correspondence_email_address"]
+_PERSONAL_NOTE_COLUMNS = ["name", "type", "note", "correspondence_email_address"]
+
+# The staging tables only live until the import transaction ends.
+_CREATE_STAGING_TABLES = [
+    """
+    create temporary table import_task (
+        line integer not null,
+        name text not null,
+        status text not null,
+        type text not null,
+        correspondence_email_address text not null
+    ) on commit drop
+    """,
+    """
+    create temporary table import_personal_note (
+        line integer not null,
+        task_name text not null,
+        name text not null,
+        type text not null,
+        note text not null,
+        correspondence_email_address text not null
+    ) on commit drop
+    """,
+]
+
+# When a name appears more than once, the first line wins, like the batch endpoints.
+_MERGE_TASKS = f"""
+    insert into task (name, status, type, user_id, correspondence_email_address, created_by, created_on)
+    select distinct on (name) name, status, type, :user_id, correspondence_email_address, :created_by, now()
+    from import_task
+    order by name, line
+    on conflict on constraint {TASK_NAME_UNIQUE_CONSTRAINT} do nothing
+"""
+
+# The CSV format repeats the task on the line of each of its notes, so the tasks are
+# counted by name rather than by staged row.
+_COUNT_STAGED_TASKS = "select count(distinct name) from import_task"
+
+# Personal notes are linked by name to the user's tasks, whether they were just
+# imported or already existed.
+_MERGE_PERSONAL_NOTES = f"""
+    insert into personal_note (task_id, name, type, note, user_id, correspondence_email_address, created_by, created_on)
+    select distinct on (n.name) t.id, n.name, n.type, n.note, :user_id, n.correspondence_email_address, :created_by, now()
+    from import_personal_note n
+    join task t on t.user_id = :user_id and t.name = n.task_name
+    order by n.name, n.line
+    on conflict on constraint {PERSONAL_NOTE_NAME_UNIQUE_CONSTRAINT} do nothing
+"""
+
+
+class RequestBodyReader(io.RawIOBase):
+    """
+    Exposes the chunks of a streamed request body as a blocking file, so it can be
+    parsed with csv and json from a worker thread while the body is still arriving.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = anyio.from_thread.run(self._next_chunk)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    async def _next_chunk(self) -> Optional[bytes]:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+
+def iter_ndjson_records(lines: Iterator[str]) -> Iterator[ImportRecord]:
+    """
+    One task per line, with its personal notes nested under personalNotes, which is
+    the format of the NDJSON export.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            task = json.loads(line)
+        except ValueError:
+            task = None
+
+        if not isinstance(task, dict):
+            yield line_number, None, []
+            continue
+
+        personal_notes = task.pop("personalNotes", None) or []
+        yield line_number, task, personal_notes
+
+
+def iter_csv_records(lines: Iterator[str]) -> Iterator[ImportRecord]:
+    """
+    One personal note per line, with the columns of its task repeated, which is the
+    format of the CSV export. Lines with an empty personalNoteName only have a task.
+    """
+    reader = csv.DictReader(lines)
+
+    for row in reader:
+        task = {to_camel(column): row.get(to_camel(column)) for column in _TASK_COLUMNS}
+
+        personal_notes = []
+        if row.get("personalNoteName"):
+            personal_notes.append(
+                {
+                    to_camel(column): row.get(to_camel(f"personal_note_{column}"))
+                    for column in _PERSONAL_NOTE_COLUMNS
+                }
+            )
+
+        # The header is line 1.
+        yield reader.line_num, task, personal_notes
+
+
+def read_import_records(
+    body: io.RawIOBase, import_format: ExportFormat
+) -> Iterator[ImportRecord]:
+    lines = io.TextIOWrapper(io.BufferedReader(body), encoding="utf-8", newline="")
+
+    if import_format == ExportFormat.Csv:
+        return iter_csv_records(lines)
+
+    return iter_ndjson_records(lines)
+
+
+def _validation_errors(error: ValidationError) -> List[dict]:
+    return [
+        {
+            "message": e["msg"],
+            "properties": [to_camel(str(location)) for location in e["loc"]],
+        }
+        for e in error.errors()
+    ]
+
+
+def _validate_task(task: Optional[dict]) -> Tuple[Optional[TaskCreate], List[dict]]:
+    if task is None:
+        return None, [{"message": "The line is not a JSON object."}]
+
+    try:
+        task_create = TaskCreate.parse_obj(task)
+    except ValidationError as e:
+        return None, _validation_errors(e)
+
+    errors = collect_validation_errors(
+        lambda: check_task_status(task_create, ALLOWED_TASK_STATUSES),
+        lambda: check_task_types(task_create, ALLOWED_TASK_TYPES),
+    )
+
+    return task_create, errors
+
+
+def _validate_personal_note(
+    personal_note: dict,
+) -> Tuple[Optional[PersonalNoteCreate], List[dict]]:
+    try:
+        personal_note_create = PersonalNoteCreate.parse_obj(personal_note)
+    except ValidationError as e:
+        return None, _validation_errors(e)
+
+    errors = collect_validation_errors(
+        lambda: check_personal_note_types(
+            personal_note_create, ALLOWED_PERSONAL_NOTE_TYPES
+        )
+    )
+
+    return personal_note_create, errors
+
+
+class _StagingTable:
+    """
+    Buffers rows as CSV and loads them with COPY FROM STDIN every batch_size rows.
+    """
+
+    def __init__(self, cursor, table: str, columns: List[str], batch_size: int):
+        self._cursor = cursor
+        self._copy = f"copy {table} ({', '.join(columns)}) from stdin with (format csv)"
+        self._batch_size = batch_size
+        self._buffer = io.StringIO()
+        # Quote everything, since COPY reads an unquoted empty value as null.
+        self._writer = csv.writer(self._buffer, quoting=csv.QUOTE_ALL)
+        self._buffered = 0
+        self.rows = 0
+
+    def add(self, values: list):
+        self._writer.writerow(values)
+        self._buffered += 1
+        self.rows += 1
+
+        if self._buffered >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffered:
+            return
+
+        self._buffer.seek(0)
+        self._cursor.copy_expert(self._copy, self._buffer)
+
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._buffered = 0
+
+
+def import_records(
+    db: Session,
+    user_id: str,
+    records: Iterator[ImportRecord],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportResponse:
+    """
+    Validates the records one at a time and copies the valid ones into temporary
+    staging tables, then merges those into task and personal_note with two
+    INSERT ... SELECT statements, skipping names that already exist. Everything
+    happens in one transaction, which the caller commits.
+    """
+    start = time.perf_counter()
+
+    for statement in _CREATE_STAGING_TABLES:
+        db.execute(text(statement))
+
+    cursor = db.connection().connection.cursor()
+    tasks = _StagingTable(cursor, "import_task", ["line", *_TASK_COLUMNS], batch_size)
+    personal_notes = _StagingTable(
+        cursor,
+        "import_personal_note",
+        ["line", "task_name", *_PERSONAL_NOTE_COLUMNS],
+        batch_size,
+    )
+
+    rows_read = 0
+    rows_rejected = 0
+    errors = []
+
+    for line, task, notes in records:
+        rows_read += 1
+
+        task_create, row_errors = _validate_task(task)
+        validated_notes = []
+        for personal_note in notes:
+            personal_note_create, note_errors = _validate_personal_note(personal_note)
+            validated_notes.append(personal_note_create)
+            row_errors.extend(note_errors)
+
+        if row_errors:
+            rows_rejected += 1
+            errors.extend({"line": line, **error} for error in row_errors)
+            del errors[MAX_REPORTED_ERRORS:]
+            continue
+
+        tasks.add([line, *(getattr(task_create, c) for c in _TASK_COLUMNS)])
+        for personal_note_create in validated_notes:
+            personal_notes.add(
+                [
+                    line,
+                    task_create.name,
+                    *(getattr(personal_note_create, c) for c in _PERSONAL_NOTE_COLUMNS),
+                ]
+            )
+
+    tasks.flush()
+    personal_notes.flush()
+
+    tasks_staged = db.execute(text(_COUNT_STAGED_TASKS)).scalar_one()
+
+    parameters = {"user_id": user_id, "created_by": get_audit_user_id(db.get_user())}
+    tasks_imported = db.execute(text(_MERGE_TASKS), parameters).rowcount
+    personal_notes_imported = db.execute(
+        text(_MERGE_PERSONAL_NOTES), parameters
+    ).rowcount
+
+    elapsed = time.perf_counter() - start
+    rows_per_second = rows_read / elapsed if elapsed else 0.0
+
+    logging.info(
+        f"Imported {tasks_imported} tasks and {personal_notes_imported} personal notes "
+        f"for {user_id} from {rows_read} rows in {elapsed:.1f}s ({rows_per_second:.0f} rows/s)."
+    )
+
+    return ImportResponse(
+        rows_read=rows_read,
+        rows_rejected=rows_rejected,
+        tasks_imported=tasks_imported,
+        tasks_skipped=tasks_staged - tasks_imported,
+        personal_notes_imported=personal_notes_imported,
+        personal_notes_skipped=personal_notes.rows - personal_notes_imported,
+        errors=errors,
+        elapsed_seconds=elapsed,
+        rows_per_second=rows_per_second,
+    )
@@ -1,18 +1,35 @@
-from sqlmodel import Session, and_
+from sqlmodel import Session, select, and_, func
 from plm.models import PersonalNote
 from fastapi import HTTPException
 from plm.enums import PersonalNoteTypes
-from typing import List
+from typing import Dict, List
 from plm.services.validation_exceptions import (
     raise_validation_exception,
 )
+from plm.services.db import load_through_cache, personal_note_cache_key
+from plm.endpoints.helpers.etag_helpers import (
+    get_etag_or_404,
+    collection_etag,
+    versions_digest,
+)
+from plm.endpoints.helpers.filter_helpers import filter_criteria
+from plm.schemas import PersonalNoteFilterParams
+
+ALLOWED_PERSONAL_NOTE_TYPES = [
+    PersonalNoteTypes.Description,
+    PersonalNoteTypes.ProgressReport,
+    PersonalNoteTypes.Observations,
+]
 
 
 def get_personal_note_or_404(
     db: Session, user_id: str, task_id: int, personal_note_id: int
 ) -> PersonalNote:
-    personal_note_entity = (
-        db.query(PersonalNote)
+    personal_note_entity = load_through_cache(
+        db,
+        PersonalNote,
+        personal_note_cache_key(user_id, task_id, personal_note_id),
+        lambda: db.query(PersonalNote)
         .where(
             and_(
                 PersonalNote.user_id == user_id,
@@ -20,7 +37,7 @@ def get_personal_note_or_404(
                 PersonalNote.id == personal_note_id,
             )
         )
-        .one_or_none()
+        .one_or_none(),
     )
 
     if not personal_note_entity:
@@ -29,22 +46,56 @@ def get_personal_note_or_404(
     return personal_note_entity
 
 
-def is_personal_note_name_unique(
-    db: Session, personal_note_entity: PersonalNote, user_id: str
-) -> bool:
-    personal_note_name = personal_note_entity.name
+def get_personal_note_etag_or_404(
+    db: Session, user_id: str, task_id: int, personal_note_id: int
+) -> str:
+    return get_etag_or_404(
+        db,
+        PersonalNote,
+        and_(
+            PersonalNote.user_id == user_id,
+            PersonalNote.task_id == task_id,
+            PersonalNote.id == personal_note_id,
+        ),
+    )
+
+
+def personal_note_list_criteria(
+    user_id: str, task_id: int, filters: PersonalNoteFilterParams
+) -> List:
+    return [
+        PersonalNote.user_id == user_id,
+        PersonalNote.task_id == task_id,
+        *filter_criteria(PersonalNote, filters, filters.q),
+    ]
+
 
-    existing_personal_note = (
-        db.query(PersonalNote)
-        .filter(
+def get_personal_notes_etag(db: Session, criteria: List) -> str:
+    # A single row aggregated over the notes, so the cost does not grow with the page.
+    row = db.exec(
+        select(
+            func.count().label("count"),
+            versions_digest(PersonalNote).label("digest"),
+        ).where(and_(*criteria))
+    ).one()
+
+    return collection_etag(row.count, row.digest)
+
+
+def get_personal_notes_by_id(
+    db: Session, user_id: str, task_id: int, personal_note_ids: List[int]
+) -> Dict[int, PersonalNote]:
+    personal_notes = db.exec(
+        select(PersonalNote).where(
             and_(
-                PersonalNote.name == personal_note_name, PersonalNote.user_id == user_id
+                PersonalNote.user_id == user_id,
+                PersonalNote.task_id == task_id,
+                PersonalNote.id.in_(personal_note_ids),
             )
         )
-        .first()
-    )
+    ).all()
 
-    return True if existing_personal_note is None else False
+    return {personal_note.id: personal_note for personal_note in personal_notes}
 
 
 def check_personal_note_types(
@@ -1,18 +1,55 @@
-from sqlmodel import Session, and_
+from sqlmodel import Session, select, delete, exists, and_
 from plm.models import Task, PersonalNote
 from fastapi import HTTPException
 from plm.enums import TaskStatus, TaskTypes
-from typing import List
+from typing import List, Tuple
 from plm.services.validation_exceptions import (
     raise_validation_exception,
 )
+from plm.services.db import (
+    load_through_cache,
+    invalidate_on_commit,
+    task_cache_key,
+    personal_note_cache_key,
+)
+from plm.endpoints.helpers.etag_helpers import get_etag_or_404
+from plm.endpoints.helpers.filter_helpers import SORTABLE_FIELDS, filter_criteria
+from plm.schemas import TaskFilterParams
+
+ALLOWED_TASK_STATUSES = [
+    TaskStatus.ToDo,
+    TaskStatus.InProgress,
+    TaskStatus.PendingForRevision,
+    TaskStatus.Done,
+]
+
+ALLOWED_TASK_TYPES = [
+    TaskTypes.Work,
+    TaskTypes.Studies,
+    TaskTypes.WellBeing,
+    TaskTypes.Others,
+]
+
+TASK_SORTABLE_FIELDS = [*SORTABLE_FIELDS, "status"]
+
+
+def task_filter_criteria(filters: TaskFilterParams) -> List:
+    criteria = filter_criteria(Task, filters, filters.q)
+
+    if filters.status:
+        criteria.append(Task.status.in_(filters.status))
+
+    return criteria
 
 
 def get_task_or_404(db: Session, user_id: str, task_id: int) -> Task:
-    task_entity = (
-        db.query(Task)
+    task_entity = load_through_cache(
+        db,
+        Task,
+        task_cache_key(user_id, task_id),
+        lambda: db.query(Task)
         .where(and_(Task.user_id == user_id, Task.id == task_id))
-        .one_or_none()
+        .one_or_none(),
     )
 
     if not task_entity:
@@ -21,17 +58,13 @@ def get_task_or_404(db: Session, user_id: str, task_id: int) -> Task:
     return task_entity
 
 
-def is_task_name_unique(db: Session, task_entity: Task, user_id: str) -> bool:
-    task_name = task_entity.name
-
-    existing_task = (
-        db.query(Task)
-        .filter(and_(Task.name == task_name, Task.user_id == user_id))
-        .first()
+def get_task_etag_or_404(db: Session, user_id: str, task_id: int) -> str:
+    return get_etag_or_404(
+        db,
+        Task,
+        and_(Task.user_id == user_id, Task.id == task_id),
     )
 
-    return True if existing_task is None else False
-
 
 def check_task_status(task_entity: Task, allowed_statuses: List[TaskStatus]) -> None:
     if task_entity.status not in allowed_statuses:
@@ -56,3 +89,50 @@ def task_has_existing_personal_notes(db: Session, task_entity: Task) -> None:
         return False
 
     return True
+
+
+def delete_tasks(
+    db: Session, user_id: str, task_ids: List[int], cascade: bool
+) -> Tuple[List[int], int]:
+    """
+    Deletes the user's tasks with set-based statements, along with their personal
+    notes if cascade is set. Otherwise tasks that still have personal notes are kept.
+    Returns the ids of the deleted tasks and the number of deleted personal notes.
+    The caller commits.
+    """
+    user_tasks = and_(Task.user_id == user_id, Task.id.in_(task_ids))
+
+    deleted_personal_notes = 0
+    if cascade:
+        # The ids are returned so the cached notes can be invalidated.
+        deleted_notes = db.execute(
+            delete(PersonalNote)
+            .where(PersonalNote.task_id.in_(select(Task.id).where(user_tasks)))
+            .returning(PersonalNote.task_id, PersonalNote.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        deleted_personal_notes = len(deleted_notes)
+        invalidate_on_commit(
+            db,
+            (
+                personal_note_cache_key(user_id, note_task_id, note_id)
+                for note_task_id, note_id in deleted_notes
+            ),
+        )
+
+    statement = delete(Task).where(user_tasks)
+    if not cascade:
+        statement = statement.where(~exists().where(PersonalNote.task_id == Task.id))
+
+    deleted_task_ids = (
+        db.execute(
+            statement.returning(Task.id).execution_options(synchronize_session=False)
+        )
+        .scalars()
+        .all()
+    )
+    invalidate_on_commit(
+        db, (task_cache_key(user_id, task_id) for task_id in deleted_task_ids)
+    )
+
+    return deleted_task_ids, deleted_personal_notes
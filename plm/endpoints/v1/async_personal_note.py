@@ -0,0 +1,173 @@
+from fastapi import Depends, APIRouter, Path, Query, Header, Response
+from plm.schemas import (
+    Page,
+    CursorPage,
+    CursorParams,
+    PersonalNoteResponse,
+    PersonalNoteSparseResponse,
+    PersonalNoteCreate,
+    PersonalNoteUpdate,
+    PersonalNoteFilterParams,
+)
+from plm.dependencies import get_async_db
+from plm.services.db import AsyncSessionWithUser
+from plm.endpoints.helpers.async_helpers import run_sync_endpoint
+from plm.endpoints.helpers.filter_helpers import FIELDS_DESCRIPTION, SORT_DESCRIPTION
+from plm.endpoints.v1 import personal_note
+from typing import List, Optional
+
+router = APIRouter(prefix="/v1/async")
+
+
+@router.get(
+    path="/tasks/{userId}/{taskId}/personal-notes",
+    name="Get all personal notes for a given user and task (async)",
+    response_model=Page[PersonalNoteSparseResponse],
+    response_model_exclude_none=True,
+)
+async def get_personal_notes(
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    filters: PersonalNoteFilterParams = Depends(),
+    sort: Optional[str] = Query(None, description=SORT_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db,
+        personal_note.get_personal_notes,
+        user_id=user_id,
+        task_id=task_id,
+        filters=filters,
+        sort=sort,
+        fields=fields,
+        if_none_match=if_none_match,
+    )
+
+
+@router.get(
+    path="/tasks/{userId}/{taskId}/personal-notes/cursor",
+    name="Get all personal notes for a given user and task, paginated by cursor (async)",
+    response_model=CursorPage[PersonalNoteSparseResponse],
+    response_model_exclude_none=True,
+)
+async def get_personal_notes_by_cursor(
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    params: CursorParams = Depends(),
+    filters: PersonalNoteFilterParams = Depends(),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db,
+        personal_note.get_personal_notes_by_cursor,
+        user_id=user_id,
+        task_id=task_id,
+        params=params,
+        filters=filters,
+        fields=fields,
+    )
+
+
+@router.get(
+    path="/tasks/{userId}/{taskId}/personal-notes/{personalNoteId}",
+    name="Get a given personal note by personal note id (async)",
+    response_model=PersonalNoteResponse,
+    response_model_exclude_none=True,
+)
+async def get_personal_note(
+    response: Response,
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    personal_note_id: int = Path(alias="personalNoteId"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db,
+        personal_note.get_personal_note,
+        PersonalNoteResponse,
+        response=response,
+        user_id=user_id,
+        task_id=task_id,
+        personal_note_id=personal_note_id,
+        if_none_match=if_none_match,
+    )
+
+
+@router.post(
+    path="/tasks/{userId}/{taskId}/personal-notes",
+    name="Create new personal note for a given task (async)",
+    response_model=PersonalNoteResponse,
+    response_model_exclude_none=True,
+)
+async def create_personal_note(
+    payload: PersonalNoteCreate,
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db,
+        personal_note.create_personal_note,
+        PersonalNoteResponse,
+        payload=payload,
+        user_id=user_id,
+        task_id=task_id,
+    )
+
+
+@router.patch(
+    path="/tasks/{userId}/{taskId}/personal-notes/{personalNoteId}",
+    name="Update an existing note (async)",
+    response_model=PersonalNoteResponse,
+    response_model_exclude_none=True,
+)
+async def update_personal_note(
+    payload: PersonalNoteUpdate,
+    response: Response,
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    personal_note_id: int = Path(alias="personalNoteId"),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db,
+        personal_note.update_personal_note,
+        PersonalNoteResponse,
+        payload=payload,
+        response=response,
+        user_id=user_id,
+        task_id=task_id,
+        personal_note_id=personal_note_id,
+        if_match=if_match,
+    )
+
+
+@router.delete(
+    path="/tasks/{userId}/{taskId}/personal-notes/{personalNoteId}",
+    name="Delete a personal note (async)",
+    status_code=204,
+)
+async def delete_personal_note(
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    personal_note_id: int = Path(alias="personalNoteId"),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+) -> None:
+
+    await run_sync_endpoint(
+        db,
+        personal_note.delete_personal_note,
+        user_id=user_id,
+        task_id=task_id,
+        personal_note_id=personal_note_id,
+    )
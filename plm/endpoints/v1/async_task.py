@@ -0,0 +1,145 @@
+from typing import Optional
+
+from fastapi import Depends, APIRouter, Path, Query, Header, Response
+from plm.schemas import (
+    Page,
+    CursorPage,
+    CursorParams,
+    TaskResponse,
+    TaskCreate,
+    TaskUpdate,
+    TaskFilterParams,
+)
+from plm.dependencies import get_async_db
+from plm.services.db import AsyncSessionWithUser
+from plm.endpoints.helpers.async_helpers import run_sync_endpoint
+from plm.endpoints.helpers.filter_helpers import SORT_DESCRIPTION
+from plm.endpoints.v1 import task
+
+router = APIRouter(prefix="/v1/async")
+
+
+@router.get(
+    path="/tasks/{userId}",
+    name="Get all tasks for a user (async)",
+    response_model=Page[TaskResponse],
+    response_model_exclude_none=True,
+)
+async def get_tasks(
+    user_id: str = Path(alias="userId"),
+    filters: TaskFilterParams = Depends(),
+    sort: Optional[str] = Query(None, description=SORT_DESCRIPTION),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db, task.get_tasks, user_id=user_id, filters=filters, sort=sort
+    )
+
+
+@router.get(
+    path="/tasks/{userId}/cursor",
+    name="Get all tasks for a user, paginated by cursor (async)",
+    response_model=CursorPage[TaskResponse],
+    response_model_exclude_none=True,
+)
+async def get_tasks_by_cursor(
+    user_id: str = Path(alias="userId"),
+    params: CursorParams = Depends(),
+    filters: TaskFilterParams = Depends(),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db,
+        task.get_tasks_by_cursor,
+        user_id=user_id,
+        params=params,
+        filters=filters,
+    )
+
+
+@router.get(
+    path="/tasks/{userId}/{taskId}",
+    name="Get a given task by id (async)",
+    response_model=TaskResponse,
+    response_model_exclude_none=True,
+)
+async def get_task(
+    response: Response,
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db,
+        task.get_task,
+        TaskResponse,
+        response=response,
+        user_id=user_id,
+        task_id=task_id,
+        if_none_match=if_none_match,
+    )
+
+
+@router.post(
+    path="/tasks/{userId}",
+    name="Create new task (async)",
+    response_model=TaskResponse,
+    response_model_exclude_none=True,
+)
+async def create_task(
+    payload: TaskCreate,
+    user_id: str = Path(alias="userId"),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db, task.create_task, TaskResponse, payload=payload, user_id=user_id
+    )
+
+
+@router.patch(
+    path="/tasks/{userId}/{taskId}",
+    name="Update an existing task (async)",
+    response_model=TaskResponse,
+    response_model_exclude_none=True,
+)
+async def update_task(
+    payload: TaskUpdate,
+    response: Response,
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+):
+
+    return await run_sync_endpoint(
+        db,
+        task.update_task,
+        TaskResponse,
+        payload=payload,
+        response=response,
+        user_id=user_id,
+        task_id=task_id,
+        if_match=if_match,
+    )
+
+
+@router.delete(
+    path="/tasks/{userId}/{taskId}", name="Delete a task (async)", status_code=204
+)
+async def delete_task(
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    cascade: bool = Query(
+        False, description="Also delete the personal notes of the task"
+    ),
+    db: AsyncSessionWithUser = Depends(get_async_db),
+) -> None:
+
+    await run_sync_endpoint(
+        db, task.delete_task, user_id=user_id, task_id=task_id, cascade=cascade
+    )
@@ -0,0 +1,47 @@
+from fastapi import Depends, APIRouter, Path, Query, Request
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from plm.dependencies import get_db, PermissionCheck
+from plm.enums import Permission, ExportFormat
+from plm.schemas import ImportResponse
+from plm.endpoints.helpers.import_helpers import (
+    RequestBodyReader,
+    read_import_records,
+    import_records,
+)
+
+router = APIRouter(
+    prefix="/v1/import", dependencies=[Depends(PermissionCheck(Permission.Admin))]
+)
+
+
+@router.post(
+    path="/tasks/{userId}",
+    name="Import tasks and personal notes for a user",
+    description="Takes the same NDJSON or CSV formats as the export, streamed in the request body. Invalid lines are reported and skipped, as are tasks and notes whose names already exist.",
+    response_model=ImportResponse,
+    response_model_exclude_none=True,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "required": True,
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    user_id: str = Path(alias="userId"),
+    import_format: ExportFormat = Query(ExportFormat.Ndjson, alias="format"),
+    db: Session = Depends(get_db),
+):
+    def run_import():
+        records = read_import_records(
+            RequestBodyReader(request.stream()), import_format
+        )
+        result = import_records(db, user_id, records)
+        db.commit()
+        return result
+
+    # The body is parsed and copied in a worker thread while it is still arriving.
+    return await run_in_threadpool(run_import)
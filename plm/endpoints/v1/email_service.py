@@ -1,9 +1,11 @@
-from fastapi import Depends, APIRouter, Path
-from plm.models import PersonalNote
-from plm.dependencies import get_db, get_email_client
-from sqlmodel import Session, select
-from plm.services.email_service import EmailSenderClient
-from plm.endpoints.helpers.task_helpers import get_task_or_404
+from fastapi import Depends, APIRouter, Path, HTTPException
+from plm.models import EmailJob
+from plm.dependencies import get_db
+from plm.enums import EmailJobStatus
+from plm.schemas import EmailJobResponse
+from sqlmodel import Session, select, and_
+import sqlalchemy.sql.functions as funcs
+from plm.services.email_rendering import load_task_email_data, render_task_email
 
 router = APIRouter(prefix="/v1")
 
@@ -11,34 +13,54 @@ router = APIRouter(prefix="/v1")
 @router.post(
     path="/emails/{userId}/{taskId}",
     name="Send e-mail about a given task",
+    description="Queues the e-mail and returns the job to poll for its status.",
+    response_model=EmailJobResponse,
+    response_model_exclude_none=True,
+    status_code=202,
 )
 def send_email_notification(
     user_id: str = Path(alias="userId"),
     task_id: int = Path(alias="taskId"),
     db: Session = Depends(get_db),
-    email_client: EmailSenderClient = Depends(get_email_client),
 ):
 
-    task = get_task_or_404(db, user_id, task_id)
+    task = load_task_email_data(db, user_id, task_id)
 
-    personal_notes = db.exec(
-        select(PersonalNote).where(PersonalNote.task_id == task_id)
-    ).all()
+    if not task:
+        raise HTTPException(404)
 
-    subject = f"PLM Reminder: {task.name}"
+    email_job = EmailJob(
+        task_id=task_id,
+        user_id=user_id,
+        status=EmailJobStatus.Pending,
+        to_address=task.correspondence_email_address,
+        message=render_task_email(task).as_string(),
+        next_attempt_on=funcs.now(),
+    )
 
-    body = "Personal Notes:\n"
-    for note in personal_notes:
-        body += f"\nPersonal Note Name: {note.name}\n"
-        body += f"Personal Note Type: {note.type}\n"
-        body += f"Personal Note Description: {note.note}\n"
+    db.add(email_job)
+    db.commit()
 
-    message_body = f"Subject: {subject}\n\n{body}"
+    return email_job
 
-    email_client.sendmail(
-        from_addr=email_client.sender_email_address,
-        to_addrs=task.correspondence_email_address,
-        msg=message_body,
-    )
 
-    return {"message": f"Email sent successfully for Task named {task.name}"}
+@router.get(
+    path="/emails/{userId}/jobs/{jobId}",
+    name="Get the status of an e-mail",
+    response_model=EmailJobResponse,
+    response_model_exclude_none=True,
+)
+def get_email_job(
+    user_id: str = Path(alias="userId"),
+    job_id: int = Path(alias="jobId"),
+    db: Session = Depends(get_db),
+):
+
+    email_job = db.exec(
+        select(EmailJob).where(and_(EmailJob.user_id == user_id, EmailJob.id == job_id))
+    ).one_or_none()
+
+    if not email_job:
+        raise HTTPException(404)
+
+    return email_job
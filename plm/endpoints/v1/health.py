@@ -2,8 +2,15 @@ import logging
 
 from fastapi import Response, Depends, APIRouter
 from sqlmodel import Session
+from sqlalchemy.future import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-from plm.dependencies import get_db_without_user
+from plm.dependencies import (
+    get_db_without_user,
+    get_db_engine,
+    get_async_db_engine,
+)
+from plm.services.db import get_pool_status
 
 router = APIRouter(prefix="/v1")
 
@@ -13,9 +20,14 @@ router = APIRouter(prefix="/v1")
     name="Healthcheck",
     description="Returns 200 on success, 500 if something is wrong",
 )
-def healthcheck(response: Response, db: Session = Depends(get_db_without_user)):
+def healthcheck(
+    response: Response,
+    db: Session = Depends(get_db_without_user),
+    engine: Engine = Depends(get_db_engine),
+    async_engine: AsyncEngine = Depends(get_async_db_engine),
+):
     """
-    Returns the health of the API.
+    Returns the health of the API, along with the state of the connection pools.
     """
     all_ok = True
     result = {"postgres": "OK"}
@@ -28,5 +40,9 @@ def healthcheck(response: Response, db: Session = Depends(get_db_without_user)):
         result["postgres_error"] = str(e)
         logging.exception("Unable to connect to Postgres")
 
+    result["pool"] = get_pool_status(engine)
+    if async_engine:
+        result["async_pool"] = get_pool_status(async_engine.sync_engine)
+
     response.status_code = 200 if all_ok else 500
     return result
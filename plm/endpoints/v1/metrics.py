@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from plm.services.metrics import generate_metrics
+
+# Served at /metrics rather than under /v1, where Prometheus looks by default.
+router = APIRouter()
+
+
+@router.get("/metrics", name="Metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_metrics(), media_type=CONTENT_TYPE_LATEST)
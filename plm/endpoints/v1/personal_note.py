@@ -1,42 +1,139 @@
-from fastapi import Depends, APIRouter, Path
-from plm.schemas import PersonalNoteResponse, PersonalNoteCreate, PersonalNoteUpdate
-from plm.models import PersonalNote
+from fastapi import Depends, APIRouter, Path, Query, Header, HTTPException, Response
+from plm.schemas import (
+    BatchItemResult,
+    BatchResponse,
+    Page,
+    CursorPage,
+    CursorParams,
+    PersonalNoteResponse,
+    PersonalNoteSparseResponse,
+    PersonalNoteCreate,
+    PersonalNoteUpdate,
+    PersonalNoteBatchCreate,
+    PersonalNoteBatchUpdate,
+    PersonalNoteFilterParams,
+)
+from plm.models import PersonalNote, PERSONAL_NOTE_NAME_UNIQUE_CONSTRAINT
 from plm.dependencies import get_db
 from sqlmodel import Session, select, and_
-from plm.services.db import apply_patch
+from plm.services.db import (
+    apply_patch,
+    insert_returning,
+    paginate_by_keyset,
+    paginate_by_offset,
+    update_returning,
+    unique_violation_as_validation_error,
+)
 from plm.endpoints.helpers.personal_note_helpers import (
+    ALLOWED_PERSONAL_NOTE_TYPES,
     get_personal_note_or_404,
-    is_personal_note_name_unique,
+    get_personal_note_etag_or_404,
+    get_personal_notes_etag,
+    personal_note_list_criteria,
+    get_personal_notes_by_id,
     check_personal_note_types,
 )
-from plm.services.validation_exceptions import (
-    raise_validation_exception,
+from plm.endpoints.helpers.task_helpers import get_task_or_404
+from plm.endpoints.helpers.conversion_helpers import personal_note_from_create
+from plm.endpoints.helpers.etag_helpers import (
+    entity_etag,
+    is_modified,
+    not_modified,
+    get_if_match_timestamps,
+    version_in,
+    check_if_match,
+    raise_precondition_failed,
+)
+from plm.endpoints.helpers.filter_helpers import (
+    FIELDS_DESCRIPTION,
+    SORT_DESCRIPTION,
+    fieldset_select,
+    sort_order,
 )
-from typing import List
-from plm.enums import PersonalNoteTypes
+from plm.services.serialization import page_response
+from plm.services.validation_exceptions import collect_validation_errors
+from typing import Dict, List, Optional
 
 router = APIRouter(prefix="/v1")
 
+PERSONAL_NOTE_NAME_CONFLICT_MESSAGE = (
+    "A personal note with this same name already exists."
+)
+
+
+def _personal_note_name_conflicts(db: Session):
+    return unique_violation_as_validation_error(
+        db, PERSONAL_NOTE_NAME_UNIQUE_CONSTRAINT, PERSONAL_NOTE_NAME_CONFLICT_MESSAGE
+    )
+
+
+def _personal_note_name_conflict_error() -> dict:
+    return {"message": PERSONAL_NOTE_NAME_CONFLICT_MESSAGE, "properties": ["name"]}
+
+
+def _get_existing_personal_note_names(
+    db: Session, user_id: str, names: List[str]
+) -> Dict[str, int]:
+    # Names are unique per user, across all of their tasks.
+    rows = db.exec(
+        select(PersonalNote.name, PersonalNote.id).where(
+            and_(PersonalNote.user_id == user_id, PersonalNote.name.in_(names))
+        )
+    ).all()
+
+    return {name: personal_note_id for name, personal_note_id in rows}
+
 
 @router.get(
     path="/tasks/{userId}/{taskId}/personal-notes",
     name="Get all personal notes for a given user and task",
-    response_model=List[PersonalNoteResponse],
+    response_model=Page[PersonalNoteSparseResponse],
     response_model_exclude_none=True,
 )
 def get_personal_notes(
     user_id: str = Path(alias="userId"),
     task_id: int = Path(alias="taskId"),
+    filters: PersonalNoteFilterParams = Depends(),
+    sort: Optional[str] = Query(None, description=SORT_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
+    criteria = personal_note_list_criteria(user_id, task_id, filters)
+    query = fieldset_select(PersonalNote, fields, PersonalNoteSparseResponse)
+    order = sort_order(PersonalNote, sort, filters.q)
 
-    query = db.exec(
-        select(PersonalNote).filter(
-            and_(PersonalNote.user_id == user_id, PersonalNote.task_id == task_id)
-        )
-    ).all()
+    # The ETag covers every note of the list rather than only the page, so that it
+    # also changes when notes move in or out of the page.
+    etag = get_personal_notes_etag(db, criteria)
+    if not is_modified(if_none_match, etag):
+        return not_modified(etag)
 
-    return query
+    page = paginate_by_offset(db, query.filter(*criteria).order_by(*order))
+
+    return page_response(page, PersonalNoteSparseResponse, headers={"ETag": etag})
+
+
+@router.get(
+    path="/tasks/{userId}/{taskId}/personal-notes/cursor",
+    name="Get all personal notes for a given user and task, paginated by cursor",
+    response_model=CursorPage[PersonalNoteSparseResponse],
+    response_model_exclude_none=True,
+)
+def get_personal_notes_by_cursor(
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    params: CursorParams = Depends(),
+    filters: PersonalNoteFilterParams = Depends(),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db),
+):
+    criteria = personal_note_list_criteria(user_id, task_id, filters)
+    query = fieldset_select(PersonalNote, fields, PersonalNoteSparseResponse)
+
+    page = paginate_by_keyset(db, query.filter(*criteria), PersonalNote.id, params)
+
+    return page_response(page, PersonalNoteSparseResponse)
 
 
 @router.get(
@@ -46,13 +143,20 @@ def get_personal_notes(
     response_model_exclude_none=True,
 )
 def get_personal_note(
+    response: Response,
     user_id: str = Path(alias="userId"),
     task_id: int = Path(alias="taskId"),
     personal_note_id: int = Path(alias="personalNoteId"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
+    if if_none_match:
+        etag = get_personal_note_etag_or_404(db, user_id, task_id, personal_note_id)
+        if not is_modified(if_none_match, etag):
+            return not_modified(etag)
 
     query = get_personal_note_or_404(db, user_id, task_id, personal_note_id)
+    response.headers["ETag"] = entity_etag(query)
 
     return query
 
@@ -69,28 +173,170 @@ def create_personal_note(
     task_id: int = Path(alias="taskId"),
     db: Session = Depends(get_db),
 ):
-    personal_note_entity = PersonalNote.parse_obj(payload)
-    personal_note_entity.task_id = task_id
-    personal_note_entity.user_id = user_id
+    personal_note_entity = personal_note_from_create(payload, user_id, task_id)
+
+    check_personal_note_types(personal_note_entity, ALLOWED_PERSONAL_NOTE_TYPES)
+
+    db.add(personal_note_entity)
+    with _personal_note_name_conflicts(db):
+        db.commit()
+
+    return personal_note_entity
+
+
+@router.post(
+    path="/tasks/{userId}/{taskId}/personal-notes:batch",
+    name="Create several personal notes for a given task",
+    description="Valid notes are created even if others fail, and the result of each one is returned in the same order as the request.",
+    response_model=BatchResponse[PersonalNoteResponse],
+    response_model_exclude_none=True,
+)
+def create_personal_notes(
+    payload: PersonalNoteBatchCreate,
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    db: Session = Depends(get_db),
+):
+    get_task_or_404(db, user_id, task_id)
+
+    existing_names = _get_existing_personal_note_names(
+        db, user_id, sorted({item.name for item in payload.items})
+    )
 
-    if not is_personal_note_name_unique(db, personal_note_entity, user_id):
-        raise_validation_exception(
-            f"A personal note with this same name already exists."
+    errors = {}
+    accepted = {}
+    for index, item in enumerate(payload.items):
+        personal_note_entity = personal_note_from_create(item, user_id, task_id)
+
+        item_errors = collect_validation_errors(
+            lambda: check_personal_note_types(
+                personal_note_entity, ALLOWED_PERSONAL_NOTE_TYPES
+            )
         )
 
-    check_personal_note_types(
-        personal_note_entity,
-        [
-            PersonalNoteTypes.Description,
-            PersonalNoteTypes.ProgressReport,
-            PersonalNoteTypes.Observations,
-        ],
+        # The first note with a given name wins, both against the table and the batch.
+        if (
+            personal_note_entity.name in existing_names
+            or personal_note_entity.name in accepted
+        ):
+            item_errors.append(_personal_note_name_conflict_error())
+
+        if item_errors:
+            errors[index] = item_errors
+        else:
+            accepted[personal_note_entity.name] = (index, personal_note_entity)
+
+    created = {}
+    if accepted:
+        # Names created concurrently since the check above are skipped, not failed.
+        for personal_note_entity in insert_returning(
+            db,
+            PersonalNote,
+            [personal_note_entity for _, personal_note_entity in accepted.values()],
+            conflict_constraint=PERSONAL_NOTE_NAME_UNIQUE_CONSTRAINT,
+        ):
+            index, _ = accepted.pop(personal_note_entity.name)
+            created[index] = personal_note_entity
+
+        db.commit()
+
+    for index, _ in accepted.values():
+        errors[index] = [_personal_note_name_conflict_error()]
+
+    return BatchResponse(
+        items=[
+            BatchItemResult(
+                index=index, item=created.get(index), errors=errors.get(index)
+            )
+            for index in range(len(payload.items))
+        ]
     )
 
-    db.add(personal_note_entity)
-    db.commit()
 
-    return personal_note_entity
+@router.patch(
+    path="/tasks/{userId}/{taskId}/personal-notes:batch",
+    name="Update several personal notes of a given task",
+    description="Valid changes are saved in one transaction even if others fail, and the result of each one is returned in the same order as the request.",
+    response_model=BatchResponse[PersonalNoteResponse],
+    response_model_exclude_none=True,
+)
+def update_personal_notes(
+    payload: PersonalNoteBatchUpdate,
+    user_id: str = Path(alias="userId"),
+    task_id: int = Path(alias="taskId"),
+    db: Session = Depends(get_db),
+):
+    personal_notes = get_personal_notes_by_id(
+        db, user_id, task_id, sorted({item.id for item in payload.items})
+    )
+
+    new_names = sorted({item.name for item in payload.items if item.name is not None})
+    existing_names = (
+        _get_existing_personal_note_names(db, user_id, new_names) if new_names else {}
+    )
+
+    errors = {}
+    updated = {}
+    seen_ids = set()
+    names_in_batch = {}
+    for index, item in enumerate(payload.items):
+        personal_note_entity = personal_notes.get(item.id)
+
+        if not personal_note_entity:
+            errors[index] = [
+                {"message": "The personal note was not found.", "properties": ["id"]}
+            ]
+            continue
+
+        if item.id in seen_ids:
+            errors[index] = [
+                {
+                    "message": "The personal note is updated more than once in the batch.",
+                    "properties": ["id"],
+                }
+            ]
+            continue
+
+        seen_ids.add(item.id)
+        apply_patch(personal_note_entity, item, exclude={"id"})
+
+        item_errors = collect_validation_errors(
+            lambda: check_personal_note_types(
+                personal_note_entity, ALLOWED_PERSONAL_NOTE_TYPES
+            )
+        )
+
+        name = personal_note_entity.name
+        if existing_names.get(name, item.id) != item.id or (
+            names_in_batch.get(name, item.id) != item.id
+        ):
+            item_errors.append(_personal_note_name_conflict_error())
+
+        if item_errors:
+            # Leave the note out of the flush, so its changes are not saved.
+            db.expunge(personal_note_entity)
+            errors[index] = item_errors
+        else:
+            names_in_batch[name] = item.id
+            updated[index] = personal_note_entity
+
+    if updated:
+        with _personal_note_name_conflicts(db):
+            db.commit()
+
+        # Refresh the notes expired by the commit with one query, not one per note.
+        get_personal_notes_by_id(
+            db, user_id, task_id, [payload.items[index].id for index in updated]
+        )
+
+    return BatchResponse(
+        items=[
+            BatchItemResult(
+                index=index, item=updated.get(index), errors=errors.get(index)
+            )
+            for index in range(len(payload.items))
+        ]
+    )
 
 
 @router.patch(
@@ -101,34 +347,50 @@ def create_personal_note(
 )
 def update_personal_note(
     payload: PersonalNoteUpdate,
+    response: Response,
     user_id: str = Path(alias="userId"),
     task_id: int = Path(alias="taskId"),
     personal_note_id: int = Path(alias="personalNoteId"),
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
-    personal_note_entity = get_personal_note_or_404(
-        db, user_id, task_id, personal_note_id
-    )
+    changes = payload.dict(exclude_unset=True)
+    if_match_timestamps = get_if_match_timestamps(if_match, personal_note_id)
 
-    if payload.name:
-        personal_note_entity.name = payload.name
-        if not is_personal_note_name_unique(db, personal_note_entity, user_id):
-            raise_validation_exception(
-                f"A personal note with this same name already exists."
-            )
+    if not changes:
+        personal_note_entity = get_personal_note_or_404(
+            db, user_id, task_id, personal_note_id
+        )
+        check_if_match(personal_note_entity, if_match_timestamps)
+        response.headers["ETag"] = entity_etag(personal_note_entity)
+        return personal_note_entity
 
-    apply_patch(personal_note_entity, payload)
+    # Only the fields being changed need checking; the stored ones are already valid.
+    if "type" in changes:
+        check_personal_note_types(payload, ALLOWED_PERSONAL_NOTE_TYPES)
 
-    check_personal_note_types(
-        personal_note_entity,
-        [
-            PersonalNoteTypes.Description,
-            PersonalNoteTypes.ProgressReport,
-            PersonalNoteTypes.Observations,
-        ],
+    criteria = and_(
+        PersonalNote.user_id == user_id,
+        PersonalNote.task_id == task_id,
+        PersonalNote.id == personal_note_id,
     )
+    if if_match_timestamps is not None:
+        criteria = and_(criteria, version_in(PersonalNote, if_match_timestamps))
 
-    db.commit()
+    with _personal_note_name_conflicts(db):
+        personal_note_entity = update_returning(db, PersonalNote, criteria, changes)
+
+        if not personal_note_entity:
+            if if_match_timestamps is not None:
+                # Tell a missing note apart from one changed since it was read.
+                get_personal_note_etag_or_404(db, user_id, task_id, personal_note_id)
+                raise_precondition_failed()
+
+            raise HTTPException(404)
+
+        db.commit()
+
+    response.headers["ETag"] = entity_etag(personal_note_entity)
 
     return personal_note_entity
 
@@ -1,24 +1,81 @@
-from fastapi import Depends, APIRouter, Path
-from plm.schemas import Page, TaskResponse, TaskCreate, TaskUpdate
-from plm.models import Task
+import re
+from datetime import datetime
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import Depends, APIRouter, Path, Query, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from plm.schemas import (
+    BatchItemResult,
+    BatchResponse,
+    Page,
+    CursorPage,
+    CursorParams,
+    TaskResponse,
+    TaskCreate,
+    TaskUpdate,
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchDeleteResponse,
+    ChangesResponse,
+    TaskFilterParams,
+)
+from plm.models import Task, TASK_NAME_UNIQUE_CONSTRAINT
 from plm.dependencies import get_db
-from sqlmodel import Session, select
-from fastapi_pagination.ext.sqlalchemy import paginate
-from plm.services.db import apply_patch
+from sqlmodel import Session, select, and_
+from plm.services.db import (
+    insert_returning,
+    paginate_by_keyset,
+    paginate_by_offset,
+    update_returning,
+    unique_violation_as_validation_error,
+)
 from plm.endpoints.helpers.task_helpers import (
+    ALLOWED_TASK_STATUSES,
+    ALLOWED_TASK_TYPES,
+    TASK_SORTABLE_FIELDS,
+    task_filter_criteria,
     get_task_or_404,
-    is_task_name_unique,
+    get_task_etag_or_404,
     check_task_status,
     check_task_types,
+    delete_tasks,
     task_has_existing_personal_notes,
 )
 from plm.services.validation_exceptions import (
     raise_validation_exception,
+    collect_validation_errors,
 )
-from plm.enums import TaskStatus, TaskTypes
+from plm.endpoints.helpers.etag_helpers import (
+    entity_etag,
+    is_modified,
+    not_modified,
+    get_if_match_timestamps,
+    version_in,
+    check_if_match,
+    raise_precondition_failed,
+)
+from plm.endpoints.helpers.filter_helpers import SORT_DESCRIPTION, sort_order
+from plm.endpoints.helpers.conversion_helpers import task_from_create
+from plm.enums import ExportFormat
+from plm.services.export import iter_task_exports, to_csv, to_ndjson
+from plm.services.changes import get_changes, decode_change_cursor, position_since
+from plm.services.serialization import page_response
 
 router = APIRouter(prefix="/v1")
 
+TASK_NAME_CONFLICT_MESSAGE = "A task with this same name already exists."
+
+
+def _task_name_conflicts(db: Session):
+    return unique_violation_as_validation_error(
+        db, TASK_NAME_UNIQUE_CONSTRAINT, TASK_NAME_CONFLICT_MESSAGE
+    )
+
+
+def _task_name_conflict_error() -> dict:
+    return {"message": TASK_NAME_CONFLICT_MESSAGE, "properties": ["name"]}
+
 
 @router.get(
     path="/tasks/{userId}",
@@ -26,11 +83,102 @@ router = APIRouter(prefix="/v1")
     response_model=Page[TaskResponse],
     response_model_exclude_none=True,
 )
-def get_tasks(user_id: str = Path(alias="userId"), db: Session = Depends(get_db)):
+def get_tasks(
+    user_id: str = Path(alias="userId"),
+    filters: TaskFilterParams = Depends(),
+    sort: Optional[str] = Query(None, description=SORT_DESCRIPTION),
+    db: Session = Depends(get_db),
+):
+
+    query = select(Task).filter(Task.user_id == user_id, *task_filter_criteria(filters))
+
+    page = paginate_by_offset(
+        db, query.order_by(*sort_order(Task, sort, filters.q, TASK_SORTABLE_FIELDS))
+    )
+
+    return page_response(page, TaskResponse)
+
+
+@router.get(
+    path="/tasks/{userId}/cursor",
+    name="Get all tasks for a user, paginated by cursor",
+    response_model=CursorPage[TaskResponse],
+    response_model_exclude_none=True,
+)
+def get_tasks_by_cursor(
+    user_id: str = Path(alias="userId"),
+    params: CursorParams = Depends(),
+    filters: TaskFilterParams = Depends(),
+    db: Session = Depends(get_db),
+):
+
+    query = select(Task).filter(Task.user_id == user_id, *task_filter_criteria(filters))
+
+    return page_response(paginate_by_keyset(db, query, Task.id, params), TaskResponse)
+
+
+@router.get(
+    path="/tasks/{userId}/export",
+    name="Export all tasks and personal notes of a user",
+    description="Streams every task with its personal notes, as one JSON object per line (ndjson) or as one CSV line per personal note (csv).",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        }
+    },
+)
+def export_tasks(
+    user_id: str = Path(alias="userId"),
+    export_format: ExportFormat = Query(ExportFormat.Ndjson, alias="format"),
+    db: Session = Depends(get_db),
+):
+    task_exports = iter_task_exports(db, user_id)
+
+    if export_format == ExportFormat.Csv:
+        content, media_type = to_csv(task_exports), "text/csv"
+    else:
+        content, media_type = to_ndjson(task_exports), "application/x-ndjson"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": _attachment(f"tasks-{user_id}.{export_format}")
+        },
+    )
+
+
+def _attachment(filename: str) -> str:
+    # The user id is free text, so only safe characters are kept in the quoted
+    # filename, and the exact one is given percent-encoded in filename* (RFC 6266).
+    fallback = re.sub(r"[^A-Za-z0-9._-]", "_", filename)
+    encoded = quote(filename, safe="")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{encoded}"
+
+
+@router.get(
+    path="/tasks/{userId}/changes",
+    name="Get the tasks and personal notes changed since a point in time",
+    description="Pass since for the first sync, then the returned nextCursor, both to get the next page while hasMore is true and to start the next sync.",
+    response_model=ChangesResponse,
+    response_model_exclude_none=True,
+)
+def get_task_changes(
+    user_id: str = Path(alias="userId"),
+    since: Optional[datetime] = Query(
+        None, description="Only changes after this time, or all of them if not set"
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous response"),
+    limit: int = Query(500, ge=1, le=1_000, description="Limit"),
+    db: Session = Depends(get_db),
+):
+    if since and cursor:
+        raise_validation_exception("Pass either since or cursor, not both.", "since")
 
-    query = select(Task).filter(Task.user_id == user_id)
+    position = decode_change_cursor(cursor) if cursor else position_since(since)
 
-    return paginate(db, query.order_by(Task.id))
+    return get_changes(db, user_id, position, limit)
 
 
 @router.get(
@@ -40,16 +188,114 @@ def get_tasks(user_id: str = Path(alias="userId"), db: Session = Depends(get_db)
     response_model_exclude_none=True,
 )
 def get_task(
+    response: Response,
     user_id: str = Path(alias="userId"),
     task_id: int = Path(alias="taskId"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
+    # Polling clients usually have the current version, which only needs its ETag.
+    if if_none_match:
+        etag = get_task_etag_or_404(db, user_id, task_id)
+        if not is_modified(if_none_match, etag):
+            return not_modified(etag)
 
     query = get_task_or_404(db, user_id, task_id)
+    response.headers["ETag"] = entity_etag(query)
 
     return query
 
 
+@router.post(
+    path="/tasks/{userId}:batch",
+    name="Create several tasks",
+    description="Valid tasks are created even if others fail, and the result of each one is returned in the same order as the request.",
+    response_model=BatchResponse[TaskResponse],
+    response_model_exclude_none=True,
+)
+def create_tasks(
+    payload: TaskBatchCreate,
+    user_id: str = Path(alias="userId"),
+    db: Session = Depends(get_db),
+):
+    names = sorted({item.name for item in payload.items})
+    existing_names = set(
+        db.exec(
+            select(Task.name).where(and_(Task.user_id == user_id, Task.name.in_(names)))
+        ).all()
+    )
+
+    errors = {}
+    accepted = {}
+    for index, item in enumerate(payload.items):
+        task_entity = task_from_create(item, user_id)
+
+        item_errors = collect_validation_errors(
+            lambda: check_task_status(task_entity, ALLOWED_TASK_STATUSES),
+            lambda: check_task_types(task_entity, ALLOWED_TASK_TYPES),
+        )
+
+        # The first task with a given name wins, both against the table and the batch.
+        if task_entity.name in existing_names or task_entity.name in accepted:
+            item_errors.append(_task_name_conflict_error())
+
+        if item_errors:
+            errors[index] = item_errors
+        else:
+            accepted[task_entity.name] = (index, task_entity)
+
+    created = {}
+    if accepted:
+        # Names created concurrently since the check above are skipped, not failed.
+        for task_entity in insert_returning(
+            db,
+            Task,
+            [task_entity for _, task_entity in accepted.values()],
+            conflict_constraint=TASK_NAME_UNIQUE_CONSTRAINT,
+        ):
+            index, _ = accepted.pop(task_entity.name)
+            created[index] = task_entity
+
+        db.commit()
+
+    for index, _ in accepted.values():
+        errors[index] = [_task_name_conflict_error()]
+
+    return BatchResponse(
+        items=[
+            BatchItemResult(
+                index=index, item=created.get(index), errors=errors.get(index)
+            )
+            for index in range(len(payload.items))
+        ]
+    )
+
+
+@router.post(
+    path="/tasks/{userId}:batch-delete",
+    name="Delete several tasks",
+    description="Tasks that do not exist, or that still have personal notes when cascade is not set, are left alone and returned in notDeletedIds.",
+    response_model=TaskBatchDeleteResponse,
+)
+def delete_tasks_in_batch(
+    payload: TaskBatchDelete,
+    user_id: str = Path(alias="userId"),
+    db: Session = Depends(get_db),
+):
+    deleted_task_ids, deleted_personal_notes = delete_tasks(
+        db, user_id, payload.ids, payload.cascade
+    )
+    db.commit()
+
+    deleted = set(deleted_task_ids)
+
+    return TaskBatchDeleteResponse(
+        deleted_tasks=len(deleted),
+        deleted_personal_notes=deleted_personal_notes,
+        not_deleted_ids=[task_id for task_id in payload.ids if task_id not in deleted],
+    )
+
+
 @router.post(
     path="/tasks/{userId}",
     name="Create new task",
@@ -61,29 +307,15 @@ def create_task(
     user_id: str = Path(alias="userId"),
     db: Session = Depends(get_db),
 ):
-    task_entity = Task.parse_obj(payload)
-    task_entity.user_id = user_id
-
-    if not is_task_name_unique(db, task_entity, user_id):
-        raise_validation_exception(f"A task with this same name already exists.")
-
-    check_task_status(
-        task_entity,
-        [
-            TaskStatus.ToDo,
-            TaskStatus.InProgress,
-            TaskStatus.PendingForRevision,
-            TaskStatus.Done,
-        ],
-    )
+    task_entity = task_from_create(payload, user_id)
 
-    check_task_types(
-        task_entity,
-        [TaskTypes.Work, TaskTypes.Studies, TaskTypes.WellBeing, TaskTypes.Others],
-    )
+    check_task_status(task_entity, ALLOWED_TASK_STATUSES)
+
+    check_task_types(task_entity, ALLOWED_TASK_TYPES)
 
     db.add(task_entity)
-    db.commit()
+    with _task_name_conflicts(db):
+        db.commit()
 
     return task_entity
 
@@ -96,35 +328,46 @@ def create_task(
 )
 def update_task(
     payload: TaskUpdate,
+    response: Response,
     user_id: str = Path(alias="userId"),
     task_id: int = Path(alias="taskId"),
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
-    task_entity = get_task_or_404(db, user_id, task_id)
+    changes = payload.dict(exclude_unset=True)
+    if_match_timestamps = get_if_match_timestamps(if_match, task_id)
 
-    if payload.name and payload.name != task_entity.name:
-        task_entity.name = payload.name
-        if not is_task_name_unique(db, task_entity, user_id):
-            raise_validation_exception(f"A task with this same name already exists.")
-
-    apply_patch(task_entity, payload)
-
-    check_task_status(
-        task_entity,
-        [
-            TaskStatus.ToDo,
-            TaskStatus.InProgress,
-            TaskStatus.PendingForRevision,
-            TaskStatus.Done,
-        ],
-    )
+    if not changes:
+        task_entity = get_task_or_404(db, user_id, task_id)
+        check_if_match(task_entity, if_match_timestamps)
+        response.headers["ETag"] = entity_etag(task_entity)
+        return task_entity
 
-    check_task_types(
-        task_entity,
-        [TaskTypes.Work, TaskTypes.Studies, TaskTypes.WellBeing, TaskTypes.Others],
-    )
+    # Only the fields being changed need checking; the stored ones are already valid.
+    if "status" in changes:
+        check_task_status(payload, ALLOWED_TASK_STATUSES)
 
-    db.commit()
+    if "type" in changes:
+        check_task_types(payload, ALLOWED_TASK_TYPES)
+
+    criteria = and_(Task.user_id == user_id, Task.id == task_id)
+    if if_match_timestamps is not None:
+        criteria = and_(criteria, version_in(Task, if_match_timestamps))
+
+    with _task_name_conflicts(db):
+        task_entity = update_returning(db, Task, criteria, changes)
+
+        if not task_entity:
+            if if_match_timestamps is not None:
+                # Tell a missing task apart from one changed since it was read.
+                get_task_etag_or_404(db, user_id, task_id)
+                raise_precondition_failed()
+
+            raise HTTPException(404)
+
+        db.commit()
+
+    response.headers["ETag"] = entity_etag(task_entity)
 
     return task_entity
 
@@ -133,8 +376,20 @@ def update_task(
 def delete_task(
     user_id: str = Path(alias="userId"),
     task_id: int = Path(alias="taskId"),
+    cascade: bool = Query(
+        False, description="Also delete the personal notes of the task"
+    ),
     db: Session = Depends(get_db),
 ) -> None:
+    if cascade:
+        deleted_task_ids, _ = delete_tasks(db, user_id, [task_id], cascade=True)
+
+        if not deleted_task_ids:
+            raise HTTPException(404)
+
+        db.commit()
+        return
+
     task_entity = get_task_or_404(db, user_id, task_id)
 
     if task_has_existing_personal_notes(db, task_entity):
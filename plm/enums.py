@@ -29,3 +29,19 @@ class PersonalNoteTypes(_StringEnum):
     Description = "Description"
     ProgressReport = "Progress Report"
     Observations = "Observations"
+
+
+class EmailJobStatus(_StringEnum):
+    Pending = "Pending"
+    Sent = "Sent"
+    Failed = "Failed"
+
+
+class ExportFormat(_StringEnum):
+    Ndjson = "ndjson"
+    Csv = "csv"
+
+
+class EntityType(_StringEnum):
+    Task = "task"
+    PersonalNote = "personal_note"
@@ -12,13 +12,31 @@ from fastapi import FastAPI, Depends, Request, status
 from fastapi_pagination import add_pagination
 
 from plm.settings import PlmSettings
-from plm.services.db import get_engine
-from plm.dependencies import initialize_dependencies
+from plm.services.db import (
+    get_engine,
+    get_async_engine,
+    get_credential_provider,
+    instrument_engine,
+    query_stats_middleware,
+    configure_entity_cache,
+    register_cache_invalidation,
+)
+from plm.dependencies import (
+    initialize_dependencies,
+    close_dependencies,
+    get_smtp_pool,
+)
+from plm.services.email_dispatcher import EmailDispatcher
+from plm.services.metrics import instrument_pool, metrics_middleware, mark_process_dead
 from plm.endpoints.v1.health import router as health_router
+from plm.endpoints.v1.metrics import router as metrics_router
 from plm.endpoints.v1.migration import router as migration_router
 from plm.endpoints.v1.task import router as task_router
 from plm.endpoints.v1.personal_note import router as personal_note_router
 from plm.endpoints.v1.email_service import router as emails_router
+from plm.endpoints.v1.data_import import router as import_router
+from plm.endpoints.v1.async_task import router as async_task_router
+from plm.endpoints.v1.async_personal_note import router as async_personal_note_router
 
 try:
     settings = PlmSettings()
@@ -26,9 +44,29 @@ except Exception as e:
     logging.exception("Unable to load settings, check the environment.")
     sys.exit(1)
 
-engine = get_engine(settings)
+# Both engines share the provider, so they also share its cached credentials.
+credentials = get_credential_provider(settings)
+engine = get_engine(settings, credentials)
+async_engine = get_async_engine(settings, credentials)
+
+instrument_engine(engine, settings.db_slow_query_threshold_ms)
+instrument_engine(async_engine.sync_engine, settings.db_slow_query_threshold_ms)
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
 
-initialize_dependencies(settings, engine)
+configure_entity_cache(settings)
+register_cache_invalidation()
+
+initialize_dependencies(settings, engine, async_engine)
+
+email_dispatcher = EmailDispatcher(
+    engine,
+    get_smtp_pool(settings),
+    batch_size=settings.email_dispatch_batch_size,
+    poll_interval=settings.email_dispatch_poll_interval,
+    max_attempts=settings.email_dispatch_max_attempts,
+    retry_backoff=settings.email_dispatch_retry_backoff,
+)
 
 app = FastAPI(
     title="Personal Life Manager API",
@@ -36,6 +74,9 @@ app = FastAPI(
     root_path="/",
 )
 
+app.middleware("http")(query_stats_middleware)
+app.middleware("http")(metrics_middleware)
+
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -51,12 +92,29 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.on_event("startup")
+def startup():
+    if settings.email_dispatch_enabled:
+        email_dispatcher.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    email_dispatcher.stop(timeout=10)
+    close_dependencies()
+    mark_process_dead()
+
+
 add_pagination(app)
 
 app.include_router(health_router, tags=["Health"])
+app.include_router(metrics_router)
 app.include_router(migration_router, tags=["Schema Migration"])
 app.include_router(task_router, tags=["Tasks"])
 app.include_router(personal_note_router, tags=["Personal Notes"])
 app.include_router(emails_router, tags=["Emails"])
+app.include_router(import_router, tags=["Import"])
+app.include_router(async_task_router, tags=["Tasks (async)"])
+app.include_router(async_personal_note_router, tags=["Personal Notes (async)"])
 
 logging.getLogger().setLevel(logging.INFO)
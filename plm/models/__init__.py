@@ -1,5 +1,18 @@
+from plm.models.registry import (
+    camel_alias,
+    to_camel,
+    to_snake,
+    field_aliases,
+    construct_entity,
+    entity_from,
+)
 from plm.models.camel_model import CamelModel
 from plm.models.entity import Entity
 from plm.models.migration import SchemaVersion
-from plm.models.task import Task
-from plm.models.personal_note import PersonalNote
+from plm.models.task import Task, TASK_NAME_UNIQUE_CONSTRAINT
+from plm.models.personal_note import (
+    PersonalNote,
+    PERSONAL_NOTE_NAME_UNIQUE_CONSTRAINT,
+)
+from plm.models.email_job import EmailJob
+from plm.models.tombstone import Tombstone
@@ -1,10 +1,10 @@
 from sqlmodel import SQLModel
 
-from humps import camelize
+from plm.models.registry import camel_alias
 
 
 class CamelModel(SQLModel):
     class Config:
-        alias_generator = camelize
+        alias_generator = camel_alias
         allow_population_by_field_name = True
         anystr_strip_whitespace = True
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+
+from plm.models import Entity
+
+
+class EmailJob(Entity, table=True):
+    __tablename__ = "email_job"
+
+    task_id: int
+    user_id: str
+    status: str
+    to_address: str
+    message: str
+    attempts: int = 0
+    next_attempt_on: Optional[datetime]
+    last_error: Optional[str]
+    sent_on: Optional[datetime]
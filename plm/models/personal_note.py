@@ -1,9 +1,15 @@
 from plm.models import Entity, Task
 from sqlmodel import Relationship, Field
+from sqlalchemy import UniqueConstraint
+
+PERSONAL_NOTE_NAME_UNIQUE_CONSTRAINT = "personal_note_user_id_name_key"
 
 
 class PersonalNote(Entity, table=True):
     __tablename__ = "personal_note"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name=PERSONAL_NOTE_NAME_UNIQUE_CONSTRAINT),
+    )
 
     task_id: int = Field(default=None, foreign_key="task.id")
     name: str
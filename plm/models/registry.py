@@ -0,0 +1,103 @@
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Tuple, Type, TypeVar
+
+from humps import camelize, decamelize
+from pydantic import BaseModel
+from sqlalchemy.orm import configure_mappers
+
+M = TypeVar("M", bound=BaseModel)
+
+# The aliases of the fields of the models of plm.models and plm.schemas, registered
+# by camel_alias as the models are declared, so by the time a request is served all
+# of them are in here. Nothing else is added, so names sent by clients cannot grow it.
+_CAMEL_ALIASES: Dict[str, str] = {}
+_FIELD_NAMES: Dict[str, str] = {}
+
+
+def camel_alias(name: str) -> str:
+    """
+    The alias generator of the models, which registers the alias of each field.
+    """
+    alias = _CAMEL_ALIASES.get(name)
+    if alias is None:
+        alias = _CAMEL_ALIASES[name] = camelize(name)
+        _FIELD_NAMES.setdefault(alias, name)
+
+    return alias
+
+
+def to_camel(name: str) -> str:
+    # The alias of the field, or camelize for names that are not one.
+    alias = _CAMEL_ALIASES.get(name)
+    if alias is None:
+        alias = camelize(name)
+
+    return alias
+
+
+def to_snake(alias: str) -> str:
+    # The field with this alias, or decamelize for names that are not one.
+    name = _FIELD_NAMES.get(alias)
+    if name is None:
+        name = decamelize(alias)
+
+    return name
+
+
+@lru_cache(maxsize=None)
+def field_aliases(model: Type[BaseModel]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((field.name, field.alias) for field in model.__fields__.values())
+
+
+@lru_cache(maxsize=None)
+def _field_defaults(model: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    # Only default values, not factories, so they can be shared between instances.
+    return tuple((field.name, field.default) for field in model.__fields__.values())
+
+
+@lru_cache(maxsize=None)
+def _shared_fields(source: Type[BaseModel], model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(name for name in source.__fields__ if name in model.__fields__)
+
+
+def construct_entity(model: Type[M], values: Mapping[str, Any]) -> M:
+    """
+    A table model holding values that have been validated already, such as those of
+    a create schema or of a row returned by the database. Unlike parse_obj it
+    validates nothing, and fields missing from values get their default. The entity
+    is transient, as one created with the constructor, and the session inserts it
+    the same way.
+    """
+    # Creates the instance along with its SQLAlchemy state, without running the
+    # __init__ of SQLModel, which validates. Mappers are configured by the first
+    # instance created, so it has to be done here in case this is the first.
+    configure_mappers()
+    entity = model._sa_class_manager.new_instance()
+
+    # Pydantic and SQLAlchemy both keep the values in __dict__, which is also where
+    # SQLAlchemy writes the rows it loads. Nothing tracks changes to a new entity,
+    # so this is the same as setting each field.
+    fields = dict(_field_defaults(model))
+    fields_set = set()
+    for name, value in values.items():
+        if name in fields:
+            fields[name] = value
+            fields_set.add(name)
+
+    entity.__dict__.update(fields)
+    object.__setattr__(entity, "__fields_set__", fields_set)
+
+    return entity
+
+
+def entity_from(model: Type[M], source: BaseModel, **values: Any) -> M:
+    """
+    construct_entity with the fields source has in common with model, such as a
+    Task from a TaskCreate, overridden by values.
+    """
+    fields = {
+        name: getattr(source, name) for name in _shared_fields(type(source), model)
+    }
+    fields.update(values)
+
+    return construct_entity(model, fields)
@@ -1,10 +1,16 @@
 from typing import List
 from plm.models import Entity
 from sqlmodel import Relationship
+from sqlalchemy import UniqueConstraint
+
+TASK_NAME_UNIQUE_CONSTRAINT = "task_user_id_name_key"
 
 
 class Task(Entity, table=True):
     __tablename__ = "task"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name=TASK_NAME_UNIQUE_CONSTRAINT),
+    )
 
     name: str
     status: str
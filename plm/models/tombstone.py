@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field
+
+from plm.models import CamelModel
+
+
+class Tombstone(CamelModel, table=True):
+    """
+    Left behind by the delete triggers of task and personal_note.
+    """
+
+    __tablename__ = "tombstone"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entity_type: str
+    entity_id: int
+    task_id: Optional[int]
+    user_id: str
+    deleted_on: datetime
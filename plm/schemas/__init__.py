@@ -1,8 +1,24 @@
 from plm.schemas.migration import SchemaVersionResponse, MigrationResponse
-from plm.schemas.pagination import Page
-from plm.schemas.task import TaskResponse, TaskCreate, TaskUpdate
+from plm.schemas.pagination import Page, CursorPage, CursorParams
+from plm.schemas.batch import BatchItemError, BatchItemResult, BatchResponse
+from plm.schemas.task import (
+    TaskResponse,
+    TaskCreate,
+    TaskUpdate,
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchDeleteResponse,
+    TaskExport,
+)
 from plm.schemas.personal_note import (
     PersonalNoteResponse,
+    PersonalNoteSparseResponse,
     PersonalNoteCreate,
     PersonalNoteUpdate,
+    PersonalNoteBatchCreate,
+    PersonalNoteBatchUpdate,
 )
+from plm.schemas.email_job import EmailJobResponse
+from plm.schemas.data_import import ImportRowError, ImportResponse
+from plm.schemas.changes import DeletedEntity, ChangesResponse
+from plm.schemas.filters import TaskFilterParams, PersonalNoteFilterParams
@@ -0,0 +1,31 @@
+from typing import TypeVar, Generic, List, Optional
+
+from pydantic import BaseModel
+from pydantic.generics import GenericModel
+
+from plm.models import camel_alias
+
+T = TypeVar("T")
+
+
+class BatchItemError(BaseModel):
+    message: str
+    properties: Optional[List[str]]
+
+
+class BatchItemResult(GenericModel, Generic[T]):
+    index: int
+    item: Optional[T]
+    errors: Optional[List[BatchItemError]]
+
+    class Config:
+        alias_generator = camel_alias
+        allow_population_by_field_name = True
+
+
+class BatchResponse(GenericModel, Generic[T]):
+    items: List[BatchItemResult[T]]
+
+    class Config:
+        alias_generator = camel_alias
+        allow_population_by_field_name = True
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import List, Optional
+
+from plm.enums import EntityType
+from plm.models import CamelModel
+from plm.schemas.task import TaskResponse
+from plm.schemas.personal_note import PersonalNoteResponse
+
+
+class DeletedEntity(CamelModel):
+    type: EntityType
+    id: int
+    task_id: Optional[int]
+    deleted_on: datetime
+
+
+class ChangesResponse(CamelModel):
+    tasks: List[TaskResponse]
+    personal_notes: List[PersonalNoteResponse]
+    deleted: List[DeletedEntity]
+    # Pass it back to get the next page or, once has_more is false, the next sync.
+    next_cursor: str
+    has_more: bool
@@ -0,0 +1,21 @@
+from typing import List, Optional
+
+from plm.models import CamelModel
+
+
+class ImportRowError(CamelModel):
+    line: int
+    message: str
+    properties: Optional[List[str]]
+
+
+class ImportResponse(CamelModel):
+    rows_read: int
+    rows_rejected: int
+    tasks_imported: int
+    tasks_skipped: int
+    personal_notes_imported: int
+    personal_notes_skipped: int
+    errors: List[ImportRowError]
+    elapsed_seconds: float
+    rows_per_second: float
@@ -0,0 +1,16 @@
+from plm.models import CamelModel
+
+from datetime import datetime
+
+from typing import Optional
+
+
+class EmailJobResponse(CamelModel):
+    id: int
+    task_id: int
+    status: str
+    attempts: int
+    next_attempt_on: Optional[datetime]
+    last_error: Optional[str]
+    sent_on: Optional[datetime]
+    created_on: datetime
@@ -0,0 +1,66 @@
+import inspect
+from datetime import datetime
+from typing import List, Optional, Type
+
+from fastapi import Query
+from pydantic import BaseModel
+
+
+def query_params(model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Keeps the Query of each field in the signature of the model, which FastAPI reads
+    when the model is used with Depends(). Pydantic replaces them with their
+    defaults, and FastAPI would then expect lists such as ?status=a&status=b in
+    the body.
+    """
+    model.__signature__ = inspect.Signature(
+        [
+            inspect.Parameter(
+                field.name,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=field.field_info,
+                annotation=field.annotation,
+            )
+            for field in model.__fields__.values()
+        ]
+    )
+    return model
+
+
+class FilterParams(BaseModel):
+    type: Optional[List[str]] = Query(None, description="Only these types")
+    name_prefix: Optional[str] = Query(
+        None, alias="namePrefix", description="Only names starting with this"
+    )
+    created_from: Optional[datetime] = Query(
+        None, alias="createdFrom", description="Only created at or after this time"
+    )
+    created_to: Optional[datetime] = Query(
+        None, alias="createdTo", description="Only created before this time"
+    )
+    modified_from: Optional[datetime] = Query(
+        None, alias="modifiedFrom", description="Only modified at or after this time"
+    )
+    modified_to: Optional[datetime] = Query(
+        None, alias="modifiedTo", description="Only modified before this time"
+    )
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+@query_params
+class TaskFilterParams(FilterParams):
+    status: Optional[List[str]] = Query(None, description="Only these statuses")
+    q: Optional[str] = Query(
+        None, min_length=1, description="Full-text search over the name of the task"
+    )
+
+
+@query_params
+class PersonalNoteFilterParams(FilterParams):
+    q: Optional[str] = Query(
+        None,
+        min_length=1,
+        description="Full-text search over the name and text of the note",
+    )
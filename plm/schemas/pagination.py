@@ -1,12 +1,16 @@
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Optional, Sequence
 
 from fastapi import Query
+from pydantic import BaseModel
+from pydantic.generics import GenericModel
 
 from fastapi_pagination.limit_offset import (
     LimitOffsetPage as BasePage,
     LimitOffsetParams as BaseParams,
 )
 
+from plm.models import camel_alias
+
 T = TypeVar("T")
 
 
@@ -16,3 +20,26 @@ class Params(BaseParams):
 
 class Page(BasePage[T], Generic[T]):
     __params_type__ = Params
+
+
+class CursorParams(BaseModel):
+    cursor: Optional[str] = Query(None, description="Cursor for the next page")
+    limit: int = Query(50, ge=1, le=1_000, description="Limit")
+    include_total: bool = Query(
+        False,
+        alias="includeTotal",
+        description="Also count all items, which costs an extra query",
+    )
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class CursorPage(GenericModel, Generic[T]):
+    items: Sequence[T]
+    next_cursor: Optional[str]
+    total: Optional[int]
+
+    class Config:
+        alias_generator = camel_alias
+        allow_population_by_field_name = True
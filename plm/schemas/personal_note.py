@@ -4,6 +4,8 @@ from datetime import datetime
 
 from typing import Optional
 
+from pydantic import conlist
+
 
 class PersonalNoteResponse(CamelModel):
     id: int
@@ -17,6 +19,23 @@ class PersonalNoteResponse(CamelModel):
     modified_on: Optional[datetime]
 
 
+class PersonalNoteSparseResponse(CamelModel):
+    """
+    A personal note in a list, which may hold only the fields asked for with
+    fields=. The id is always included.
+    """
+
+    id: int
+    name: Optional[str]
+    type: Optional[str]
+    note: Optional[str]
+    correspondence_email_address: Optional[str]
+    created_by: Optional[str]
+    created_on: Optional[datetime]
+    modified_by: Optional[str]
+    modified_on: Optional[datetime]
+
+
 class PersonalNoteCreate(CamelModel):
     name: str
     type: str
@@ -29,3 +48,15 @@ class PersonalNoteUpdate(CamelModel):
     name: Optional[str]
     type: Optional[str]
     note: Optional[str]
+
+
+class PersonalNoteBatchCreate(CamelModel):
+    items: conlist(PersonalNoteCreate, min_items=1, max_items=1_000)
+
+
+class PersonalNoteBatchUpdateItem(PersonalNoteUpdate):
+    id: int
+
+
+class PersonalNoteBatchUpdate(CamelModel):
+    items: conlist(PersonalNoteBatchUpdateItem, min_items=1, max_items=1_000)
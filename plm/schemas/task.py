@@ -1,8 +1,11 @@
 from plm.models import CamelModel
+from plm.schemas.personal_note import PersonalNoteResponse
 
 from datetime import datetime
 
-from typing import Optional
+from typing import List, Optional
+
+from pydantic import conlist
 
 
 class TaskResponse(CamelModel):
@@ -29,3 +32,22 @@ class TaskUpdate(CamelModel):
     name: Optional[str]
     status: Optional[str]
     type: Optional[str]
+
+
+class TaskBatchCreate(CamelModel):
+    items: conlist(TaskCreate, min_items=1, max_items=1_000)
+
+
+class TaskBatchDelete(CamelModel):
+    ids: conlist(int, min_items=1, max_items=1_000)
+    cascade: bool = False
+
+
+class TaskBatchDeleteResponse(CamelModel):
+    deleted_tasks: int
+    deleted_personal_notes: int
+    not_deleted_ids: List[int]
+
+
+class TaskExport(TaskResponse):
+    personal_notes: List[PersonalNoteResponse]
@@ -0,0 +1,248 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from heapq import merge
+from itertools import islice
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlmodel import Session, select, func, text, tuple_, and_
+
+from plm.models import Task, PersonalNote, Tombstone
+from plm.schemas import (
+    ChangesResponse,
+    DeletedEntity,
+    TaskResponse,
+    PersonalNoteResponse,
+)
+from plm.services.db import to_audit_timestamp
+from plm.services.export import EXPORT_APPLICATION_NAME
+from plm.services.validation_exceptions import raise_validation_exception
+
+# Changes written at the same time are ordered tasks first, then notes, then
+# deletions, and by id within each kind.
+_TASK_RANK = 0
+_PERSONAL_NOTE_RANK = 1
+_TOMBSTONE_RANK = 2
+# Ranks after every kind, so a position built from a timestamp skips all the
+# changes made at that exact time.
+_AFTER_ALL_RANKS = 3
+_MICROSECOND = timedelta(microseconds=1)
+
+# Writes are stamped with the start of their transaction, so a transaction still
+# running may commit changes older than the ones already visible. Only changes older
+# than the oldest running transaction of the API (ours included) are returned, so a
+# client never moves its cursor past a change that has yet to commit. Exports are
+# left out, since they only read and stream for as long as the client takes to
+# download. Any other transaction holds the horizon back by CHANGES_MAX_LAG at most,
+# so one left open does not stall the feed of every user; changes committed by a
+# transaction running for longer than that may be skipped by clients already past
+# its start.
+CHANGES_MAX_LAG = timedelta(minutes=5)
+
+_HORIZON = text(
+    """
+    select cast(
+        least(now(), greatest(min(xact_start), now() - make_interval(secs => :max_lag)))
+        as timestamp
+    )
+    from pg_stat_activity
+    where datname = current_database()
+    and usename = current_user
+    and xact_start is not null
+    and application_name is distinct from :export_application_name
+    """
+).bindparams(
+    max_lag=CHANGES_MAX_LAG.total_seconds(),
+    export_application_name=EXPORT_APPLICATION_NAME,
+)
+
+# Tombstones are pruned after this long by the delete triggers (see V0.8), each time
+# the user deletes something, so a cursor older than this may have missed deletions.
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+class ChangePosition(NamedTuple):
+    changed_on: datetime
+    rank: int
+    id: int
+
+
+def encode_change_cursor(position: ChangePosition) -> str:
+    payload = json.dumps(
+        {"t": position.changed_on.isoformat(), "r": position.rank, "i": position.id}
+    ).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_change_cursor(cursor: str) -> ChangePosition:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        position = ChangePosition(
+            datetime.fromisoformat(payload["t"]), payload["r"], payload["i"]
+        )
+    except (ValueError, KeyError, TypeError):
+        position = None
+
+    if (
+        position is None
+        or position.rank not in range(_AFTER_ALL_RANKS + 1)
+        or type(position.id) != int
+        or position.changed_on.tzinfo is not None
+    ):
+        raise_validation_exception("The cursor is not valid.", "cursor")
+
+    return position
+
+
+def position_since(since: Optional[datetime]) -> ChangePosition:
+    if since is None:
+        return ChangePosition(datetime.min, _AFTER_ALL_RANKS, 0)
+
+    return ChangePosition(to_audit_timestamp(since), _AFTER_ALL_RANKS, 0)
+
+
+def _position_before(changed_on: datetime) -> ChangePosition:
+    # After every change of the microsecond before, so the changes made at
+    # changed_on are included.
+    return ChangePosition(changed_on - _MICROSECOND, _AFTER_ALL_RANKS, 0)
+
+
+def _after(position: ChangePosition, changed_on, id_column, rank: int):
+    # The keyset condition (changed_on, rank, id) > position for a kind whose rank
+    # is constant, written so the (user_id, changed_on, id) indexes can be used.
+    if rank > position.rank:
+        return changed_on >= position.changed_on
+
+    if rank < position.rank:
+        return changed_on > position.changed_on
+
+    return tuple_(changed_on, id_column) > tuple_(position.changed_on, position.id)
+
+
+def _changed_entities(
+    db: Session,
+    model,
+    rank: int,
+    user_id: str,
+    position: ChangePosition,
+    horizon: datetime,
+    limit: int,
+) -> List[Tuple[ChangePosition, object]]:
+    changed_on = func.coalesce(model.modified_on, model.created_on)
+
+    entities = db.exec(
+        select(model)
+        .where(
+            and_(
+                model.user_id == user_id,
+                _after(position, changed_on, model.id, rank),
+                changed_on < horizon,
+            )
+        )
+        .order_by(changed_on, model.id)
+        .limit(limit)
+    ).all()
+
+    return [
+        (
+            ChangePosition(entity.modified_on or entity.created_on, rank, entity.id),
+            entity,
+        )
+        for entity in entities
+    ]
+
+
+def _tombstones(
+    db: Session,
+    user_id: str,
+    position: ChangePosition,
+    horizon: datetime,
+    limit: int,
+) -> List[Tuple[ChangePosition, Tombstone]]:
+    tombstones = db.exec(
+        select(Tombstone)
+        .where(
+            and_(
+                Tombstone.user_id == user_id,
+                _after(position, Tombstone.deleted_on, Tombstone.id, _TOMBSTONE_RANK),
+                Tombstone.deleted_on < horizon,
+            )
+        )
+        .order_by(Tombstone.deleted_on, Tombstone.id)
+        .limit(limit)
+    ).all()
+
+    return [
+        (ChangePosition(tombstone.deleted_on, _TOMBSTONE_RANK, tombstone.id), tombstone)
+        for tombstone in tombstones
+    ]
+
+
+def get_changes(
+    db: Session, user_id: str, position: ChangePosition, limit: int
+) -> ChangesResponse:
+    """
+    The tasks and personal notes of the user created, updated or deleted after the
+    position, oldest first. Each kind is read with a range scan of at most limit + 1
+    rows and the three are merged, so a page costs the same however much data the
+    user has.
+    """
+    horizon = db.execute(_HORIZON).scalar_one()
+
+    if position.changed_on != datetime.min and (
+        position.changed_on < horizon - TOMBSTONE_RETENTION
+    ):
+        raise_validation_exception(
+            "The changes since then are no longer kept, sync again from the start.",
+            ["since", "cursor"],
+        )
+
+    changes: Iterator[Tuple[ChangePosition, object]] = merge(
+        _changed_entities(db, Task, _TASK_RANK, user_id, position, horizon, limit + 1),
+        _changed_entities(
+            db,
+            PersonalNote,
+            _PERSONAL_NOTE_RANK,
+            user_id,
+            position,
+            horizon,
+            limit + 1,
+        ),
+        _tombstones(db, user_id, position, horizon, limit + 1),
+        key=lambda change: change[0],
+    )
+    page = list(islice(changes, limit + 1))
+
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    next_position = page[-1][0] if page else position
+    if not has_more:
+        # Every change before the horizon has been returned, so the next sync starts
+        # there. Otherwise the cursor of idle data would fall behind the tombstones.
+        next_position = max(next_position, _position_before(horizon))
+
+    response = ChangesResponse(
+        tasks=[],
+        personal_notes=[],
+        deleted=[],
+        next_cursor=encode_change_cursor(next_position),
+        has_more=has_more,
+    )
+
+    for change_position, entity in page:
+        if change_position.rank == _TASK_RANK:
+            response.tasks.append(TaskResponse.from_orm(entity))
+        elif change_position.rank == _PERSONAL_NOTE_RANK:
+            response.personal_notes.append(PersonalNoteResponse.from_orm(entity))
+        else:
+            response.deleted.append(
+                DeletedEntity(
+                    type=entity.entity_type,
+                    id=entity.entity_id,
+                    task_id=entity.task_id,
+                    deleted_on=entity.deleted_on,
+                )
+            )
+
+    return response
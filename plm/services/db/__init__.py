@@ -1,3 +1,37 @@
-from plm.services.db.engine import get_engine
-from plm.services.db.session_with_user import SessionWithUser
+from plm.services.db.engine import get_engine, get_async_engine, get_pool_status
+from plm.services.db.session_with_user import (
+    SessionWithUser,
+    AsyncSessionWithUser,
+)
+from plm.services.db.audit import get_audit_user_id, to_audit_timestamp
+from plm.services.db.bulk import insert_returning, update_returning
 from plm.services.db.patcher import apply_patch
+from plm.services.db.instrumentation import (
+    QueryStats,
+    get_query_stats,
+    instrument_engine,
+    query_stats_middleware,
+)
+from plm.services.db.keyset import paginate_by_keyset
+from plm.services.db.offset import paginate_by_offset
+from plm.services.db.conflicts import unique_violation_as_validation_error
+from plm.services.db.credentials import (
+    CredentialProvider,
+    StaticCredentialProvider,
+    FileCredentialProvider,
+    CachedCredentialProvider,
+    get_credential_provider,
+)
+from plm.services.db.cache import (
+    CacheBackend,
+    LocalCacheBackend,
+    EntityCache,
+    configure_entity_cache,
+    get_entity_cache,
+    load_through_cache,
+    invalidate_on_commit,
+    register_cache_invalidation,
+    task_cache_key,
+    personal_note_cache_key,
+    entity_cache_key,
+)
@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+from plm.security import User
+
+
+def get_audit_user_id(user: User) -> str:
+    """
+    The value stored in created_by and modified_by for changes made by the user.
+    """
+    return user.email or user.id
+
+
+def to_audit_timestamp(value: datetime) -> datetime:
+    """
+    The value to compare with created_on and modified_on, which are stored without a
+    time zone, in the UTC of the database.
+    """
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return value
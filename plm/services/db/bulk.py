@@ -0,0 +1,81 @@
+from typing import List, Optional, Type, TypeVar
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+import sqlalchemy.sql.functions as funcs
+
+from plm.models import Entity, construct_entity
+from plm.services.db.audit import get_audit_user_id
+from plm.services.db.session_with_user import SessionWithUser
+from plm.services.db.cache import entity_cache_key, invalidate_on_commit
+
+E = TypeVar("E", bound=Entity)
+
+_AUDIT_FIELDS = {"id", "created_by", "created_on", "modified_by", "modified_on"}
+
+
+def insert_returning(
+    db: SessionWithUser,
+    model: Type[E],
+    entities: List[E],
+    conflict_constraint: Optional[str] = None,
+) -> List[E]:
+    """
+    Inserts the entities with a single multi-row INSERT ... RETURNING, stamping the
+    audit columns the way the before_flush listener does. Rows that would violate
+    conflict_constraint are skipped and left out of the result.
+    """
+    if not entities:
+        return []
+
+    user_id = get_audit_user_id(db.get_user())
+
+    values = [
+        {
+            **entity.dict(exclude=_AUDIT_FIELDS),
+            "created_by": user_id,
+            "created_on": funcs.now(),
+        }
+        for entity in entities
+    ]
+
+    statement = insert(model).values(values)
+    if conflict_constraint:
+        statement = statement.on_conflict_do_nothing(constraint=conflict_constraint)
+
+    rows = db.execute(statement.returning(*model.__table__.columns)).all()
+
+    # The rows come from the database, so they are not validated again.
+    return [construct_entity(model, row._mapping) for row in rows]
+
+
+def update_returning(
+    db: SessionWithUser, model: Type[E], criteria, changes: dict
+) -> Optional[E]:
+    """
+    Applies the changes to the row matching criteria with a single
+    UPDATE ... RETURNING, stamping modified_by and modified_on in SQL. Returns the
+    updated row as a new, detached entity, so reading it never triggers a refresh,
+    or None if no row matched.
+    """
+    statement = (
+        update(model)
+        .where(criteria)
+        .values(
+            **changes,
+            modified_by=get_audit_user_id(db.get_user()),
+            modified_on=funcs.now(),
+        )
+        .returning(*model.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+    row = db.execute(statement).one_or_none()
+
+    if not row:
+        return None
+
+    entity = construct_entity(model, row._mapping)
+    invalidate_on_commit(db, [entity_cache_key(entity)])
+
+    return entity
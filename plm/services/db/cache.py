@@ -0,0 +1,282 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Type, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+from plm.models import Entity, Task, PersonalNote, construct_entity
+from plm.settings import PlmSettings
+from plm.services.db.session_with_user import SessionWithUser
+from plm.services.metrics import ENTITY_CACHE_REQUESTS
+
+E = TypeVar("E", bound=Entity)
+
+# Keys of the entities written in the session's transaction, kept in session.info.
+_PENDING_INVALIDATIONS = "entity_cache_invalidations"
+
+
+# The user id goes last, since it is free text and may contain the separator.
+def task_cache_key(user_id: str, task_id: int) -> str:
+    return f"task:{task_id}:{user_id}"
+
+
+def personal_note_cache_key(user_id: str, task_id: int, personal_note_id: int) -> str:
+    return f"personal_note:{task_id}:{personal_note_id}:{user_id}"
+
+
+def entity_cache_key(entity) -> Optional[str]:
+    if isinstance(entity, Task):
+        return task_cache_key(entity.user_id, entity.id)
+
+    if isinstance(entity, PersonalNote):
+        return personal_note_cache_key(entity.user_id, entity.task_id, entity.id)
+
+    return None
+
+
+class CacheBackend:
+    """
+    Stores the column values of entities by key, each for a limited time.
+    """
+
+    def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError()
+
+    def set(self, key: str, values: dict):
+        raise NotImplementedError()
+
+    def reserve(self, key: str) -> object:
+        """
+        Starts filling the key on a miss. The returned token is handed to fill once
+        the values are loaded, and is revoked by deleting the key in the meantime.
+        """
+        raise NotImplementedError()
+
+    def fill(self, key: str, token: object, values: dict):
+        """
+        Sets the values if the key is still reserved with token, so values loaded
+        before an invalidation do not replace it.
+        """
+        raise NotImplementedError()
+
+    def delete(self, keys: Iterable[str]):
+        raise NotImplementedError()
+
+
+class _Reservation:
+    pass
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    Keeps the max_size most recently used entries in this process, each for ttl
+    seconds. Writes of other processes are not seen, so it is only for a single
+    worker.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock=time.monotonic):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key: str):
+        # Expects the lock to be held.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_on, values = entry
+        if expires_on <= self._clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return values
+
+    def _set_entry(self, key: str, values):
+        # Expects the lock to be held.
+        self._entries[key] = (self._clock() + self._ttl, values)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            values = self._get_entry(key)
+            return None if isinstance(values, _Reservation) else values
+
+    def set(self, key: str, values: dict):
+        with self._lock:
+            self._set_entry(key, values)
+
+    def reserve(self, key: str) -> object:
+        token = _Reservation()
+        with self._lock:
+            self._set_entry(key, token)
+
+        return token
+
+    def fill(self, key: str, token: object, values: dict):
+        with self._lock:
+            if self._get_entry(key) is token:
+                self._set_entry(key, values)
+
+    def delete(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        # Entries holding values, not the reservations of loads in progress.
+        return sum(
+            not isinstance(values, _Reservation) for _, values in self._entries.values()
+        )
+
+
+class EntityCache:
+    """
+    Read-through cache of tasks and personal notes. Errors from the backend are
+    logged and treated as misses, so the database is used while it is unavailable.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def get(self, db: SessionWithUser, model: Type[E], key: str) -> Optional[E]:
+        try:
+            values = self.backend.get(key)
+        except Exception:
+            logging.exception("Unable to read from the entity cache.")
+            values = None
+
+        result = "miss" if values is None else "hit"
+        ENTITY_CACHE_REQUESTS.labels(model.__tablename__, result).inc()
+
+        if values is None:
+            return None
+
+        # Attached as if loaded by a query, so it can be updated or deleted as usual.
+        entity = construct_entity(model, values)
+        make_transient_to_detached(entity)
+        return db.merge(entity, load=False)
+
+    def reserve(self, key: str) -> Optional[object]:
+        try:
+            return self.backend.reserve(key)
+        except Exception:
+            logging.exception("Unable to write to the entity cache.")
+            return None
+
+    def put(self, db: SessionWithUser, key: str, entity: Entity, token: object):
+        """
+        Caches the entity loaded after reserve returned token, unless the key has
+        been invalidated since.
+        """
+        # An entity changed in the session's transaction may still be rolled back.
+        if token is None or key in db.info.get(_PENDING_INVALIDATIONS, ()):
+            return
+
+        values = {
+            column.name: getattr(entity, column.name)
+            for column in entity.__table__.columns
+        }
+
+        try:
+            self.backend.fill(key, token, values)
+        except Exception:
+            logging.exception("Unable to write to the entity cache.")
+
+    def invalidate(self, keys: Iterable[str]):
+        try:
+            self.backend.delete(keys)
+        except Exception:
+            logging.exception("Unable to invalidate the entity cache.")
+
+
+_entity_cache: Optional[EntityCache] = None
+
+
+def configure_entity_cache(settings: PlmSettings) -> Optional[EntityCache]:
+    global _entity_cache
+
+    if not settings.entity_cache_enabled:
+        _entity_cache = None
+    else:
+        _entity_cache = EntityCache(
+            LocalCacheBackend(settings.entity_cache_max_size, settings.entity_cache_ttl)
+        )
+
+    return _entity_cache
+
+
+def get_entity_cache() -> Optional[EntityCache]:
+    return _entity_cache
+
+
+def load_through_cache(
+    db: SessionWithUser, model: Type[E], key: str, load: Callable[[], Optional[E]]
+) -> Optional[E]:
+    """
+    Returns the cached entity, or the one returned by load, which is then cached.
+    Entities that are not found are not cached, so creating one needs no invalidation.
+    The key is reserved before loading, so if a commit invalidates it while loading,
+    what was loaded is not cached.
+    """
+    cache = _entity_cache
+    if cache is None:
+        return load()
+
+    entity = cache.get(db, model, key)
+    if entity is not None:
+        return entity
+
+    token = cache.reserve(key)
+    entity = load()
+    if entity is not None:
+        cache.put(db, key, entity, token)
+
+    return entity
+
+
+def invalidate_on_commit(db: SessionWithUser, keys: Iterable[Optional[str]]):
+    """
+    Marks entries to drop once the transaction ends. Statements that bypass the unit
+    of work, like bulk updates and deletes, call this for the rows they change.
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).update(key for key in keys if key)
+
+
+def register_cache_invalidation():
+    """
+    Collects the entities written by the unit of work, from the same before_flush
+    event as the audit listener of the engine, and drops them from the cache once
+    their transaction ends. Rollbacks invalidate too, which is harmless and saves
+    telling savepoints apart.
+    """
+
+    @event.listens_for(SessionWithUser, "before_flush")
+    def before_flush(session: SessionWithUser, flush_context, instances):
+        invalidate_on_commit(
+            session,
+            (entity_cache_key(target) for target in (*session.dirty, *session.deleted)),
+        )
+
+    @event.listens_for(SessionWithUser, "after_commit")
+    def after_commit(session: SessionWithUser):
+        _invalidate_pending(session)
+
+    @event.listens_for(SessionWithUser, "after_rollback")
+    def after_rollback(session: SessionWithUser):
+        _invalidate_pending(session)
+
+
+def _invalidate_pending(session: SessionWithUser):
+    keys = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if keys and _entity_cache is not None:
+        _entity_cache.invalidate(keys)
@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from plm.services.validation_exceptions import raise_validation_exception
+
+
+def get_violated_constraint(error: IntegrityError) -> Optional[str]:
+    # psycopg2 has it on the diagnostics of the error. The asyncpg adapter raises
+    # its own error from the one of asyncpg, which has it.
+    diag = getattr(error.orig, "diag", None)
+    if diag is not None:
+        return getattr(diag, "constraint_name", None)
+
+    return getattr(getattr(error.orig, "__cause__", None), "constraint_name", None)
+
+
+@contextmanager
+def unique_violation_as_validation_error(
+    db: Session, constraint_name: str, message: str
+):
+    try:
+        yield
+    except IntegrityError as e:
+        if get_violated_constraint(e) != constraint_name:
+            raise
+
+        db.rollback()
+        raise_validation_exception(message)
@@ -0,0 +1,114 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from plm.settings import PlmSettings
+
+
+class CredentialProvider:
+    def get_password(self) -> str:
+        raise NotImplementedError()
+
+
+class StaticCredentialProvider(CredentialProvider):
+    def __init__(self, password: str):
+        self.password = password
+
+    def get_password(self) -> str:
+        return self.password
+
+
+class FileCredentialProvider(CredentialProvider):
+    """
+    Reads the password from a file, e.g. a rotating token kept up to date by a sidecar.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def get_password(self) -> str:
+        with open(self.path) as f:
+            return f.read().strip()
+
+
+class CachedCredentialProvider(CredentialProvider):
+    """
+    Caches the password of another provider for ttl_seconds. Once the cached value is
+    within refresh_ahead_seconds of expiring it is refreshed in the background, so a
+    burst of new connections (e.g. after the pool is flushed) keeps using the cached
+    value instead of resolving it once per connection.
+    """
+
+    def __init__(
+        self,
+        provider: CredentialProvider,
+        ttl_seconds: float,
+        refresh_ahead_seconds: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._password: Optional[str] = None
+        self._fetched_at: Optional[float] = None
+        self._refreshing = False
+
+    def get_password(self) -> str:
+        if self._password is not None:
+            age = self._clock() - self._fetched_at
+
+            if age < self.ttl_seconds - self.refresh_ahead_seconds:
+                return self._password
+
+            if age < self.ttl_seconds:
+                self._refresh_in_background()
+                return self._password
+
+        with self._lock:
+            # Another thread may have refreshed it while we were waiting for the lock.
+            if self._is_expired():
+                self._refresh()
+            return self._password
+
+    def _is_expired(self) -> bool:
+        return (
+            self._password is None
+            or self._clock() - self._fetched_at >= self.ttl_seconds
+        )
+
+    def _refresh(self):
+        password = self.provider.get_password()
+        self._password = password
+        self._fetched_at = self._clock()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            with self._lock:
+                self._refresh()
+        except Exception:
+            # Keep serving the cached value; it is refreshed synchronously once expired.
+            logging.exception("Unable to refresh the database credentials.")
+        finally:
+            self._refreshing = False
+
+
+def get_credential_provider(settings: PlmSettings) -> CredentialProvider:
+    if settings.db_password_file:
+        return CachedCredentialProvider(
+            FileCredentialProvider(settings.db_password_file),
+            settings.db_credential_ttl,
+            settings.db_credential_refresh_ahead,
+        )
+
+    return StaticCredentialProvider(settings.db_password)
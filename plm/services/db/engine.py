@@ -2,6 +2,8 @@ import logging
 
 from sqlmodel import create_engine
 from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
 import sqlalchemy.sql.functions as funcs
 
 # SQLModel uses the "future" engine (2.0).
@@ -9,31 +11,72 @@ from sqlalchemy.future import Engine
 
 from plm.models import Entity
 from plm.settings import PlmSettings
+from plm.services.db.audit import get_audit_user_id
 from plm.services.db.session_with_user import SessionWithUser
+from plm.services.db.credentials import CredentialProvider, get_credential_provider
 
 
-def get_engine(settings: PlmSettings) -> Engine:
+def get_ssl_mode(settings: PlmSettings) -> str:
+    if settings.db_sslmode:
+        return settings.db_sslmode
+
+    # Reading the password from a file rather than from the settings does not change
+    # how the server is reached.
+    if settings.db_password or settings.db_password_file:
+        return "allow"
+
+    return "require"
+
+
+def get_pool_options(settings: PlmSettings) -> dict:
+    if settings.db_use_external_pooler:
+        return {"poolclass": NullPool}
+
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def get_pool_status(engine) -> dict:
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+
+    # NullPool (external pooler) keeps no connections, so there is nothing to count.
+    if hasattr(pool, "checkedout"):
+        status["size"] = pool.size()
+        status["checked_out"] = pool.checkedout()
+        status["idle"] = pool.checkedin()
+        # The overflow counter is negative until the pool is full.
+        status["overflow"] = max(pool.overflow(), 0)
+
+    return status
+
+
+def get_engine(settings: PlmSettings, credentials: CredentialProvider = None) -> Engine:
+    credentials = credentials or get_credential_provider(settings)
 
     url = f"postgresql+psycopg2://{settings.db_username}@{settings.local_db_host}:{settings.local_db_port}/{settings.db_name}"
-    logging.info(f"Using Postgres at {url}.")
+    logging.info(
+        f"Using Postgres at {settings.local_db_host}:{settings.local_db_port}/{settings.db_name}."
+    )
 
     engine = create_engine(
         url=url,
-        connect_args={"sslmode": "require" if not settings.db_password else "allow"},
+        connect_args={"sslmode": get_ssl_mode(settings)},
+        **get_pool_options(settings),
     )
 
     @event.listens_for(engine, "do_connect")
     def provide_token(dialect, conn_rec, cargs, cparams):
-        password = settings.db_password
-        cparams["password"] = password
+        cparams["password"] = credentials.get_password()
 
     @event.listens_for(SessionWithUser, "before_flush")
     def before_flush(session: SessionWithUser, flush_context, instances):
-        user = session.get_user()
-        user_id = user.email
-
-        if not user_id:
-            user_id = user.id
+        user_id = get_audit_user_id(session.get_user())
 
         # Set created_by and created_on for new entities.
         for target in session.new:
@@ -48,3 +91,35 @@ def get_engine(settings: PlmSettings) -> Engine:
                 target.modified_on = funcs.now()
 
     return engine
+
+
+def get_async_engine(
+    settings: PlmSettings, credentials: CredentialProvider = None
+) -> AsyncEngine:
+    credentials = credentials or get_credential_provider(settings)
+
+    url = f"postgresql+asyncpg://{settings.db_username}@{settings.local_db_host}:{settings.local_db_port}/{settings.db_name}"
+    logging.info(
+        f"Using Postgres (async) at {settings.local_db_host}:{settings.local_db_port}/{settings.db_name}."
+    )
+
+    connect_args = {"ssl": get_ssl_mode(settings)}
+    if settings.db_use_external_pooler:
+        # PgBouncer in transaction mode cannot keep prepared statements around, neither
+        # asyncpg's own nor those of SQLAlchemy's asyncpg dialect.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+
+    engine = create_async_engine(
+        url=url,
+        connect_args=connect_args,
+        **get_pool_options(settings),
+    )
+
+    # Audit columns are stamped by the before_flush listener registered in get_engine,
+    # which also applies to AsyncSessionWithUser.
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def provide_token(dialect, conn_rec, cargs, cparams):
+        cparams["password"] = credentials.get_password()
+
+    return engine
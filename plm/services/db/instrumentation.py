@@ -0,0 +1,117 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.future import Engine
+
+from plm.services.metrics import observe_query
+
+
+class QueryStats:
+    """
+    The statements run while handling a request and the time spent in them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def record(self, duration: float):
+        self.count += 1
+        self.duration += duration
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+# Holds a mutable object rather than counters, because sync endpoints run in worker
+# threads with a copy of the request's context: they can't rebind the variable, but
+# they update the same object.
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+def describe_parameters(parameters) -> str:
+    """
+    The shape of the bound parameters, without their values, which may be personal.
+    """
+    if isinstance(parameters, dict):
+        return (
+            "{"
+            + ", ".join(
+                f"{key}: {describe_parameters(value)}"
+                for key, value in parameters.items()
+            )
+            + "}"
+        )
+
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: one set of parameters per row.
+            return f"{len(parameters)} x {describe_parameters(parameters[0])}"
+
+        types = sorted({type(value).__name__ for value in parameters})
+        return f"{type(parameters).__name__}[{'|'.join(types)}]({len(parameters)})"
+
+    return type(parameters).__name__
+
+
+def instrument_engine(engine: Engine, slow_query_threshold_ms: int):
+    """
+    Counts the statements run by the engine and their duration in the stats of the
+    current request, and logs the statements slower than the threshold.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        # Kept on the statement's own context, since after_cursor_execute does not
+        # run for statements that fail.
+        if context is not None:
+            context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start_time", None)
+        if start is None:
+            return
+
+        duration = time.perf_counter() - start
+
+        observe_query(duration)
+
+        stats = _query_stats.get()
+        if stats:
+            stats.record(duration)
+
+        if duration * 1000 >= slow_query_threshold_ms:
+            logging.warning(
+                f"Slow query ({duration * 1000:.1f}ms): {statement} "
+                f"with parameters {describe_parameters(parameters)}"
+            )
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """
+    Collects the query stats of the request and reports them in a Server-Timing
+    header. Queries made while streaming a response body happen after the headers
+    are sent, so they are not included.
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+
+    try:
+        response = await call_next(request)
+    finally:
+        _query_stats.reset(token)
+
+    response.headers.append("Server-Timing", stats.server_timing())
+
+    return response
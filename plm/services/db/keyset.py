@@ -0,0 +1,47 @@
+import base64
+import json
+
+from sqlmodel import Session, func, select
+
+from plm.schemas import CursorPage, CursorParams
+from plm.services.validation_exceptions import raise_validation_exception
+
+
+def encode_cursor(last_key: int) -> str:
+    payload = json.dumps({"k": last_key}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        last_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))["k"]
+    except (ValueError, KeyError, TypeError):
+        last_key = None
+
+    if type(last_key) != int:
+        raise_validation_exception("The cursor is not valid.", "cursor")
+
+    return last_key
+
+
+def paginate_by_keyset(
+    db: Session, query, key_column, params: CursorParams
+) -> CursorPage:
+    # The query should already be filtered by user, so that together with the key
+    # column the page is a single range scan over the (user_id, id) index.
+    total = None
+    if params.include_total:
+        total = db.exec(select(func.count()).select_from(query.subquery())).one()
+
+    if params.cursor:
+        query = query.where(key_column > decode_cursor(params.cursor))
+
+    # Fetch one extra row to know whether there is a next page without counting.
+    rows = db.exec(query.order_by(key_column).limit(params.limit + 1)).all()
+    items = rows[: params.limit]
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        next_cursor = encode_cursor(getattr(items[-1], key_column.key))
+
+    return CursorPage(items=items, next_cursor=next_cursor, total=total)
@@ -0,0 +1,15 @@
+from fastapi_pagination.api import set_page
+from fastapi_pagination.ext.sqlalchemy import paginate
+from sqlmodel import Session
+
+from plm.schemas import Page
+
+
+def paginate_by_offset(db: Session, query) -> Page:
+    """
+    A limit/offset page of the rows of the query, for the limit and offset of the
+    request. Unlike paginate on its own, the rows are not validated into the item
+    model of the route, so that they can be serialized with page_response.
+    """
+    with set_page(Page):
+        return paginate(db, query)
@@ -1,5 +1,5 @@
-def apply_patch(entity, payload):
-    changes = payload.dict(exclude_unset=True)
+def apply_patch(entity, payload, exclude=None):
+    changes = payload.dict(exclude_unset=True, exclude=exclude)
 
     items = changes.items()
 
@@ -1,11 +1,13 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import Session
 
 from plm.security import User
 
 
 class SessionWithUser(Session):
-    def __init__(self, started_engine):
-        super().__init__(started_engine, autoflush=False)
+    def __init__(self, started_engine=None, bind=None, **kwargs):
+        # AsyncSession builds its sync session with keyword arguments only.
+        super().__init__(started_engine or bind, autoflush=False, **kwargs)
         self.user = None
 
     def set_user(self, user: User):
@@ -13,3 +15,15 @@ class SessionWithUser(Session):
 
     def get_user(self) -> User:
         return self.user
+
+
+class AsyncSessionWithUser(AsyncSession):
+    # The ORM work happens on a SessionWithUser, so the before_flush listener that
+    # stamps the audit columns runs exactly as it does for the sync session.
+    sync_session_class = SessionWithUser
+
+    def set_user(self, user: User):
+        self.sync_session.set_user(user)
+
+    def get_user(self) -> User:
+        return self.sync_session.get_user()
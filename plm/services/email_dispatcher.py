@@ -0,0 +1,179 @@
+import logging
+import smtplib
+import threading
+from datetime import timedelta
+from email import message_from_string, policy
+from email.message import EmailMessage
+from typing import Optional
+
+import sqlalchemy.sql.functions as funcs
+from sqlalchemy.future import Engine
+from sqlmodel import Session, select
+
+from plm.enums import EmailJobStatus
+from plm.models import EmailJob
+from plm.services.email_service import EmailSenderClient
+from plm.services.smtp_pool import SmtpConnectionPool
+
+DISPATCHER_USER = "email-dispatcher"
+
+# Errors that concern a single message. Anything else means the connection is broken.
+_MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+def _parse_message(text: str) -> EmailMessage:
+    message = message_from_string(text, policy=policy.default)
+    if "MIME-Version" in message:
+        return message
+
+    # Queued as plain text before messages were rendered as MIME, so it is encoded
+    # again in case it holds characters that are not ASCII.
+    mime_message = EmailMessage()
+    for name, value in message.items():
+        mime_message[name] = value
+    mime_message.set_content(message.get_payload())
+
+    return mime_message
+
+
+class EmailDispatcher:
+    """
+    Drains the email_job outbox in the background. Due jobs are claimed one at a time
+    with FOR UPDATE SKIP LOCKED, so several API workers can run a dispatcher each
+    without sending the same e-mail twice, and up to batch_size of them are sent over
+    one pooled SMTP connection. Failed jobs are retried with exponential backoff until
+    max_attempts is reached.
+
+    The outcome of each job is committed as soon as it is sent, so a later failure
+    cannot undo it, and only the e-mail being sent when the process dies may be sent
+    again.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        smtp_pool: SmtpConnectionPool,
+        batch_size: int = 50,
+        poll_interval: float = 5,
+        max_attempts: int = 5,
+        retry_backoff: float = 30,
+    ):
+        self.engine = engine
+        self.smtp_pool = smtp_pool
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="email-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run_once(self) -> int:
+        processed = 0
+
+        with Session(self.engine) as db:
+            job = self._claim(db)
+            if job is None:
+                return 0
+
+            try:
+                with self.smtp_pool.connection() as smtp:
+                    while job is not None:
+                        self._send(smtp, job)
+                        db.commit()
+                        processed += 1
+
+                        job = self._claim(db) if processed < self.batch_size else None
+            except (smtplib.SMTPException, OSError) as e:
+                # The jobs not claimed yet stay as they are, for the next run.
+                logging.exception("Unable to send e-mails, retrying them later.")
+                if job is not None:
+                    self._schedule_retry(job, e)
+                    db.commit()
+                    processed += 1
+
+        return processed
+
+    @staticmethod
+    def _claim(db: Session) -> Optional[EmailJob]:
+        return db.exec(
+            select(EmailJob)
+            .where(EmailJob.status == EmailJobStatus.Pending)
+            .where(EmailJob.next_attempt_on <= funcs.now())
+            .order_by(EmailJob.next_attempt_on)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+
+    def _send(self, smtp: EmailSenderClient, job: EmailJob):
+        """
+        Sends the job, and records the outcome on it. Errors of the connection are
+        raised, any other one only fails this job.
+        """
+        try:
+            smtp.send_message(
+                _parse_message(job.message),
+                from_addr=smtp.sender_email_address,
+                to_addrs=job.to_address,
+            )
+        except _MESSAGE_ERRORS as e:
+            self._schedule_retry(job, e)
+        except (smtplib.SMTPException, OSError):
+            raise
+        except Exception as e:
+            logging.exception(f"Unable to send the e-mail of job {job.id}.")
+            self._schedule_retry(job, e)
+        else:
+            self._mark_sent(job)
+
+    def _mark_sent(self, job: EmailJob):
+        job.status = EmailJobStatus.Sent
+        job.attempts += 1
+        job.last_error = None
+        job.sent_on = funcs.now()
+        self._stamp(job)
+
+    def _schedule_retry(self, job: EmailJob, error: Exception):
+        job.attempts += 1
+        job.last_error = str(error)[:1000]
+
+        if job.attempts >= self.max_attempts:
+            job.status = EmailJobStatus.Failed
+        else:
+            backoff = self.retry_backoff * 2 ** (job.attempts - 1)
+            job.next_attempt_on = funcs.now() + timedelta(seconds=backoff)
+
+        self._stamp(job)
+
+    @staticmethod
+    def _stamp(job: EmailJob):
+        # The dispatcher does not use SessionWithUser, so stamp the audit columns here.
+        job.modified_by = DISPATCHER_USER
+        job.modified_on = funcs.now()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception:
+                logging.exception("Unable to dispatch e-mails.")
+                processed = 0
+
+            # Keep draining without waiting while there is a backlog.
+            if processed < self.batch_size:
+                self._stop.wait(self.poll_interval)
@@ -0,0 +1,86 @@
+from email.message import EmailMessage
+from string import Template
+from typing import List, NamedTuple, Optional
+
+from sqlmodel import Session, select, and_
+
+from plm.models import Task, PersonalNote
+
+_BODY_TEMPLATE = Template("Personal Notes:\n$personal_notes")
+_PERSONAL_NOTE_TEMPLATE = Template(
+    "\nPersonal Note Name: $name\n"
+    "Personal Note Type: $type\n"
+    "Personal Note Description: $note\n"
+)
+
+
+class PersonalNoteEmailData(NamedTuple):
+    name: str
+    type: str
+    note: str
+
+
+class TaskEmailData(NamedTuple):
+    name: str
+    correspondence_email_address: str
+    personal_notes: List[PersonalNoteEmailData]
+
+
+def load_task_email_data(
+    db: Session, user_id: str, task_id: int
+) -> Optional[TaskEmailData]:
+    """
+    Loads the task and its personal notes in a single query, selecting only the
+    columns used in the e-mail. Returns None if the user has no such task.
+    """
+    rows = db.exec(
+        select(
+            Task.name,
+            Task.correspondence_email_address,
+            PersonalNote.name.label("note_name"),
+            PersonalNote.type.label("note_type"),
+            PersonalNote.note,
+        )
+        .select_from(Task)
+        .outerjoin(
+            PersonalNote,
+            and_(PersonalNote.task_id == Task.id, PersonalNote.user_id == user_id),
+        )
+        .where(and_(Task.user_id == user_id, Task.id == task_id))
+        .order_by(PersonalNote.id)
+    ).all()
+
+    if not rows:
+        return None
+
+    # Without notes, the outer join still returns the task with null note columns.
+    personal_notes = [
+        PersonalNoteEmailData(row.note_name, row.note_type, row.note)
+        for row in rows
+        if row.note_name is not None
+    ]
+
+    return TaskEmailData(
+        rows[0].name, rows[0].correspondence_email_address, personal_notes
+    )
+
+
+def render_task_email(task: TaskEmailData) -> EmailMessage:
+    """
+    A MIME message in UTF-8, which the headers and body are encoded for as needed,
+    so names and notes may hold any character. Line breaks in the task name are
+    replaced, since headers cannot contain them.
+    """
+    personal_notes = "".join(
+        _PERSONAL_NOTE_TEMPLATE.substitute(
+            name=note.name, type=note.type, note=note.note
+        )
+        for note in task.personal_notes
+    )
+
+    message = EmailMessage()
+    message["Subject"] = f"PLM Reminder: {' '.join(task.name.splitlines())}"
+    message["To"] = task.correspondence_email_address
+    message.set_content(_BODY_TEMPLATE.substitute(personal_notes=personal_notes))
+
+    return message
@@ -1,4 +1,8 @@
 import smtplib
+import time
+
+from plm.settings import PlmSettings
+from plm.services.metrics import SMTP_SEND_DURATION, SMTP_SEND_FAILURES
 
 
 class EmailSenderClient(smtplib.SMTP):
@@ -11,3 +15,31 @@ class EmailSenderClient(smtplib.SMTP):
 
     def get_sender_email_address(self) -> str:
         return self.sender_email_address
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        start = time.perf_counter()
+
+        try:
+            return super().sendmail(
+                from_addr, to_addrs, msg, mail_options, rcpt_options
+            )
+        except Exception as e:
+            SMTP_SEND_FAILURES.labels(type(e).__name__).inc()
+            raise
+        finally:
+            SMTP_SEND_DURATION.observe(time.perf_counter() - start)
+
+
+def connect_email_client(settings: PlmSettings) -> EmailSenderClient:
+    smtp = EmailSenderClient(settings.smtp_server, settings.smtp_port)
+
+    try:
+        if settings.smtp_use_starttls:
+            smtp.starttls()
+        smtp.login(settings.plm_email_address, settings.plm_email_password)
+    except Exception:
+        smtp.close()
+        raise
+
+    smtp.set_sender_email_address(settings.plm_email_address)
+    return smtp
@@ -0,0 +1,122 @@
+import csv
+import io
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from humps import camelize
+from sqlmodel import Session, select, and_, text
+
+from plm.models import Task, PersonalNote
+from plm.schemas import TaskExport, TaskResponse, PersonalNoteResponse
+
+EXPORT_BATCH_SIZE = 1_000
+# Set for the transaction of an export, so the changes feed can tell it apart.
+EXPORT_APPLICATION_NAME = "plm_export"
+
+# Only the columns that end up in the export are read.
+_TASK_FIELDS = list(TaskResponse.__fields__)
+_PERSONAL_NOTE_FIELDS = list(PersonalNoteResponse.__fields__)
+
+_CSV_HEADER = [camelize(field) for field in _TASK_FIELDS] + [
+    camelize(f"personal_note_{field}") for field in _PERSONAL_NOTE_FIELDS
+]
+
+
+def iter_task_exports(db: Session, user_id: str) -> Iterator[TaskExport]:
+    """
+    Yields every task of the user with its personal notes. The rows are read with a
+    server-side cursor in batches of EXPORT_BATCH_SIZE, so memory use does not depend
+    on how much data the user has.
+    """
+    query = (
+        select(
+            *(getattr(Task, field) for field in _TASK_FIELDS),
+            *(
+                getattr(PersonalNote, field).label(f"note_{field}")
+                for field in _PERSONAL_NOTE_FIELDS
+            ),
+        )
+        .select_from(Task)
+        .outerjoin(
+            PersonalNote,
+            and_(PersonalNote.task_id == Task.id, PersonalNote.user_id == user_id),
+        )
+        .where(Task.user_id == user_id)
+        .order_by(Task.id, PersonalNote.id)
+        .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    db.execute(
+        text("select set_config('application_name', :name, true)"),
+        {"name": EXPORT_APPLICATION_NAME},
+    )
+
+    current = None
+    for row in db.exec(query):
+        if current is None or current.id != row.id:
+            if current is not None:
+                yield current
+
+            current = TaskExport(
+                **{field: getattr(row, field) for field in _TASK_FIELDS},
+                personal_notes=[],
+            )
+
+        if row.note_id is not None:
+            current.personal_notes.append(
+                PersonalNoteResponse(
+                    **{
+                        field: getattr(row, f"note_{field}")
+                        for field in _PERSONAL_NOTE_FIELDS
+                    }
+                )
+            )
+
+    if current is not None:
+        yield current
+
+
+def to_ndjson(task_exports: Iterable[TaskExport]) -> Iterator[str]:
+    for task_export in task_exports:
+        yield task_export.json(by_alias=True, exclude_none=True) + "\n"
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def to_csv(task_exports: Iterable[TaskExport]) -> Iterator[str]:
+    """
+    One line per personal note, with the columns of its task repeated. Tasks without
+    personal notes get a single line with empty personal note columns.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(_CSV_HEADER)
+
+    for task_export in task_exports:
+        task_values = [
+            _csv_value(getattr(task_export, field)) for field in _TASK_FIELDS
+        ]
+
+        for personal_note in task_export.personal_notes or [None]:
+            writer.writerow(
+                task_values
+                + [
+                    _csv_value(personal_note and getattr(personal_note, field))
+                    for field in _PERSONAL_NOTE_FIELDS
+                ]
+            )
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # The header alone when the user has no tasks.
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,131 @@
+import os
+import time
+
+from fastapi import Request
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.future import Engine
+
+# With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory
+# shared by them. Each worker then writes its samples to its own memory-mapped files,
+# and a scrape served by any worker aggregates the files of all of them.
+MULTIPROCESS_DIR_VARIABLE = "PROMETHEUS_MULTIPROC_DIR"
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_DURATION = Histogram(
+    "plm_http_request_duration_seconds",
+    "Time spent handling HTTP requests, by route template.",
+    ["method", "route", "status"],
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "plm_http_requests_in_flight",
+    "HTTP requests being handled.",
+    multiprocess_mode="livesum",
+)
+
+DB_QUERIES = Counter("plm_db_queries_total", "SQL statements executed.")
+
+DB_QUERY_DURATION = Counter(
+    "plm_db_query_duration_seconds_total", "Time spent executing SQL statements."
+)
+
+DB_POOL_SIZE = Gauge(
+    "plm_db_pool_size",
+    "Connections kept open by the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "plm_db_pool_checked_out",
+    "Connections currently borrowed from the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+ENTITY_CACHE_REQUESTS = Counter(
+    "plm_entity_cache_requests_total",
+    "Task and personal note lookups, by whether the entity cache had them.",
+    ["entity", "result"],
+)
+
+SMTP_SEND_DURATION = Histogram(
+    "plm_smtp_send_duration_seconds", "Time spent sending e-mails over SMTP."
+)
+
+SMTP_SEND_FAILURES = Counter(
+    "plm_smtp_send_failures_total", "E-mails that failed to send.", ["error"]
+)
+
+
+def observe_query(duration: float):
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.inc(duration)
+
+
+def instrument_pool(engine: Engine, name: str):
+    """
+    Keeps the pool gauges up to date as connections are checked out and in, instead
+    of reading the pool when scraping, so that each worker reports its own pool.
+    """
+    pool = engine.pool
+
+    # Pools without a fixed size, like NullPool, have nothing to report.
+    if not hasattr(pool, "checkedout"):
+        return
+
+    DB_POOL_SIZE.labels(name).set(pool.size())
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+
+    # The pool still counts a connection as checked out while its checkin event runs,
+    # so count the events rather than reading the pool.
+    event.listen(engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *args: checked_out.dec())
+
+
+def get_route_template(request: Request) -> str:
+    # Set by the router once a route matches, e.g. /v1/tasks/{userId}/{taskId}.
+    # Raw paths are not used, so that ids do not create a series each.
+    route = request.scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+async def metrics_middleware(request: Request, call_next):
+    REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        REQUEST_DURATION.labels(
+            request.method, get_route_template(request), str(status)
+        ).observe(time.perf_counter() - start)
+
+
+def generate_metrics() -> bytes:
+    if os.environ.get(MULTIPROCESS_DIR_VARIABLE):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead():
+    # Drops the live gauges of this worker from the aggregated values.
+    if os.environ.get(MULTIPROCESS_DIR_VARIABLE):
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,47 @@
+from typing import Any, Dict, Mapping, Optional, Type
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from plm.models import field_aliases
+
+
+def to_json_dict(model: Type[BaseModel], source: Any) -> Dict[str, Any]:
+    """
+    The JSON object of source shaped as model, read straight from the attributes of
+    an entity or row instead of validating it into model first. Like the responses
+    of the routes, it leaves out None values.
+    """
+    # As validation into model would, for the bodies to stay the same.
+    strip = model.__config__.anystr_strip_whitespace
+
+    content = {}
+    for name, alias in field_aliases(model):
+        value = getattr(source, name, None)
+        if value is not None:
+            content[alias] = (
+                value.strip() if strip and isinstance(value, str) else value
+            )
+
+    return content
+
+
+def page_to_json_dict(page: BaseModel, item_model: Type[BaseModel]) -> Dict[str, Any]:
+    content = to_json_dict(type(page), page)
+    content["items"] = [to_json_dict(item_model, item) for item in page.items]
+
+    return content
+
+
+def page_response(
+    page: BaseModel,
+    item_model: Type[BaseModel],
+    headers: Optional[Mapping[str, str]] = None,
+) -> ORJSONResponse:
+    """
+    A page of entities or rows serialized with orjson, skipping the validation into
+    the response model and the jsonable_encoder pass FastAPI makes for the routes.
+    The body is the same as the one of the response_model of the route, which stays
+    for the OpenAPI schema. Items must only hold strings, numbers and datetimes.
+    """
+    return ORJSONResponse(page_to_json_dict(page, item_model), headers=headers)
@@ -0,0 +1,104 @@
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Optional, Tuple
+
+from plm.services.email_service import EmailSenderClient
+
+
+class SmtpConnectionPool:
+    """
+    A bounded pool of connected and authenticated SMTP clients, so that sending an
+    e-mail does not pay for the TCP connection, STARTTLS and LOGIN every time.
+
+    Idle clients older than idle_timeout seconds are closed, and the rest are checked
+    with NOOP before being handed out. Clients that fail while borrowed are discarded,
+    and a new connection is made the next time one is needed.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], EmailSenderClient],
+        max_size: int = 4,
+        idle_timeout: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle: Deque[Tuple[EmailSenderClient, float]] = deque()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        if not self._slots.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError("Timed out waiting for an SMTP connection.")
+
+        try:
+            client = self._checkout()
+            try:
+                yield client
+            except (smtplib.SMTPException, OSError):
+                # The connection may be broken, so don't hand it out again.
+                self._close(client)
+                raise
+            except BaseException:
+                self._checkin(client)
+                raise
+            self._checkin(client)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+
+        for client, _ in idle:
+            self._close(client)
+
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def _checkout(self) -> EmailSenderClient:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                # Reuse the most recently returned client, which is the least likely
+                # to have been dropped by the server.
+                client, returned_at = self._idle.pop()
+
+            if self._clock() - returned_at > self.idle_timeout:
+                self._close(client)
+            elif self._is_healthy(client):
+                return client
+            else:
+                self._close(client)
+
+        return self._connect()
+
+    def _checkin(self, client: EmailSenderClient):
+        with self._lock:
+            self._idle.append((client, self._clock()))
+
+    @staticmethod
+    def _is_healthy(client: EmailSenderClient) -> bool:
+        try:
+            return client.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(client: EmailSenderClient):
+        try:
+            client.quit()
+        except (smtplib.SMTPException, OSError):
+            client.close()
+        except Exception:
+            logging.exception("Unable to close the SMTP connection.")
@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import Callable, List, Union
 
 from fastapi import HTTPException
 
@@ -43,3 +43,21 @@ def raise_validation_exception(
             for message in messages
         ],
     )
+
+
+def collect_validation_errors(*checks: Callable[[], None]) -> List[dict]:
+    """
+    Runs every check and returns the errors they raised through
+    raise_validation_exception, instead of stopping at the first one.
+    """
+    errors = []
+
+    for check in checks:
+        try:
+            check()
+        except HTTPException as e:
+            if e.status_code != 400:
+                raise
+            errors.extend(e.detail)
+
+    return errors
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseSettings
 
 
@@ -8,6 +10,38 @@ class PlmSettings(BaseSettings):
     plm_email_password: str
     smtp_server: str
     smtp_port: int
-    db_password: str
+    smtp_use_starttls: bool = True
+    smtp_pool_size: int = 4
+    smtp_pool_idle_timeout: int = 60
+    email_dispatch_enabled: bool = True
+    email_dispatch_batch_size: int = 50
+    email_dispatch_poll_interval: float = 5
+    email_dispatch_max_attempts: int = 5
+    email_dispatch_retry_backoff: float = 30
+    db_password: str = ""
     local_db_host: str
     local_db_port: int
+    # When set, the password is read from this file (e.g. a token rotated by a sidecar)
+    # and cached for db_credential_ttl seconds instead of using db_password.
+    db_password_file: Optional[str] = None
+    db_credential_ttl: int = 300
+    db_credential_refresh_ahead: int = 60
+    # e.g. require or verify-full. Defaults to allow with a password (db_password or
+    # db_password_file) and to require without one.
+    db_sslmode: Optional[str] = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Set when connecting through an external pooler such as PgBouncer in transaction
+    # mode, so the API does not keep its own pool of connections.
+    db_use_external_pooler: bool = False
+    # Statements taking at least this long are logged with the shape of their parameters.
+    db_slow_query_threshold_ms: int = 200
+    # Tasks and personal notes looked up by id are cached for entity_cache_ttl seconds.
+    # The cache lives in each worker and does not see what other workers write, so it
+    # is off by default and only meant for deployments running a single worker.
+    entity_cache_enabled: bool = False
+    entity_cache_ttl: float = 30
+    entity_cache_max_size: int = 10_000
@@ -1,3 +1,50 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from asyncpg.exceptions import UniqueViolationError
+from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_dbapi
+from sqlalchemy.exc import IntegrityError
+
+
 def assert_wheres_are_equal(mock_where, which_call, expression):
     sql_expr = mock_where.call_args_list[which_call][0][0]
     assert sql_expr.compare(expression)
+
+
+def unique_violation(constraint_name):
+    orig = MagicMock()
+    orig.diag.constraint_name = constraint_name
+    return IntegrityError("statement", {}, orig)
+
+
+def async_unique_violation(constraint_name):
+    """
+    A unique violation as raised through the asyncpg adapter, where the constraint
+    is on the asyncpg error the adapter's error is raised from.
+    """
+    cause = UniqueViolationError.new(
+        {"C": "23505", "M": "duplicate key value", "n": constraint_name}
+    )
+    try:
+        raise AsyncAdapt_asyncpg_dbapi.IntegrityError(str(cause)) from cause
+    except AsyncAdapt_asyncpg_dbapi.IntegrityError as orig:
+        return IntegrityError("statement", {}, orig)
+
+
+def returned_row(entity, **changes):
+    """
+    A row as returned by UPDATE/INSERT ... RETURNING for the entity with the changes.
+    """
+    return SimpleNamespace(_mapping={**entity.dict(), **changes})
+
+
+class FakeAsyncSession:
+    """
+    Stands in for AsyncSessionWithUser, running the sync work on the given session.
+    """
+
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
@@ -0,0 +1,100 @@
+from plm.schemas import Page
+from plm.models import PersonalNote
+from unittest.mock import MagicMock, patch
+from plm.enums import PersonalNoteTypes
+from plm.endpoints.v1.async_personal_note import router
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from datetime import datetime
+from plm.dependencies import get_async_db
+from tests.dependency_mocker import DependencyMocker
+from tests.db_helpers import FakeAsyncSession, returned_row
+import copy
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+now = datetime.now()
+
+fake_personal_note = PersonalNote(
+    id=1,
+    created_by="test@localdev.com",
+    created_on=now,
+    task_id=1,
+    name="Personal Note 1",
+    type=PersonalNoteTypes.ProgressReport,
+    note="This is a sample note",
+    user_id="user-1",
+    correspondence_email_address="address@email.com",
+)
+
+
+def test_get_all_personal_notes():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [(1, now, None)]
+
+    with patch("plm.endpoints.v1.personal_note.paginate_by_offset") as mock_paginate:
+        mock_paginate.return_value = Page(
+            items=[fake_personal_note], total=1, limit=50, offset=0
+        )
+        with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+            response = client.get("/v1/async/tasks/user-1/1/personal-notes")
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["createdBy"] == fake_personal_note.created_by
+
+
+def test_get_personal_notes_by_cursor():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [fake_personal_note]
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.get(
+            "/v1/async/tasks/user-1/1/personal-notes/cursor?fields=name"
+        )
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["id"] == 1
+    assert "nextCursor" not in response.json()
+
+
+def test_get_one_personal_note_not_found():
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = None
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.get("/v1/async/tasks/user-1/1/personal-notes/1")
+
+    assert response.status_code == 404
+
+
+def test_update_personal_note_successful():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.one_or_none.return_value = returned_row(
+        fake_personal_note, note="An updated note"
+    )
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.patch(
+            "/v1/async/tasks/user-1/1/personal-notes/1",
+            json={"note": "An updated note"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["note"] == "An updated note"
+    mock_db.commit.assert_called_once_with()
+
+
+def test_delete_personal_note_successful():
+    existing_personal_note = copy.copy(fake_personal_note)
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
+        existing_personal_note
+    )
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.delete("/v1/async/tasks/user-1/1/personal-notes/1")
+
+    assert response.status_code == 204
+    mock_db.delete.assert_called_once_with(existing_personal_note)
@@ -0,0 +1,163 @@
+from plm.models import Task
+from unittest.mock import MagicMock
+from plm.enums import TaskStatus, TaskTypes
+from plm.endpoints.v1.async_task import router
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from datetime import datetime
+from plm.dependencies import get_async_db
+from tests.dependency_mocker import DependencyMocker
+from tests.db_helpers import FakeAsyncSession, async_unique_violation, returned_row
+from types import SimpleNamespace
+from plm.endpoints.helpers.etag_helpers import make_etag
+import copy
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+now = datetime.now()
+
+fake_task = Task(
+    id=1,
+    created_by="test@localdev.com",
+    created_on=now,
+    name="Task 1",
+    status=TaskStatus.ToDo,
+    type=TaskTypes.Work,
+    user_id="user-1",
+    correspondence_email_address="user@email.com",
+)
+
+fake_payload = {
+    "name": "Task 1",
+    "status": "To Do",
+    "type": "Work",
+    "correspondence_email_address": "user@email.com",
+}
+
+
+def test_get_one_task_found():
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = fake_task
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.get("/v1/async/tasks/user-1/1")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == fake_task.name
+    mock_db.query.assert_called_once_with(Task)
+
+
+def test_get_one_task_not_modified():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one_or_none.return_value = SimpleNamespace(
+        id=1, created_on=now, modified_on=None
+    )
+    etag = make_etag(1, now, None)
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.get(
+            "/v1/async/tasks/user-1/1", headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_get_one_task_not_found():
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = None
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.get("/v1/async/tasks/user-1/1")
+
+    assert response.status_code == 404
+
+
+def test_get_tasks_by_cursor():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [fake_task]
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.get("/v1/async/tasks/user-1/cursor")
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["id"] == 1
+
+
+def test_get_tasks_by_cursor_filtered():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [fake_task]
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.get("/v1/async/tasks/user-1/cursor?status=To Do&q=report")
+
+    assert response.status_code == 200
+    query = mock_db.exec.call_args[0][0]
+    assert "task.status IN" in str(query)
+    assert "task.search_vector @@" in str(query)
+
+
+def test_create_task_successful():
+    mock_db = MagicMock()
+
+    def add(entity):
+        entity.id = 1
+        entity.created_by = "test@localdev.com"
+        entity.created_on = now
+
+    mock_db.add.side_effect = add
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.post("/v1/async/tasks/user-1", json=fake_payload)
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["id"] == 1
+    assert json_response["createdBy"] == "test@localdev.com"
+    mock_db.commit.assert_called_once_with()
+
+
+def test_create_task_error_due_to_non_unique_name():
+    mock_db = MagicMock()
+    mock_db.commit.side_effect = async_unique_violation("task_user_id_name_key")
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.post("/v1/async/tasks/user-1", json=fake_payload)
+
+    assert response.status_code == 400
+    assert (
+        response.json()["detail"][0]["message"]
+        == "A task with this same name already exists."
+    )
+
+
+def test_update_task_successful():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.one_or_none.return_value = returned_row(
+        fake_task, type="Studies"
+    )
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.patch("/v1/async/tasks/user-1/1", json={"type": "Studies"})
+
+    assert response.status_code == 200
+    assert response.json()["type"] == "Studies"
+    mock_db.commit.assert_called_once_with()
+
+
+def test_delete_task_successful():
+    existing_task = copy.copy(fake_task)
+    mock_db = MagicMock()
+    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
+        existing_task
+    )
+
+    with DependencyMocker(app, {get_async_db: FakeAsyncSession(mock_db)}):
+        response = client.delete("/v1/async/tasks/user-1/1")
+
+    assert response.status_code == 204
+    mock_db.delete.assert_called_once_with(existing_task)
+    mock_db.commit.assert_called_once_with()
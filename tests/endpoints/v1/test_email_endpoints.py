@@ -0,0 +1,107 @@
+from email import message_from_string, policy
+from plm.models import EmailJob
+from unittest.mock import MagicMock
+from plm.enums import EmailJobStatus
+from plm.endpoints.v1.email_service import router
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from datetime import datetime
+from plm.dependencies import get_db
+from tests.dependency_mocker import DependencyMocker
+from sqlmodel import select, and_
+from types import SimpleNamespace
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+now = datetime.now()
+
+
+fake_rows = [
+    SimpleNamespace(
+        name="Task 1",
+        correspondence_email_address="user@email.com",
+        note_name="Note 1",
+        note_type="Progress Report",
+        note="Example note here",
+    )
+]
+
+
+def test_send_email_notification_queues_a_job():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = fake_rows
+
+    def add(entity):
+        entity.id = 7
+        entity.created_on = now
+
+    mock_db.add.side_effect = add
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post("/v1/emails/user-1/1")
+
+    assert response.status_code == 202
+    json_response = response.json()
+    assert json_response["id"] == 7
+    assert json_response["taskId"] == 1
+    assert json_response["status"] == "Pending"
+    assert json_response["attempts"] == 0
+    email_job = mock_db.add.call_args[0][0]
+    assert email_job.user_id == "user-1"
+    assert email_job.to_address == "user@email.com"
+    message = message_from_string(email_job.message, policy=policy.default)
+    assert message["Subject"] == "PLM Reminder: Task 1"
+    assert "Personal Note Name: Note 1\n" in message.get_content()
+    mock_db.commit.assert_called_once_with()
+
+
+def test_send_email_notification_task_not_found():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = []
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post("/v1/emails/user-1/1")
+
+    assert response.status_code == 404
+    mock_db.add.assert_not_called()
+
+
+def test_get_email_job():
+    email_job = EmailJob(
+        id=7,
+        task_id=1,
+        user_id="user-1",
+        status=EmailJobStatus.Sent,
+        to_address="user@email.com",
+        message="Subject: Hello",
+        attempts=1,
+        sent_on=now,
+        created_on=now,
+    )
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one_or_none.return_value = email_job
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/emails/user-1/jobs/7")
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["status"] == "Sent"
+    assert json_response["sentOn"] == now.isoformat()
+    assert "message" not in json_response
+    expected_query = select(EmailJob).where(
+        and_(EmailJob.user_id == "user-1", EmailJob.id == 7)
+    )
+    assert expected_query.compare(mock_db.exec.call_args[0][0])
+
+
+def test_get_email_job_not_found():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one_or_none.return_value = None
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/emails/user-1/jobs/7")
+
+    assert response.status_code == 404
@@ -3,33 +3,87 @@ from unittest.mock import MagicMock
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 
 from plm.endpoints.v1.health import router
-from plm.dependencies import get_db_without_user
+from plm.dependencies import (
+    get_db_without_user,
+    get_db_engine,
+    get_async_db_engine,
+)
 from tests.dependency_mocker import DependencyMocker
 
 app = FastAPI()
 app.include_router(router)
 client = TestClient(app)
 
+engine = create_engine("postgresql+psycopg2://user@host/db", pool_size=3)
+pool_status = {
+    "pool_class": "QueuePool",
+    "size": 3,
+    "checked_out": 0,
+    "idle": 0,
+    "overflow": 0,
+}
+
 
 def test_healthcheck_ok():
-    with DependencyMocker(app, {get_db_without_user: MagicMock()}):
+    with DependencyMocker(
+        app,
+        {
+            get_db_without_user: MagicMock(),
+            get_db_engine: engine,
+            get_async_db_engine: None,
+        },
+    ):
+        response = client.get("/v1/healthcheck")
+
+        assert response.status_code == 200
+        assert json.loads(response.content) == {"postgres": "OK", "pool": pool_status}
+
+
+def test_healthcheck_reports_async_and_external_pools():
+    external_engine = create_engine(
+        "postgresql+psycopg2://user@host/db", poolclass=NullPool
+    )
+    async_engine = create_async_engine("postgresql+asyncpg://user@host/db")
+
+    with DependencyMocker(
+        app,
+        {
+            get_db_without_user: MagicMock(),
+            get_db_engine: external_engine,
+            get_async_db_engine: async_engine,
+        },
+    ):
         response = client.get("/v1/healthcheck")
 
         assert response.status_code == 200
-        assert json.loads(response.content) == {"postgres": "OK"}
+        json_response = json.loads(response.content)
+        assert json_response["pool"] == {"pool_class": "NullPool"}
+        assert json_response["async_pool"]["pool_class"] == "AsyncAdaptedQueuePool"
+        assert json_response["async_pool"]["size"] == 5
 
 
 def test_healthcheck_db_fail():
     mock_get_db_without_user = MagicMock()
     mock_get_db_without_user.execute().fetchall.side_effect = Exception("POP")
 
-    with DependencyMocker(app, {get_db_without_user: mock_get_db_without_user}):
+    with DependencyMocker(
+        app,
+        {
+            get_db_without_user: mock_get_db_without_user,
+            get_db_engine: engine,
+            get_async_db_engine: None,
+        },
+    ):
         response = client.get("/v1/healthcheck")
 
         assert response.status_code == 500
         assert json.loads(response.content) == {
             "postgres": "FAIL",
             "postgres_error": "POP",
+            "pool": pool_status,
         }
@@ -0,0 +1,170 @@
+import csv
+import io
+import json
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from plm.endpoints.v1.data_import import router
+from plm.endpoints.helpers.import_helpers import import_records, iter_ndjson_records
+from plm.security import User
+from plm.enums import Permission
+from plm.dependencies import get_db, get_calling_user
+from tests.dependency_mocker import DependencyMocker
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+admin = User(email="admin@localdev.com", permissions=[Permission.Admin])
+
+task_line = {
+    "name": "Task 1",
+    "status": "To Do",
+    "type": "Work",
+    "correspondenceEmailAddress": "user@email.com",
+    "personalNotes": [
+        {
+            "name": "Note 1",
+            "type": "Observations",
+            "note": "Some, text",
+            "correspondenceEmailAddress": "user@email.com",
+        }
+    ],
+}
+
+
+def make_db(tasks_imported=1, personal_notes_imported=1):
+    mock_db = MagicMock()
+    mock_db.get_user.return_value = admin
+    copied = {}
+
+    def copy_expert(sql, file):
+        copied[sql.split()[1]] = list(csv.reader(io.StringIO(file.read())))
+
+    cursor = mock_db.connection.return_value.connection.cursor.return_value
+    cursor.copy_expert.side_effect = copy_expert
+
+    merges = iter([MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock()])
+    mock_db.execute.side_effect = lambda *args: next(merges)
+    return mock_db, copied
+
+
+def test_import_tasks_as_ndjson():
+    mock_db, copied = make_db()
+
+    def body():
+        # Split a line across chunks to exercise the streaming reader.
+        content = (json.dumps(task_line) + "\n" + "not json\n").encode()
+        yield content[:10]
+        yield content[10:]
+
+    with DependencyMocker(app, {get_db: mock_db, get_calling_user: admin}):
+        response = client.post("/v1/import/tasks/user-1", content=body())
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["rowsRead"] == 2
+    assert json_response["rowsRejected"] == 1
+    assert json_response["errors"] == [
+        {"line": 2, "message": "The line is not a JSON object."}
+    ]
+    assert "rowsPerSecond" in json_response
+    assert copied["import_task"] == [["1", "Task 1", "To Do", "Work", "user@email.com"]]
+    assert copied["import_personal_note"] == [
+        ["1", "Task 1", "Note 1", "Observations", "Some, text", "user@email.com"]
+    ]
+    merge_parameters = mock_db.execute.call_args_list[3][0][1]
+    assert merge_parameters == {"user_id": "user-1", "created_by": "admin@localdev.com"}
+    mock_db.commit.assert_called_once_with()
+
+
+def test_import_tasks_as_csv():
+    mock_db, copied = make_db()
+    content = (
+        "name,status,type,correspondenceEmailAddress,personalNoteName,personalNoteType,personalNoteNote,personalNoteCorrespondenceEmailAddress\n"
+        'Task 1,To Do,Work,user@email.com,Note 1,Observations,"Multi\nline",user@email.com\n'
+        "Task 2,Unknown,Work,user@email.com,,,,\n"
+    )
+
+    with DependencyMocker(app, {get_db: mock_db, get_calling_user: admin}):
+        response = client.post(
+            "/v1/import/tasks/user-1?format=csv", content=content.encode()
+        )
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["rowsRead"] == 2
+    assert json_response["errors"] == [
+        {
+            "line": 4,
+            "message": "The task has a status of Unknown, which is not allowed.",
+        }
+    ]
+    assert copied["import_personal_note"][0][4] == "Multi\nline"
+
+
+def test_import_tasks_as_csv_counts_each_task_once():
+    mock_db, copied = make_db()
+    mock_db.execute.side_effect = None
+    mock_db.execute.return_value.rowcount = 1
+    mock_db.execute.return_value.scalar_one.return_value = 1
+    content = (
+        "name,status,type,correspondenceEmailAddress,personalNoteName,personalNoteType,personalNoteNote,personalNoteCorrespondenceEmailAddress\n"
+        "Task 1,To Do,Work,user@email.com,Note 1,Observations,Text,user@email.com\n"
+        "Task 1,To Do,Work,user@email.com,Note 2,Observations,Text,user@email.com\n"
+    )
+
+    with DependencyMocker(app, {get_db: mock_db, get_calling_user: admin}):
+        response = client.post(
+            "/v1/import/tasks/user-1?format=csv", content=content.encode()
+        )
+
+    assert response.status_code == 200
+    assert len(copied["import_task"]) == 2
+    assert response.json()["tasksImported"] == 1
+    assert response.json()["tasksSkipped"] == 0
+    count = mock_db.execute.call_args_list[2][0][0]
+    assert str(count) == "select count(distinct name) from import_task"
+
+
+def test_import_tasks_requires_admin():
+    mock_db = MagicMock()
+    user = User(permissions=[Permission.Read])
+
+    with DependencyMocker(app, {get_db: mock_db, get_calling_user: user}):
+        response = client.post("/v1/import/tasks/user-1", content=b"")
+
+    assert response.status_code == 403
+    mock_db.execute.assert_not_called()
+
+
+def test_import_records_copies_in_batches():
+    mock_db, _ = make_db()
+    lines = [json.dumps({**task_line, "name": f"Task {i}"}) for i in range(5)]
+    cursor = mock_db.connection.return_value.connection.cursor.return_value
+    mock_db.execute.side_effect = None
+    mock_db.execute.return_value.rowcount = 4
+    mock_db.execute.return_value.scalar_one.return_value = 5
+
+    result = import_records(mock_db, "user-1", iter_ndjson_records(lines), batch_size=2)
+
+    # Five tasks and five notes, copied two at a time.
+    assert cursor.copy_expert.call_count == 6
+    assert result.tasks_imported == 4
+    assert result.tasks_skipped == 1
+    assert result.personal_notes_skipped == 1
+
+
+def test_import_records_reports_schema_errors():
+    mock_db, _ = make_db()
+    line = json.dumps({"name": "Task 1", "status": "To Do"})
+
+    result = import_records(mock_db, "user-1", iter_ndjson_records([line]))
+
+    assert result.rows_rejected == 1
+    assert [error.properties for error in result.errors] == [
+        ["type"],
+        ["correspondenceEmailAddress"],
+    ]
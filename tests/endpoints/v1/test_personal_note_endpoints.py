@@ -1,3 +1,4 @@
+from plm.schemas import Page
 from plm.models import PersonalNote
 from unittest.mock import patch, MagicMock
 from plm.enums import PersonalNoteTypes
@@ -8,8 +9,11 @@ from fastapi.testclient import TestClient
 from datetime import datetime
 from plm.dependencies import get_db
 from tests.dependency_mocker import DependencyMocker
-from tests.db_helpers import assert_wheres_are_equal
-from sqlmodel import and_
+from tests.db_helpers import assert_wheres_are_equal, unique_violation, returned_row
+from types import SimpleNamespace
+from plm.endpoints.helpers.etag_helpers import collection_etag, make_etag
+from sqlmodel import and_, select
+from sqlalchemy.dialects import postgresql
 import copy
 
 app = FastAPI()
@@ -46,17 +50,174 @@ def mock_select():
         yield m
 
 
-def test_get_all_personal_notes():
+@pytest.fixture()
+def mock_paginate():
+    with patch("plm.endpoints.v1.personal_note.paginate_by_offset") as mock_paginate:
+        mock_paginate.return_value = Page(
+            items=[fake_personal_note], total=1, limit=50, offset=0
+        )
+        yield mock_paginate
+
+
+def etag_row(count, digest):
+    return SimpleNamespace(count=count, digest=digest)
+
+
+def paginated_sql(mock_paginate):
+    query = mock_paginate.call_args[0][1]
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_get_all_personal_notes(mock_paginate):
     mock_db = MagicMock()
-    mock_db.exec.return_value.all.return_value = [fake_personal_note]
+    mock_db.exec.return_value.one.return_value = etag_row(1, "d41d8cd9")
 
     with DependencyMocker(app, {get_db: mock_db}):
         response = client.get("/v1/tasks/user-1/1/personal-notes")
 
     assert response.status_code == 200
     json_response = response.json()
-    assert len(json_response) == 1
-    assert json_response[0]["createdBy"] == fake_personal_note.created_by
+    assert len(json_response["items"]) == 1
+    assert json_response["items"][0]["createdBy"] == fake_personal_note.created_by
+    assert json_response["total"] == 1
+    assert response.headers["etag"] == collection_etag(1, "d41d8cd9")
+    # The ETag is read in one aggregate over the id and version of every note.
+    etag_sql = str(mock_db.exec.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert etag_sql.startswith(
+        "SELECT count(*) AS count, md5(string_agg(CAST(personal_note.id AS TEXT) || "
+        "%(param_1)s || CAST(coalesce(personal_note.modified_on, "
+        "personal_note.created_on) AS TEXT), ',' ORDER BY personal_note.id)) "
+        "AS digest"
+    )
+    assert paginated_sql(mock_paginate).startswith(
+        "SELECT personal_note.id, personal_note.created_by"
+    )
+
+
+def test_get_all_personal_notes_not_modified(mock_paginate):
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one.return_value = etag_row(2, "0cc175b9")
+    etag = collection_etag(2, "0cc175b9")
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/1/personal-notes", headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    mock_db.exec.assert_called_once()
+    mock_paginate.assert_not_called()
+
+
+def test_get_all_personal_notes_modified_since_etag(mock_paginate):
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one.return_value = etag_row(1, "92eb5ffe")
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/1/personal-notes",
+            headers={"If-None-Match": collection_etag(1, "d41d8cd9")},
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+
+
+def test_personal_notes_etag_of_empty_list():
+    assert collection_etag(0, None) == 'W/"0.0"'
+
+
+def test_get_personal_notes_filtered_and_searched(mock_paginate):
+    mock_db = MagicMock()
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/1/personal-notes?type=Observations"
+            "&modifiedTo=2026-01-01T02:00:00%2B02:00&q=budget -draft&sort=name"
+        )
+
+    assert response.status_code == 200
+    query = mock_paginate.call_args[0][1]
+    sql = paginated_sql(mock_paginate)
+    assert "personal_note.type IN (__[POSTCOMPILE_type_1])" in sql
+    assert "personal_note.modified_on < %(modified_on_1)s" in sql
+    assert "personal_note.search_vector @@ websearch_to_tsquery(" in sql
+    # An explicit sort replaces the ordering by relevance.
+    assert sql.endswith("ORDER BY personal_note.name ASC NULLS LAST, personal_note.id")
+    assert query.compile().params["modified_on_1"] == datetime(2026, 1, 1)
+
+
+def test_get_personal_notes_sorted_by_unknown_field(mock_paginate):
+    mock_db = MagicMock()
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/tasks/user-1/1/personal-notes?sort=-note")
+
+    assert response.status_code == 400
+    mock_db.exec.assert_not_called()
+
+
+def test_get_personal_notes_with_sparse_fieldset(mock_paginate):
+    mock_paginate.return_value.items = [SimpleNamespace(id=1, name="Note 1")]
+
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get(
+            "/v1/tasks/user-1/1/personal-notes?fields=name,createdOn,name"
+        )
+
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"id": 1, "name": "Note 1"}]
+    # The note text is never read.
+    assert paginated_sql(mock_paginate).startswith(
+        "SELECT personal_note.id, personal_note.name, personal_note.created_on \n"
+        "FROM personal_note"
+    )
+
+
+def test_get_personal_notes_with_unknown_field(mock_paginate):
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get("/v1/tasks/user-1/1/personal-notes?fields=name,userId")
+
+    assert response.status_code == 400
+    assert response.json()["detail"][0]["properties"] == ["fields"]
+    assert "Cannot return userId." in response.text
+    mock_paginate.assert_not_called()
+
+
+def test_get_personal_notes_by_cursor():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [
+        SimpleNamespace(id=1, type="Observations"),
+        SimpleNamespace(id=2, type="Observations"),
+    ]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/1/personal-notes/cursor?fields=type&limit=1"
+        )
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["items"] == [{"id": 1, "type": "Observations"}]
+    query = mock_db.exec.call_args[0][0]
+    assert query._limit == 2
+    assert str(query.compile(dialect=postgresql.dialect())).startswith(
+        "SELECT personal_note.id, personal_note.type \nFROM personal_note"
+    )
+
+    mock_db.exec.return_value.all.return_value = []
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/1/personal-notes/cursor"
+            f"?cursor={json_response['nextCursor']}"
+        )
+
+    assert response.status_code == 200
+    assert "personal_note.id > %(id_1)s" in str(
+        mock_db.exec.call_args[0][0].compile(dialect=postgresql.dialect())
+    )
 
 
 def test_get_one_personal_note():
@@ -82,6 +243,23 @@ def test_get_one_personal_note():
     )
 
 
+def test_get_one_personal_note_not_modified():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one_or_none.return_value = SimpleNamespace(
+        id=1, created_on=now, modified_on=None
+    )
+    etag = make_etag(1, now, None)
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/1/personal-notes/1",
+            headers={"If-None-Match": f'"other", W/{etag}'},
+        )
+
+    assert response.status_code == 304
+    mock_db.query.assert_not_called()
+
+
 def test_get_one_personal_note_not_found():
     mock_db = MagicMock()
     mock_db.query.return_value.where.return_value.one_or_none.return_value = None
@@ -92,10 +270,10 @@ def test_get_one_personal_note_not_found():
     assert response.status_code == 404
 
 
-@patch("plm.models.personal_note.PersonalNote.parse_obj")
-def test_create_personal_note_successful(mock_parse_obj):
+@patch("plm.endpoints.v1.personal_note.personal_note_from_create")
+def test_create_personal_note_successful(mock_personal_note_from_create):
     fake_personal_note_to_create = copy.copy(fake_personal_note)
-    mock_parse_obj.return_value = fake_personal_note
+    mock_personal_note_from_create.return_value = fake_personal_note
     mock_db = MagicMock()
     mock_db.query.return_value.filter.return_value.first.return_value = None
 
@@ -105,18 +283,21 @@ def test_create_personal_note_successful(mock_parse_obj):
     assert response.status_code == 200
     json_response = response.json()
     assert json_response["note"] == "This is a sample note"
+    payload, user_id, task_id = mock_personal_note_from_create.call_args[0]
+    assert payload.note == fake_payload["note"]
+    assert (user_id, task_id) == ("user-1", 1)
     mock_db.add.assert_called_once_with(fake_personal_note_to_create)
     mock_db.commit.assert_called_once_with()
 
 
-@patch("plm.models.personal_note.PersonalNote.parse_obj")
-def test_create_personal_note_error_due_to_existing_name(mock_parse_obj):
+@patch("plm.endpoints.v1.personal_note.personal_note_from_create")
+def test_create_personal_note_error_due_to_existing_name(
+    mock_personal_note_from_create,
+):
     fake_personal_note_to_create = copy.copy(fake_personal_note)
-    mock_parse_obj.return_value = fake_personal_note
+    mock_personal_note_from_create.return_value = fake_personal_note
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = (
-        fake_personal_note
-    )
+    mock_db.commit.side_effect = unique_violation("personal_note_user_id_name_key")
 
     with DependencyMocker(app, {get_db: mock_db}):
         response = client.post("/v1/tasks/user-1/1/personal-notes", json=fake_payload)
@@ -127,15 +308,16 @@ def test_create_personal_note_error_due_to_existing_name(mock_parse_obj):
         json_response["detail"][0]["message"]
         == f"A personal note with this same name already exists."
     )
-    mock_db.add.assert_not_called()
-    mock_db.commit.assert_not_called()
+    mock_db.add.assert_called_once_with(fake_personal_note_to_create)
+    mock_db.rollback.assert_called_once_with()
+    mock_db.query.assert_not_called()
 
 
-@patch("plm.models.personal_note.PersonalNote.parse_obj")
-def test_create_personal_note_error_due_to_unknown_type(mock_parse_obj):
+@patch("plm.endpoints.v1.personal_note.personal_note_from_create")
+def test_create_personal_note_error_due_to_unknown_type(mock_personal_note_from_create):
     fake_personal_note_to_create = copy.copy(fake_personal_note)
     fake_personal_note_to_create.type = "Unknown Type"
-    mock_parse_obj.return_value = fake_personal_note_to_create
+    mock_personal_note_from_create.return_value = fake_personal_note_to_create
     mock_db = MagicMock()
     mock_db.query.return_value.filter.return_value.first.return_value = None
 
@@ -153,54 +335,38 @@ def test_create_personal_note_error_due_to_unknown_type(mock_parse_obj):
 
 
 def test_update_personal_note_successful():
-    fake_personal_note_to_update = copy.copy(fake_personal_note)
-    fake_personal_note_to_update.type = "Description"
-    this_fake_payload = {}
-    this_fake_payload["name"] = "Personal Note 2"
-
     mock_db = MagicMock()
-    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
-        fake_personal_note_to_update
+    mock_db.execute.return_value.one_or_none.return_value = returned_row(
+        fake_personal_note, name="Personal Note 2"
     )
-    mock_db.query.return_value.filter.return_value.first.return_value = None
 
     with DependencyMocker(app, {get_db: mock_db}):
         response = client.patch(
-            "/v1/tasks/user-1/1/personal-notes/1", json=this_fake_payload
+            "/v1/tasks/user-1/1/personal-notes/1", json={"name": "Personal Note 2"}
         )
 
     assert response.status_code == 200
     json_response = response.json()
     assert json_response["name"] == "Personal Note 2"
+    mock_db.query.assert_not_called()
+    mock_db.execute.assert_called_once()
     mock_db.commit.assert_called_once_with()
-    assert_wheres_are_equal(
-        mock_db.query.return_value.where,
-        0,
+    assert mock_db.execute.call_args[0][0].whereclause.compare(
         and_(
             PersonalNote.user_id == "user-1",
             PersonalNote.task_id == 1,
             PersonalNote.id == 1,
-        ),
+        )
     )
 
 
 def test_update_personal_note_error_due_to_existing_name():
-    fake_personal_note_to_update = copy.copy(fake_personal_note)
-    fake_personal_note_to_update.type = "Description"
-    this_fake_payload = {}
-    this_fake_payload["name"] = "Personal Note 2"
-
     mock_db = MagicMock()
-    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
-        fake_personal_note_to_update
-    )
-    mock_db.query.return_value.filter.return_value.first.return_value = (
-        fake_personal_note_to_update
-    )
+    mock_db.execute.side_effect = unique_violation("personal_note_user_id_name_key")
 
     with DependencyMocker(app, {get_db: mock_db}):
         response = client.patch(
-            "/v1/tasks/user-1/1/personal-notes/1", json=this_fake_payload
+            "/v1/tasks/user-1/1/personal-notes/1", json={"name": "Personal Note 2"}
         )
 
     assert response.status_code == 400
@@ -210,34 +376,47 @@ def test_update_personal_note_error_due_to_existing_name():
         == "A personal note with this same name already exists."
     )
     mock_db.commit.assert_not_called()
-    assert_wheres_are_equal(
-        mock_db.query.return_value.where,
-        0,
-        and_(
-            PersonalNote.user_id == "user-1",
-            PersonalNote.task_id == 1,
-            PersonalNote.id == 1,
-        ),
-    )
+    mock_db.rollback.assert_called_once_with()
 
 
-def test_update_personal_note_error_due_to_unknown_type_in_payload():
-    fake_personal_note_to_update = copy.copy(fake_personal_note)
-    fake_personal_note_to_update.type = "Description"
-    this_fake_payload = {}
-    this_fake_payload["type"] = "Unknown Type"
+def test_update_personal_note_not_found():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.one_or_none.return_value = None
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch(
+            "/v1/tasks/user-1/1/personal-notes/1", json={"note": "Changed"}
+        )
+
+    assert response.status_code == 404
+    mock_db.commit.assert_not_called()
+
 
+def test_update_personal_note_if_match_precondition_failed():
     mock_db = MagicMock()
-    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
-        fake_personal_note_to_update
-    )
-    mock_db.query.return_value.filter.return_value.first.return_value = (
-        fake_personal_note_to_update
+    mock_db.execute.return_value.one_or_none.return_value = None
+    mock_db.exec.return_value.one_or_none.return_value = SimpleNamespace(
+        id=1, created_on=now, modified_on=datetime(2030, 1, 1)
     )
 
     with DependencyMocker(app, {get_db: mock_db}):
         response = client.patch(
-            "/v1/tasks/user-1/1/personal-notes/1", json=this_fake_payload
+            "/v1/tasks/user-1/1/personal-notes/1",
+            json={"note": "Changed"},
+            headers={"If-Match": make_etag(1, now, None)},
+        )
+
+    assert response.status_code == 412
+    assert "coalesce(personal_note.modified_on" in str(mock_db.execute.call_args[0][0])
+    mock_db.commit.assert_not_called()
+
+
+def test_update_personal_note_error_due_to_unknown_type_in_payload():
+    mock_db = MagicMock()
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch(
+            "/v1/tasks/user-1/1/personal-notes/1", json={"type": "Unknown Type"}
         )
 
     assert response.status_code == 400
@@ -246,16 +425,8 @@ def test_update_personal_note_error_due_to_unknown_type_in_payload():
         json_response["detail"][0]["message"]
         == "The note has a type of Unknown Type, which is not allowed."
     )
+    mock_db.execute.assert_not_called()
     mock_db.commit.assert_not_called()
-    assert_wheres_are_equal(
-        mock_db.query.return_value.where,
-        0,
-        and_(
-            PersonalNote.user_id == "user-1",
-            PersonalNote.task_id == 1,
-            PersonalNote.id == 1,
-        ),
-    )
 
 
 def test_delete_personal_note_successful():
@@ -283,3 +454,181 @@ def test_delete_personal_note_error_due_to_personal_note_not_found():
     assert response.status_code == 404
     mock_db.delete.assert_not_called()
     mock_db.commit.assert_not_called()
+
+
+def make_personal_note(id, name):
+    return PersonalNote(
+        id=id,
+        created_by="test@localdev.com",
+        created_on=now,
+        task_id=1,
+        name=name,
+        type=PersonalNoteTypes.ProgressReport,
+        note="This is a sample note",
+        user_id="user-1",
+        correspondence_email_address="address@email.com",
+    )
+
+
+@patch("plm.endpoints.v1.personal_note.insert_returning")
+def test_create_personal_notes_reports_results_per_item(mock_insert_returning):
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = MagicMock()
+    mock_db.exec.return_value.all.return_value = [("Existing", 5)]
+    mock_insert_returning.side_effect = lambda db, model, entities, **kwargs: [
+        PersonalNote(
+            **{
+                **entity.dict(),
+                "id": 10 + index,
+                "created_by": "dev",
+                "created_on": now,
+            }
+        )
+        for index, entity in enumerate(entities)
+    ]
+
+    payload = {
+        "items": [
+            {**fake_payload, "name": "Note 1"},
+            {**fake_payload, "name": "Existing"},
+            {**fake_payload, "name": "Note 2", "type": "Unknown"},
+            {**fake_payload, "name": "Note 3"},
+        ]
+    }
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post("/v1/tasks/user-1/1/personal-notes:batch", json=payload)
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["item"]["id"] for item in (items[0], items[3])] == [10, 11]
+    assert items[1]["errors"] == [
+        {
+            "message": "A personal note with this same name already exists.",
+            "properties": ["name"],
+        }
+    ]
+    assert items[2]["errors"] == [
+        {"message": "The note has a type of Unknown, which is not allowed."}
+    ]
+    entities = mock_insert_returning.call_args[0][2]
+    assert [(entity.name, entity.task_id, entity.user_id) for entity in entities] == [
+        ("Note 1", 1, "user-1"),
+        ("Note 3", 1, "user-1"),
+    ]
+    mock_db.commit.assert_called_once_with()
+
+
+def test_create_personal_notes_task_not_found():
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = None
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post(
+            "/v1/tasks/user-1/1/personal-notes:batch", json={"items": [fake_payload]}
+        )
+
+    assert response.status_code == 404
+    mock_db.exec.assert_not_called()
+
+
+def test_update_personal_notes_successful():
+    note_1 = make_personal_note(1, "Note 1")
+    note_2 = make_personal_note(2, "Note 2")
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.side_effect = [
+        [note_1, note_2],
+        [("Note 2", 2)],
+        [note_1, note_2],
+    ]
+
+    payload = {
+        "items": [
+            {"id": 1, "note": "Changed"},
+            {"id": 2, "name": "Note 2", "type": "Description"},
+        ]
+    }
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch("/v1/tasks/user-1/1/personal-notes:batch", json=payload)
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0]["item"]["note"] == "Changed"
+    assert items[1]["item"]["type"] == "Description"
+    assert note_1.id == 1
+    mock_db.expunge.assert_not_called()
+    mock_db.commit.assert_called_once_with()
+    assert mock_db.exec.call_count == 3
+    expected_query = select(PersonalNote).where(
+        and_(
+            PersonalNote.user_id == "user-1",
+            PersonalNote.task_id == 1,
+            PersonalNote.id.in_([1, 2]),
+        )
+    )
+    assert expected_query.compare(mock_db.exec.call_args_list[0][0][0])
+    assert expected_query.compare(mock_db.exec.call_args_list[2][0][0])
+
+
+def test_update_personal_notes_reports_errors_per_item():
+    note_1 = make_personal_note(1, "Note 1")
+    note_2 = make_personal_note(2, "Note 2")
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.side_effect = [
+        [note_1, note_2],
+        [("Note 1", 1)],
+        [note_1],
+    ]
+
+    payload = {
+        "items": [
+            {"id": 1, "note": "Changed"},
+            {"id": 2, "name": "Note 1"},
+            {"id": 3, "note": "Missing"},
+            {"id": 1, "note": "Twice"},
+        ]
+    }
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch("/v1/tasks/user-1/1/personal-notes:batch", json=payload)
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0]["item"]["note"] == "Changed"
+    assert items[1]["errors"][0]["properties"] == ["name"]
+    assert items[2]["errors"] == [
+        {"message": "The personal note was not found.", "properties": ["id"]}
+    ]
+    assert items[3]["errors"][0]["properties"] == ["id"]
+    mock_db.expunge.assert_called_once_with(note_2)
+    mock_db.commit.assert_called_once_with()
+
+
+def test_update_personal_notes_unknown_type_is_not_saved():
+    note_1 = make_personal_note(1, "Note 1")
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.side_effect = [[note_1]]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch(
+            "/v1/tasks/user-1/1/personal-notes:batch",
+            json={"items": [{"id": 1, "type": "Unknown"}]},
+        )
+
+    assert response.status_code == 200
+    assert "item" not in response.json()["items"][0]
+    mock_db.expunge.assert_called_once_with(note_1)
+    mock_db.commit.assert_not_called()
+
+
+def test_update_personal_notes_name_taken_concurrently():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.side_effect = [[make_personal_note(1, "Note 1")], []]
+    mock_db.commit.side_effect = unique_violation("personal_note_user_id_name_key")
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch(
+            "/v1/tasks/user-1/1/personal-notes:batch",
+            json={"items": [{"id": 1, "name": "New"}]},
+        )
+
+    assert response.status_code == 400
+    mock_db.rollback.assert_called_once_with()
@@ -1,5 +1,7 @@
 from plm.models import Task, PersonalNote
-from unittest.mock import patch, MagicMock
+from plm.schemas import Page, TaskExport, ChangesResponse
+from plm.services.changes import ChangePosition, encode_change_cursor, position_since
+from unittest.mock import patch, MagicMock, ANY
 from plm.enums import TaskStatus, TaskTypes, PersonalNoteTypes
 import pytest
 from plm.endpoints.v1.task import router
@@ -7,9 +9,16 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from datetime import datetime
 from plm.dependencies import get_db
+from plm.security import User
+from plm.services.db import EntityCache, LocalCacheBackend, task_cache_key
+import plm.services.db.cache as cache_module
 from tests.dependency_mocker import DependencyMocker
-from tests.db_helpers import assert_wheres_are_equal
-from sqlmodel import and_
+from tests.db_helpers import assert_wheres_are_equal, unique_violation, returned_row
+from types import SimpleNamespace
+from plm.endpoints.helpers.etag_helpers import make_etag
+from sqlmodel import and_, select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql
 import copy
 
 app = FastAPI()
@@ -53,13 +62,8 @@ fake_personal_note = PersonalNote(
 
 @pytest.fixture()
 def mock_paginate():
-    with patch("plm.endpoints.v1.task.paginate") as mock_paginate:
-        mock_paginate.return_value = {
-            "items": [fake_task],
-            "total": 1,
-            "limit": 1,
-            "offset": 1,
-        }
+    with patch("plm.endpoints.v1.task.paginate_by_offset") as mock_paginate:
+        mock_paginate.return_value = Page(items=[fake_task], total=1, limit=1, offset=1)
         yield mock_paginate
 
 
@@ -88,6 +92,114 @@ def test_get_all_tasks(mock_paginate, mock_select):
     )
 
 
+def paginated_sql(mock_paginate):
+    query = mock_paginate.call_args[0][1]
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_get_tasks_filtered_and_sorted(mock_paginate):
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get(
+            "/v1/tasks/user-1?status=To Do&status=Done&type=Work&namePrefix=Re_"
+            "&createdFrom=2026-01-01T00:00:00Z&sort=-modifiedOn"
+        )
+
+    assert response.status_code == 200
+    query = mock_paginate.call_args[0][1]
+    assert query.whereclause.compare(
+        and_(
+            Task.user_id == "user-1",
+            Task.type.in_(["Work"]),
+            Task.name.startswith("Re_", autoescape=True),
+            Task.created_on >= datetime(2026, 1, 1),
+            Task.status.in_(["To Do", "Done"]),
+        )
+    )
+    assert paginated_sql(mock_paginate).endswith(
+        "ORDER BY task.modified_on DESC NULLS LAST, task.id DESC"
+    )
+
+
+def test_get_tasks_searched_by_relevance(mock_paginate):
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get("/v1/tasks/user-1?q=quarterly report")
+
+    assert response.status_code == 200
+    sql = paginated_sql(mock_paginate)
+    assert (
+        "task.search_vector @@ websearch_to_tsquery(%(websearch_to_tsquery_1)s, "
+        "%(websearch_to_tsquery_2)s)" in sql
+    )
+    assert sql.endswith(
+        "ORDER BY ts_rank(task.search_vector, websearch_to_tsquery("
+        "%(websearch_to_tsquery_3)s, %(websearch_to_tsquery_4)s)) DESC, task.id"
+    )
+
+
+def test_get_tasks_sorted_by_unknown_field(mock_paginate):
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get("/v1/tasks/user-1?sort=correspondenceEmailAddress")
+
+    assert response.status_code == 400
+    assert "Cannot sort by correspondenceEmailAddress" in response.text
+    mock_paginate.assert_not_called()
+
+
+def test_get_tasks_by_cursor():
+    other_task = Task(
+        id=2,
+        created_by="test@localdev.com",
+        created_on=now,
+        name="Task 2",
+        status=TaskStatus.ToDo,
+        type=TaskTypes.Work,
+        user_id="user-1",
+        correspondence_email_address="user@email.com",
+    )
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [fake_task, other_task]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/tasks/user-1/cursor?limit=1")
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert len(json_response["items"]) == 1
+    assert json_response["items"][0]["id"] == 1
+    assert "total" not in json_response
+    next_cursor = json_response["nextCursor"]
+
+    mock_db.exec.return_value.all.return_value = [other_task]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(f"/v1/tasks/user-1/cursor?cursor={next_cursor}")
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert json_response["items"][0]["id"] == 2
+    assert "nextCursor" not in json_response
+    expected_query = (
+        select(Task)
+        .filter(Task.user_id == "user-1")
+        .where(Task.id > 1)
+        .order_by(Task.id)
+        .limit(51)
+    )
+    assert expected_query.compare(mock_db.exec.call_args_list[-1][0][0])
+
+
+def test_get_tasks_by_cursor_with_total():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one.return_value = 1
+    mock_db.exec.return_value.all.return_value = [fake_task]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/tasks/user-1/cursor?includeTotal=true")
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+
 def test_get_one_task_found():
     mock_db = MagicMock()
     mock_db.query.return_value.where.return_value.one_or_none.return_value = fake_task
@@ -116,10 +228,87 @@ def test_get_one_task_not_found():
     assert response.status_code == 404
 
 
-@patch("plm.models.task.Task.parse_obj")
-def test_create_task_successful(mock_parse_obj):
+def test_get_one_task_returns_etag():
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = fake_task
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/tasks/user-1/1")
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == make_etag(1, fake_task.created_on, None)
+
+
+def test_get_one_task_not_modified():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one_or_none.return_value = SimpleNamespace(
+        id=1, created_on=now, modified_on=None
+    )
+    etag = make_etag(1, now, None)
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/tasks/user-1/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    # Only the id and timestamps are read.
+    mock_db.query.assert_not_called()
+    assert [c.name for c in mock_db.exec.call_args[0][0].selected_columns] == [
+        "id",
+        "created_on",
+        "modified_on",
+    ]
+
+
+def test_get_one_task_modified_since_etag():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one_or_none.return_value = SimpleNamespace(
+        id=1, created_on=now, modified_on=datetime(2030, 1, 1)
+    )
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = fake_task
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/1", headers={"If-None-Match": make_etag(1, now, None)}
+        )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == fake_task.name
+
+
+def test_get_one_task_etag_is_not_read_from_the_cache(monkeypatch):
+    cache = EntityCache(LocalCacheBackend(max_size=10, ttl=30))
+    cache.backend.set(task_cache_key("user-1", 1), fake_task.dict())
+    monkeypatch.setattr(cache_module, "_entity_cache", cache)
+
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one_or_none.return_value = SimpleNamespace(
+        id=1, created_on=now, modified_on=datetime(2030, 1, 1)
+    )
+    mock_db.merge.side_effect = lambda entity, load: entity
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/1", headers={"If-None-Match": make_etag(1, now, None)}
+        )
+
+    assert response.status_code == 200
+
+
+def test_get_one_task_not_modified_not_found():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one_or_none.return_value = None
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/tasks/user-1/1", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+
+
+@patch("plm.endpoints.v1.task.task_from_create")
+def test_create_task_successful(mock_task_from_create):
     fake_task_to_create = copy.copy(fake_task)
-    mock_parse_obj.return_value = fake_task_to_create
+    mock_task_from_create.return_value = fake_task_to_create
     mock_db = MagicMock()
     mock_db.query.return_value.filter.return_value.first.return_value = None
 
@@ -131,16 +320,48 @@ def test_create_task_successful(mock_parse_obj):
     assert json_response["id"] == 1
     assert json_response["name"] == fake_task.name
     assert json_response["status"] == "To Do"
+    payload, user_id = mock_task_from_create.call_args[0]
+    assert payload.name == fake_payload["name"]
+    assert user_id == "user-1"
     mock_db.add.assert_called_once_with(fake_task_to_create)
     mock_db.commit.assert_called_once_with()
 
 
-@patch("plm.models.task.Task.parse_obj")
-def test_create_task_error_due_to_non_unique_name(mock_parse_obj):
+def test_create_task_builds_the_entity_from_the_payload():
+    mock_db = MagicMock()
+
+    def add(entity):
+        entity.id = 1
+        entity.created_by = "test@localdev.com"
+        entity.created_on = now
+
+    mock_db.add.side_effect = add
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post(
+            "/v1/tasks/user-1", json={**fake_payload, "user_id": "user-2"}
+        )
+
+    assert response.status_code == 200
+    task_entity = mock_db.add.call_args[0][0]
+    assert isinstance(task_entity, Task)
+    assert task_entity.dict(exclude={"id", "created_by", "created_on"}) == {
+        "name": "Task 1",
+        "status": "To Do",
+        "type": "Work",
+        "user_id": "user-1",
+        "correspondence_email_address": "user@email.com",
+        "modified_by": None,
+        "modified_on": None,
+    }
+
+
+@patch("plm.endpoints.v1.task.task_from_create")
+def test_create_task_error_due_to_non_unique_name(mock_task_from_create):
     fake_task_to_create = copy.copy(fake_task)
-    mock_parse_obj.return_value = fake_task_to_create
+    mock_task_from_create.return_value = fake_task_to_create
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = fake_task
+    mock_db.commit.side_effect = unique_violation("task_user_id_name_key")
 
     with DependencyMocker(app, {get_db: mock_db}):
         response = client.post("/v1/tasks/user-1", json=fake_payload)
@@ -151,15 +372,29 @@ def test_create_task_error_due_to_non_unique_name(mock_parse_obj):
         json_response["detail"][0]["message"]
         == f"A task with this same name already exists."
     )
-    mock_db.add.assert_not_called()
-    mock_db.commit.assert_not_called()
+    mock_db.add.assert_called_once_with(fake_task_to_create)
+    mock_db.rollback.assert_called_once_with()
+    mock_db.query.assert_not_called()
+
+
+@patch("plm.endpoints.v1.task.task_from_create")
+def test_create_task_other_integrity_errors_are_not_translated(mock_task_from_create):
+    mock_task_from_create.return_value = copy.copy(fake_task)
+    mock_db = MagicMock()
+    mock_db.commit.side_effect = unique_violation("some_other_constraint")
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        with pytest.raises(IntegrityError):
+            client.post("/v1/tasks/user-1", json=fake_payload)
 
+    mock_db.rollback.assert_not_called()
 
-@patch("plm.models.task.Task.parse_obj")
-def test_create_task_error_due_to_unknown_status(mock_parse_obj):
+
+@patch("plm.endpoints.v1.task.task_from_create")
+def test_create_task_error_due_to_unknown_status(mock_task_from_create):
     fake_task_to_create = copy.copy(fake_task)
     fake_task_to_create.status = "Unknown Status"
-    mock_parse_obj.return_value = fake_task_to_create
+    mock_task_from_create.return_value = fake_task_to_create
     fake_payload["status"] = "Unknown Status"
     mock_db = MagicMock()
     mock_db.query.return_value.filter.return_value.first.return_value = None
@@ -177,12 +412,12 @@ def test_create_task_error_due_to_unknown_status(mock_parse_obj):
     mock_db.commit.assert_not_called()
 
 
-@patch("plm.models.task.Task.parse_obj")
-def test_create_task_error_due_to_unknown_type(mock_parse_obj):
+@patch("plm.endpoints.v1.task.task_from_create")
+def test_create_task_error_due_to_unknown_type(mock_task_from_create):
     fake_task_to_create = copy.copy(fake_task)
     fake_task_to_create.status = "To Do"
     fake_task_to_create.type = "Unknown Type"
-    mock_parse_obj.return_value = fake_task_to_create
+    mock_task_from_create.return_value = fake_task_to_create
     fake_payload["status"] = "To Do"
     fake_payload["type"] = "Unknown Type"
     mock_db = MagicMock()
@@ -202,39 +437,35 @@ def test_create_task_error_due_to_unknown_type(mock_parse_obj):
 
 
 def test_update_task_successful():
-    existing_task = copy.copy(fake_task)
-    existing_task.status = "To Do"
-    existing_task.type = "Work"
-    fake_payload["name"] = "Other Task Name"
-    fake_payload["type"] = "Well Being"
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = None
-    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
-        existing_task
+    mock_db.get_user.return_value = User(email="test@localdev.com")
+    mock_db.execute.return_value.one_or_none.return_value = returned_row(
+        fake_task,
+        name="Other Task Name",
+        type="Well Being",
+        modified_by="test@localdev.com",
+        modified_on=now,
     )
 
     with DependencyMocker(app, {get_db: mock_db}):
-        response = client.patch("/v1/tasks/user-1/1", json=fake_payload)
+        response = client.patch(
+            "/v1/tasks/user-1/1", json={"name": "Other Task Name", "type": "Well Being"}
+        )
 
     assert response.status_code == 200
     json_response = response.json()
     assert json_response["id"] == 1
     assert json_response["name"] == "Other Task Name"
     assert json_response["type"] == "Well Being"
+    assert json_response["modifiedBy"] == "test@localdev.com"
     mock_db.commit.assert_called_once_with()
 
 
 def test_update_task_error_due_to_unknown_type():
-    existing_task = copy.copy(fake_task)
-    fake_payload["type"] = "Unknown Type"
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = None
-    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
-        existing_task
-    )
 
     with DependencyMocker(app, {get_db: mock_db}):
-        response = client.patch("/v1/tasks/user-1/1", json=fake_payload)
+        response = client.patch("/v1/tasks/user-1/1", json={"type": "Unknown Type"})
 
     assert response.status_code == 400
     json_response = response.json()
@@ -242,21 +473,18 @@ def test_update_task_error_due_to_unknown_type():
         json_response["detail"][0]["message"]
         == f"The task has a type of Unknown Type, which is not allowed."
     )
+    mock_db.execute.assert_not_called()
     mock_db.commit.assert_not_called()
 
 
 def test_update_task_error_due_to_unknown_status():
-    existing_task = copy.copy(fake_task)
-    fake_payload["type"] = "Well Being"
-    fake_payload["status"] = "Unknown Status"
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = None
-    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
-        existing_task
-    )
 
     with DependencyMocker(app, {get_db: mock_db}):
-        response = client.patch("/v1/tasks/user-1/1", json=fake_payload)
+        response = client.patch(
+            "/v1/tasks/user-1/1",
+            json={"type": "Well Being", "status": "Unknown Status"},
+        )
 
     assert response.status_code == 400
     json_response = response.json()
@@ -264,22 +492,18 @@ def test_update_task_error_due_to_unknown_status():
         json_response["detail"][0]["message"]
         == f"The task has a status of Unknown Status, which is not allowed."
     )
+    mock_db.execute.assert_not_called()
     mock_db.commit.assert_not_called()
 
 
 def test_update_task_error_due_to_existing_task_name():
-    existing_task = copy.copy(fake_task)
-    fake_payload["type"] = "Well Being"
-    fake_payload["status"] = "Done"
-    fake_payload["name"] = "Other task name"
     mock_db = MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = existing_task
-    mock_db.query.return_value.where.return_value.one_or_none.return_value = (
-        existing_task
-    )
+    mock_db.execute.side_effect = unique_violation("task_user_id_name_key")
 
     with DependencyMocker(app, {get_db: mock_db}):
-        response = client.patch("/v1/tasks/user-1/1", json=fake_payload)
+        response = client.patch(
+            "/v1/tasks/user-1/1", json={"name": "Other task name", "status": "Done"}
+        )
 
     assert response.status_code == 400
     json_response = response.json()
@@ -288,6 +512,140 @@ def test_update_task_error_due_to_existing_task_name():
         == f"A task with this same name already exists."
     )
     mock_db.commit.assert_not_called()
+    mock_db.rollback.assert_called_once_with()
+
+
+def test_update_task_not_found():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.one_or_none.return_value = None
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch("/v1/tasks/user-1/1", json={"status": "Done"})
+
+    assert response.status_code == 404
+
+
+def test_update_task_if_match():
+    modified_on = datetime(2030, 1, 1)
+    mock_db = MagicMock()
+    mock_db.execute.return_value.one_or_none.return_value = returned_row(
+        fake_task, status="Done", modified_on=modified_on
+    )
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch(
+            "/v1/tasks/user-1/1",
+            json={"status": "Done"},
+            headers={"If-Match": make_etag(1, now, None)},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == make_etag(1, now, modified_on)
+    # The version is checked by the UPDATE itself.
+    assert mock_db.execute.call_args[0][0].whereclause.compare(
+        and_(
+            and_(Task.user_id == "user-1", Task.id == 1),
+            func.coalesce(Task.modified_on, Task.created_on).in_([now]),
+        )
+    )
+    mock_db.commit.assert_called_once_with()
+
+
+def test_update_task_if_match_precondition_failed():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.one_or_none.return_value = None
+    mock_db.exec.return_value.one_or_none.return_value = SimpleNamespace(
+        id=1, created_on=now, modified_on=datetime(2030, 1, 1)
+    )
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch(
+            "/v1/tasks/user-1/1",
+            json={"status": "Done"},
+            headers={"If-Match": make_etag(1, now, None)},
+        )
+
+    assert response.status_code == 412
+    mock_db.commit.assert_not_called()
+
+
+def test_update_task_if_match_not_found():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.one_or_none.return_value = None
+    mock_db.exec.return_value.one_or_none.return_value = None
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch(
+            "/v1/tasks/user-1/1",
+            json={"status": "Done"},
+            headers={"If-Match": make_etag(1, now, None)},
+        )
+
+    assert response.status_code == 404
+
+
+def test_update_task_if_match_weak_etag():
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = fake_task
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch(
+            "/v1/tasks/user-1/1",
+            json={},
+            headers={"If-Match": "W/" + make_etag(1, now, None)},
+        )
+
+    assert response.status_code == 412
+    mock_db.commit.assert_not_called()
+
+
+def test_update_task_with_update_returning():
+    modified_on = datetime(2030, 1, 1)
+    mock_db = MagicMock()
+    mock_db.get_user.return_value = User(id="user-1")
+    mock_db.execute.return_value.one_or_none.return_value = returned_row(
+        fake_task, status="Done", modified_by="user-1", modified_on=modified_on
+    )
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch("/v1/tasks/user-1/1", json={"status": "Done"})
+
+    assert response.status_code == 200
+    # The response is the row returned by the UPDATE, not a refreshed entity.
+    json_response = response.json()
+    assert json_response["id"] == 1
+    assert json_response["name"] == fake_task.name
+    assert json_response["status"] == "Done"
+    assert json_response["modifiedBy"] == "user-1"
+    assert json_response["modifiedOn"] == modified_on.isoformat()
+    assert response.headers["etag"] == make_etag(1, now, modified_on)
+    # The change is written and read back by a single UPDATE ... RETURNING.
+    update = mock_db.execute.call_args[0][0]
+    assert update.whereclause.compare(and_(Task.user_id == "user-1", Task.id == 1))
+    compiled = update.compile(dialect=postgresql.dialect())
+    assert str(compiled) == (
+        "UPDATE task SET modified_by=%(modified_by)s, modified_on=now(), "
+        "status=%(status)s WHERE task.user_id = %(user_id_1)s AND task.id = %(id_1)s "
+        "RETURNING task.id, task.created_by, task.created_on, task.modified_by, "
+        "task.modified_on, task.name, task.status, task.type, task.user_id, "
+        "task.correspondence_email_address"
+    )
+    assert compiled.params["modified_by"] == "user-1"
+    assert compiled.params["status"] == "Done"
+
+
+def test_update_task_without_changes():
+    mock_db = MagicMock()
+    mock_db.query.return_value.where.return_value.one_or_none.return_value = Task(
+        **fake_task.dict()
+    )
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.patch("/v1/tasks/user-1/1", json={})
+
+    assert response.status_code == 200
+    mock_db.execute.assert_not_called()
+    mock_db.commit.assert_not_called()
 
 
 def test_delete_task_successful():
@@ -327,3 +685,317 @@ def test_delete_task_error_due_to_existing_personal_notes():
     )
     mock_db.delete.assert_not_called()
     mock_db.commit.assert_not_called()
+
+
+def make_batch_payload(*names, **overrides):
+    item = {
+        "status": "To Do",
+        "type": "Work",
+        "correspondenceEmailAddress": "user@email.com",
+    }
+    return {
+        "items": [{**item, "name": name, **overrides.get(name, {})} for name in names]
+    }
+
+
+@patch("plm.endpoints.v1.task.insert_returning")
+def test_create_tasks_successful(mock_insert_returning):
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = []
+    mock_insert_returning.side_effect = lambda db, model, entities, **kwargs: [
+        Task(
+            **{**entity.dict(), "id": index + 1, "created_by": "dev", "created_on": now}
+        )
+        for index, entity in enumerate(entities)
+    ]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post(
+            "/v1/tasks/user-1:batch", json=make_batch_payload("Task 1", "Task 2")
+        )
+
+    assert response.status_code == 200
+    json_response = response.json()
+    assert [item["index"] for item in json_response["items"]] == [0, 1]
+    assert [item["item"]["id"] for item in json_response["items"]] == [1, 2]
+    assert json_response["items"][1]["item"]["name"] == "Task 2"
+    assert "errors" not in json_response["items"][0]
+    entities = mock_insert_returning.call_args[0][2]
+    assert [entity.user_id for entity in entities] == ["user-1", "user-1"]
+    assert (
+        mock_insert_returning.call_args[1]["conflict_constraint"]
+        == "task_user_id_name_key"
+    )
+    mock_db.exec.assert_called_once()
+    mock_db.add.assert_not_called()
+    mock_db.commit.assert_called_once_with()
+
+
+@patch("plm.endpoints.v1.task.insert_returning")
+def test_create_tasks_reports_errors_per_item(mock_insert_returning):
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = ["Existing"]
+    mock_insert_returning.side_effect = lambda db, model, entities, **kwargs: [
+        Task(**{**entity.dict(), "id": 10, "created_by": "dev", "created_on": now})
+        for entity in entities
+    ]
+
+    payload = make_batch_payload(
+        "Task 1",
+        "Existing",
+        "Task 1",
+        "Bad",
+        Bad={"status": "Unknown", "type": "Unknown"},
+    )
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post("/v1/tasks/user-1:batch", json=payload)
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0]["item"]["name"] == "Task 1"
+    assert items[1]["errors"] == [
+        {
+            "message": "A task with this same name already exists.",
+            "properties": ["name"],
+        }
+    ]
+    assert items[2]["errors"] == items[1]["errors"]
+    assert [error["message"] for error in items[3]["errors"]] == [
+        "The task has a status of Unknown, which is not allowed.",
+        "The task has a type of Unknown, which is not allowed.",
+    ]
+    assert all("item" not in item for item in items[1:])
+    assert [entity.name for entity in mock_insert_returning.call_args[0][2]] == [
+        "Task 1"
+    ]
+    expected_query = select(Task.name).where(
+        and_(Task.user_id == "user-1", Task.name.in_(["Bad", "Existing", "Task 1"]))
+    )
+    assert expected_query.compare(mock_db.exec.call_args[0][0])
+
+
+@patch("plm.endpoints.v1.task.insert_returning")
+def test_create_tasks_name_taken_concurrently(mock_insert_returning):
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = []
+    mock_insert_returning.return_value = []
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post("/v1/tasks/user-1:batch", json=make_batch_payload("A"))
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["errors"][0]["properties"] == ["name"]
+
+
+@patch("plm.endpoints.v1.task.insert_returning")
+def test_create_tasks_all_invalid_does_not_insert(mock_insert_returning):
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = ["A"]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post("/v1/tasks/user-1:batch", json=make_batch_payload("A"))
+
+    assert response.status_code == 200
+    mock_insert_returning.assert_not_called()
+    mock_db.commit.assert_not_called()
+
+
+def test_create_tasks_empty_batch():
+    mock_db = MagicMock()
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post("/v1/tasks/user-1:batch", json={"items": []})
+
+    assert response.status_code == 422
+
+
+def compile_statement(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_delete_task_cascade():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.scalars.return_value.all.return_value = [1]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.delete("/v1/tasks/user-1/1?cascade=true")
+
+    assert response.status_code == 204
+    statements = [call[0][0] for call in mock_db.execute.call_args_list]
+    assert compile_statement(statements[0]).startswith(
+        "DELETE FROM personal_note WHERE personal_note.task_id IN (SELECT task.id"
+    )
+    assert compile_statement(statements[1]).startswith("DELETE FROM task WHERE")
+    assert "EXISTS" not in compile_statement(statements[1])
+    mock_db.query.assert_not_called()
+    mock_db.delete.assert_not_called()
+    mock_db.commit.assert_called_once_with()
+
+
+def test_delete_task_cascade_not_found():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.scalars.return_value.all.return_value = []
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.delete("/v1/tasks/user-1/1?cascade=true")
+
+    assert response.status_code == 404
+    mock_db.commit.assert_not_called()
+
+
+def test_delete_tasks_in_batch():
+    mock_db = MagicMock()
+    mock_db.execute.return_value.scalars.return_value.all.return_value = [1, 3]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post("/v1/tasks/user-1:batch-delete", json={"ids": [1, 2, 3]})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "deletedTasks": 2,
+        "deletedPersonalNotes": 0,
+        "notDeletedIds": [2],
+    }
+    # Without cascade, tasks that still have notes are not deleted.
+    mock_db.execute.assert_called_once()
+    sql = compile_statement(mock_db.execute.call_args[0][0])
+    assert "NOT (EXISTS (SELECT *" in sql
+    assert sql.endswith("RETURNING task.id")
+    mock_db.commit.assert_called_once_with()
+
+
+def test_delete_tasks_in_batch_cascade():
+    mock_db = MagicMock()
+    # The task and id of each deleted personal note.
+    mock_db.execute.return_value.all.return_value = [(1, n) for n in range(7)]
+    mock_db.execute.return_value.scalars.return_value.all.return_value = [1, 2]
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.post(
+            "/v1/tasks/user-1:batch-delete", json={"ids": [1, 2], "cascade": True}
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "deletedTasks": 2,
+        "deletedPersonalNotes": 7,
+        "notDeletedIds": [],
+    }
+    assert mock_db.execute.call_count == 2
+    mock_db.commit.assert_called_once_with()
+
+
+@patch("plm.endpoints.v1.task.iter_task_exports")
+def test_export_tasks_as_ndjson(mock_iter_task_exports):
+    mock_iter_task_exports.return_value = iter(
+        [
+            TaskExport(
+                id=1,
+                name="Task 1",
+                status=TaskStatus.ToDo,
+                type=TaskTypes.Work,
+                correspondence_email_address="user@email.com",
+                created_by="test@localdev.com",
+                created_on=now,
+                personal_notes=[],
+            )
+        ]
+    )
+    mock_db = MagicMock()
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get("/v1/tasks/user-1/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="tasks-user-1.ndjson"; '
+        "filename*=UTF-8''tasks-user-1.ndjson"
+    )
+    assert response.text.splitlines()[0].startswith('{"id": 1, "name": "Task 1"')
+    mock_iter_task_exports.assert_called_once_with(mock_db, "user-1")
+
+
+@patch("plm.endpoints.v1.task.iter_task_exports")
+def test_export_tasks_as_csv(mock_iter_task_exports):
+    mock_iter_task_exports.return_value = iter([])
+
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get("/v1/tasks/user-1/export?format=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.startswith("id,name,")
+
+
+@patch("plm.endpoints.v1.task.iter_task_exports")
+def test_export_tasks_filename_is_escaped(mock_iter_task_exports):
+    mock_iter_task_exports.return_value = iter([])
+
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get('/v1/tasks/a"b%0D%0Ac/export?format=csv')
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="tasks-a_b__c.csv"; '
+        "filename*=UTF-8''tasks-a%22b%0D%0Ac.csv"
+    )
+    mock_iter_task_exports.assert_called_once_with(ANY, 'a"b\r\nc')
+
+
+def test_export_tasks_unknown_format():
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get("/v1/tasks/user-1/export?format=xml")
+
+    assert response.status_code == 422
+
+
+@patch("plm.endpoints.v1.task.get_changes")
+def test_get_task_changes_since(mock_get_changes):
+    mock_get_changes.return_value = ChangesResponse(
+        tasks=[], personal_notes=[], deleted=[], next_cursor="cursor", has_more=False
+    )
+    mock_db = MagicMock()
+
+    with DependencyMocker(app, {get_db: mock_db}):
+        response = client.get(
+            "/v1/tasks/user-1/changes?since=2026-01-01T12:30:00&limit=100"
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "tasks": [],
+        "personalNotes": [],
+        "deleted": [],
+        "nextCursor": "cursor",
+        "hasMore": False,
+    }
+    mock_get_changes.assert_called_once_with(
+        mock_db, "user-1", position_since(datetime(2026, 1, 1, 12, 30)), 100
+    )
+
+
+@patch("plm.endpoints.v1.task.get_changes")
+def test_get_task_changes_from_cursor(mock_get_changes):
+    mock_get_changes.return_value = ChangesResponse(
+        tasks=[], personal_notes=[], deleted=[], next_cursor="next", has_more=True
+    )
+    position = ChangePosition(datetime(2026, 1, 1, 12, 30), 1, 3)
+
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get(
+            f"/v1/tasks/user-1/changes?cursor={encode_change_cursor(position)}"
+        )
+
+    assert response.status_code == 200
+    assert mock_get_changes.call_args[0][2] == position
+    assert mock_get_changes.call_args[0][3] == 500
+
+
+def test_get_task_changes_since_and_cursor():
+    with DependencyMocker(app, {get_db: MagicMock()}):
+        response = client.get(
+            "/v1/tasks/user-1/changes?since=2026-01-01T12:30:00&cursor=abc"
+        )
+
+    assert response.status_code == 400
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from sqlalchemy.orm import object_session
+from sqlmodel import Session, create_engine, select
+
+from plm.models import (
+    PersonalNote,
+    Task,
+    construct_entity,
+    entity_from,
+    field_aliases,
+    to_camel,
+    to_snake,
+)
+from plm.models.registry import _CAMEL_ALIASES, _FIELD_NAMES
+from plm.schemas import CursorPage, PersonalNoteCreate, TaskCreate, TaskResponse
+
+task_create = TaskCreate(
+    name="Task 1",
+    status="To Do",
+    type="Work",
+    user_id="someone-else",
+    correspondence_email_address="user@email.com",
+)
+
+
+def test_aliases_of_declared_models_are_registered():
+    assert to_camel("correspondence_email_address") == "correspondenceEmailAddress"
+    assert to_snake("correspondenceEmailAddress") == "correspondence_email_address"
+    assert to_snake("notAFieldYet") == "not_a_field_yet"
+
+
+def test_names_that_are_not_fields_are_not_registered():
+    aliases, field_names = len(_CAMEL_ALIASES), len(_FIELD_NAMES)
+
+    assert to_camel("not_a_field_yet") == "notAFieldYet"
+    assert to_snake("notAFieldEither") == "not_a_field_either"
+
+    assert len(_CAMEL_ALIASES) == aliases
+    assert len(_FIELD_NAMES) == field_names
+
+
+def test_field_aliases():
+    assert field_aliases(CursorPage) == (
+        ("items", "items"),
+        ("next_cursor", "nextCursor"),
+        ("total", "total"),
+    )
+    assert ("created_on", "createdOn") in field_aliases(TaskResponse)
+
+
+def test_construct_entity():
+    task = construct_entity(Task, {"id": 1, "name": "Task 1", "unknown": "ignored"})
+
+    assert task.id == 1
+    assert task.name == "Task 1"
+    assert task.status is None
+    assert task.personal_notes == []
+    assert task.__fields_set__ == {"id", "name"}
+    assert object_session(task) is None
+    assert not hasattr(task, "unknown")
+
+
+def test_entity_from_create_schema():
+    task = entity_from(Task, task_create, user_id="user-1")
+
+    assert (
+        task.dict()
+        == Task.parse_obj(task_create).copy(update={"user_id": "user-1"}).dict()
+    )
+
+
+def test_entity_from_is_inserted_and_tracked():
+    engine = create_engine("sqlite://")
+    Task.__table__.create(engine)
+    PersonalNote.__table__.create(engine)
+
+    with Session(engine) as session:
+        task = entity_from(Task, task_create, user_id="user-1", created_by="dev")
+        session.add(task)
+        session.commit()
+
+        note = entity_from(
+            PersonalNote,
+            PersonalNoteCreate(
+                name="Note 1",
+                type="Observations",
+                note="Some text",
+                correspondence_email_address="user@email.com",
+            ),
+            task_id=task.id,
+            user_id="user-1",
+            created_by="dev",
+            created_on=datetime(2026, 1, 1),
+        )
+        session.add(note)
+        task.name = "Task 2"
+        session.commit()
+
+        assert session.exec(select(Task.name, Task.user_id)).all() == [
+            ("Task 2", "user-1")
+        ]
+        assert [n.id for n in task.personal_notes] == [note.id]
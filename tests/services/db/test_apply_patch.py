@@ -25,3 +25,13 @@ def test_apply_patch():
     assert entity.property_1 == 100
     assert entity.property_2 == 2
     assert entity.property_3 == 3
+
+
+def test_apply_patch_with_excluded_fields():
+    entity = SampleModel(property_1=1, property_2=2, property_3=3)
+    payload = IncomingModel(property_1=100, property_2=200)
+
+    apply_patch(entity, payload, exclude={"property_2"})
+
+    assert entity.property_1 == 100
+    assert entity.property_2 == 2
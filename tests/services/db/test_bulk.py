@@ -0,0 +1,108 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from plm.enums import TaskStatus, TaskTypes
+from plm.models import Task
+from plm.security import User
+from plm.services.db import insert_returning, update_returning
+
+
+def make_task(name):
+    return Task(
+        id=99,
+        created_by="someone-else",
+        name=name,
+        status=TaskStatus.ToDo,
+        type=TaskTypes.Work,
+        user_id="user-1",
+        correspondence_email_address="user@email.com",
+    )
+
+
+def make_db(user):
+    mock_db = MagicMock()
+    mock_db.get_user.return_value = user
+    return mock_db
+
+
+def compile_statement(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def test_insert_returning_uses_one_statement():
+    now = datetime.now()
+    mock_db = make_db(User(id="user-1", email="user@email.com"))
+    returned = {
+        **make_task("Task 1").dict(),
+        "id": 1,
+        "created_by": "user@email.com",
+        "created_on": now,
+    }
+    mock_db.execute.return_value.all.return_value = [SimpleNamespace(_mapping=returned)]
+
+    created = insert_returning(
+        mock_db,
+        Task,
+        [make_task("Task 1"), make_task("Task 2")],
+        conflict_constraint="task_user_id_name_key",
+    )
+
+    assert created == [Task(**returned)]
+    mock_db.execute.assert_called_once()
+    compiled = compile_statement(mock_db.execute.call_args[0][0])
+    assert "VALUES" in str(compiled)
+    assert "ON CONFLICT ON CONSTRAINT task_user_id_name_key DO NOTHING" in str(compiled)
+    assert "RETURNING task.id" in str(compiled)
+    assert compiled.params["name_m0"] == "Task 1"
+    assert compiled.params["name_m1"] == "Task 2"
+    # Ids and audit columns of the entities are ignored.
+    assert "id_m0" not in compiled.params
+    assert compiled.params["created_by_m0"] == "user@email.com"
+    assert "now()" in str(compiled)
+
+
+def test_insert_returning_falls_back_to_the_user_id():
+    mock_db = make_db(User(id="user-1"))
+    mock_db.execute.return_value.all.return_value = []
+
+    insert_returning(mock_db, Task, [make_task("Task 1")])
+
+    compiled = compile_statement(mock_db.execute.call_args[0][0])
+    assert compiled.params["created_by_m0"] == "user-1"
+    assert "ON CONFLICT" not in str(compiled)
+
+
+def test_insert_returning_without_entities():
+    mock_db = make_db(User(id="user-1"))
+
+    assert insert_returning(mock_db, Task, []) == []
+    mock_db.execute.assert_not_called()
+
+
+def test_update_returning():
+    mock_db = make_db(User(id="user-1", email="user@email.com"))
+    returned = {**make_task("Task 2").dict(), "modified_by": "user@email.com"}
+    mock_db.execute.return_value.one_or_none.return_value = SimpleNamespace(
+        _mapping=returned
+    )
+
+    updated = update_returning(mock_db, Task, Task.id == 99, {"name": "Task 2"})
+
+    assert updated == Task(**returned)
+    mock_db.execute.assert_called_once()
+    compiled = compile_statement(mock_db.execute.call_args[0][0])
+    assert str(compiled).startswith("UPDATE task SET modified_by=")
+    assert "modified_on=now()" in str(compiled)
+    assert "WHERE task.id = " in str(compiled)
+    assert compiled.params["name"] == "Task 2"
+    assert compiled.params["modified_by"] == "user@email.com"
+
+
+def test_update_returning_no_match():
+    mock_db = make_db(User(id="user-1"))
+    mock_db.execute.return_value.one_or_none.return_value = None
+
+    assert update_returning(mock_db, Task, Task.id == 99, {"name": "Task 2"}) is None
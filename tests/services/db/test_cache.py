@@ -0,0 +1,294 @@
+from unittest.mock import MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlmodel import SQLModel, create_engine, select
+
+import plm.services.db.cache as cache_module
+from plm.models import Task, PersonalNote
+from plm.security import User
+from plm.services.db import (
+    EntityCache,
+    LocalCacheBackend,
+    SessionWithUser,
+    configure_entity_cache,
+    get_entity_cache,
+    invalidate_on_commit,
+    load_through_cache,
+    register_cache_invalidation,
+    task_cache_key,
+    personal_note_cache_key,
+    entity_cache_key,
+)
+from plm.settings import PlmSettings
+
+register_cache_invalidation()
+
+
+def get_settings(**kwargs):
+    return PlmSettings(
+        db_username="user",
+        db_name="name",
+        local_db_host="host",
+        local_db_port=5432,
+        smtp_server="server",
+        smtp_port=25,
+        plm_email_address="test@localhost.dev",
+        plm_email_password="email-password",
+        **kwargs,
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = LocalCacheBackend(max_size=100, ttl=30)
+    monkeypatch.setattr(cache_module, "_entity_cache", EntityCache(backend))
+    return backend
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(
+        engine, tables=[Task.__table__, PersonalNote.__table__]
+    )
+
+    with SessionWithUser(engine) as db:
+        db.add(
+            Task(
+                name="Task 1",
+                status="To Do",
+                type="Work",
+                user_id="user-1",
+                correspondence_email_address="user@email.com",
+            )
+        )
+        db.commit()
+
+    return engine
+
+
+def make_session(engine):
+    db = SessionWithUser(engine)
+    db.set_user(User(id="user-1", email="user@email.com", permissions=[]))
+    return db
+
+
+def load_task(db, load=None):
+    return load_through_cache(
+        db,
+        Task,
+        task_cache_key("user-1", 1),
+        load or (lambda: db.exec(select(Task).where(Task.id == 1)).one_or_none()),
+    )
+
+
+def requests(result):
+    return (
+        REGISTRY.get_sample_value(
+            "plm_entity_cache_requests_total", {"entity": "task", "result": result}
+        )
+        or 0
+    )
+
+
+def test_cache_keys():
+    assert task_cache_key("auth0|1", 2) == "task:2:auth0|1"
+    assert personal_note_cache_key("auth0|1", 2, 3) == "personal_note:2:3:auth0|1"
+    assert entity_cache_key(Task(id=2, user_id="u")) == "task:2:u"
+    assert entity_cache_key(PersonalNote(id=3, task_id=2, user_id="u")) == (
+        "personal_note:2:3:u"
+    )
+    assert entity_cache_key(object()) is None
+
+
+def test_local_backend_expires_entries():
+    clock = FakeClock()
+    backend = LocalCacheBackend(max_size=10, ttl=30, clock=clock)
+    backend.set("a", {"id": 1})
+
+    clock.now = 29
+    assert backend.get("a") == {"id": 1}
+
+    clock.now = 30
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_local_backend_evicts_least_recently_used():
+    backend = LocalCacheBackend(max_size=2, ttl=30)
+    backend.set("a", {"id": 1})
+    backend.set("b", {"id": 2})
+    backend.get("a")
+
+    backend.set("c", {"id": 3})
+
+    assert backend.get("a") == {"id": 1}
+    assert backend.get("b") is None
+    assert backend.get("c") == {"id": 3}
+
+
+def test_local_backend_fills_reserved_keys():
+    backend = LocalCacheBackend(max_size=10, ttl=30)
+
+    token = backend.reserve("a")
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+    backend.fill("a", token, {"id": 1})
+    assert backend.get("a") == {"id": 1}
+
+    backend.fill("a", token, {"id": 2})
+    assert backend.get("a") == {"id": 1}
+
+
+def test_local_backend_does_not_fill_invalidated_keys():
+    backend = LocalCacheBackend(max_size=10, ttl=30)
+
+    token = backend.reserve("a")
+    backend.delete(["a"])
+    backend.fill("a", token, {"id": 1})
+    assert backend.get("a") is None
+
+    token = backend.reserve("b")
+    newer_token = backend.reserve("b")
+    backend.fill("b", token, {"id": 1})
+    assert backend.get("b") is None
+
+    backend.fill("b", newer_token, {"id": 2})
+    assert backend.get("b") == {"id": 2}
+
+
+def test_load_through_cache_without_cache(monkeypatch):
+    monkeypatch.setattr(cache_module, "_entity_cache", None)
+    load = MagicMock(return_value="task")
+
+    assert load_through_cache(MagicMock(), Task, "task:1:u", load) == "task"
+    assert load_through_cache(MagicMock(), Task, "task:1:u", load) == "task"
+    assert load.call_count == 2
+
+
+def test_hits_are_attached_to_the_session(backend, engine):
+    hits, misses = requests("hit"), requests("miss")
+
+    with make_session(engine) as db:
+        assert load_task(db).name == "Task 1"
+
+    with make_session(engine) as db:
+        task = load_task(db, load=MagicMock(side_effect=AssertionError))
+
+        assert task.name == "Task 1"
+        assert task in db
+        assert not db.dirty
+
+    assert requests("miss") == misses + 1
+    assert requests("hit") == hits + 1
+
+
+def test_missing_entities_are_not_cached(backend, engine):
+    with make_session(engine) as db:
+        assert load_task(db, load=lambda: None) is None
+
+    assert len(backend) == 0
+
+
+def test_updates_invalidate_on_commit(backend, engine):
+    with make_session(engine) as db:
+        task = load_task(db)
+        task.name = "Task 2"
+        db.add(task)
+        db.flush()
+
+        # Still there until the transaction commits.
+        assert len(backend) == 1
+
+        db.commit()
+
+    assert len(backend) == 0
+
+    with make_session(engine) as db:
+        assert load_task(db).name == "Task 2"
+
+
+def test_deleting_a_cached_entity(backend, engine):
+    with make_session(engine) as db:
+        load_task(db)
+
+    with make_session(engine) as db:
+        db.delete(load_task(db))
+        db.commit()
+
+    assert len(backend) == 0
+
+    with make_session(engine) as db:
+        assert load_task(db) is None
+
+
+def test_entities_changed_in_the_transaction_are_not_cached(backend, engine):
+    with make_session(engine) as db:
+        invalidate_on_commit(db, [task_cache_key("user-1", 1)])
+
+        load_task(db)
+        assert len(backend) == 0
+
+        db.rollback()
+
+    with make_session(engine) as db:
+        load_task(db)
+
+    assert len(backend) == 1
+
+
+def test_entities_invalidated_while_loading_are_not_cached(backend, engine):
+    with make_session(engine) as db:
+
+        def load():
+            task = db.exec(select(Task).where(Task.id == 1)).one()
+
+            # Another request updating the task commits before this one is done.
+            with make_session(engine) as other_db:
+                other_task = other_db.get(Task, 1)
+                other_task.name = "Task 2"
+                other_db.add(other_task)
+                other_db.commit()
+
+            return task
+
+        assert load_task(db, load=load).name == "Task 1"
+
+    assert len(backend) == 0
+
+    with make_session(engine) as db:
+        assert load_task(db).name == "Task 2"
+
+
+def test_backend_errors_are_misses(monkeypatch, engine):
+    backend = MagicMock()
+    backend.get.side_effect = ConnectionError()
+    backend.reserve.side_effect = ConnectionError()
+    monkeypatch.setattr(cache_module, "_entity_cache", EntityCache(backend))
+
+    with make_session(engine) as db:
+        assert load_task(db).name == "Task 1"
+
+
+def test_configure_entity_cache(monkeypatch):
+    monkeypatch.setattr(cache_module, "_entity_cache", None)
+
+    cache = configure_entity_cache(
+        get_settings(entity_cache_enabled=True, entity_cache_max_size=5)
+    )
+
+    assert get_entity_cache() is cache
+    assert isinstance(cache.backend, LocalCacheBackend)
+
+    assert configure_entity_cache(get_settings()) is None
+    assert get_entity_cache() is None
@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from plm.services.db.conflicts import (
+    get_violated_constraint,
+    unique_violation_as_validation_error,
+)
+from tests.db_helpers import async_unique_violation, unique_violation
+
+
+def test_get_violated_constraint():
+    assert get_violated_constraint(unique_violation("a_key")) == "a_key"
+    assert get_violated_constraint(IntegrityError("statement", {}, None)) is None
+
+
+def test_get_violated_constraint_through_asyncpg():
+    assert get_violated_constraint(async_unique_violation("a_key")) == "a_key"
+
+
+def test_unique_violation_is_translated():
+    db = MagicMock()
+
+    with pytest.raises(HTTPException) as excinfo:
+        with unique_violation_as_validation_error(db, "a_key", "Already exists."):
+            raise unique_violation("a_key")
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == [{"message": "Already exists."}]
+    db.rollback.assert_called_once_with()
+
+
+def test_other_violations_are_raised():
+    db = MagicMock()
+
+    with pytest.raises(IntegrityError):
+        with unique_violation_as_validation_error(db, "a_key", "Already exists."):
+            raise unique_violation("other_key")
+
+    db.rollback.assert_not_called()
+
+
+def test_no_violation():
+    db = MagicMock()
+
+    with unique_violation_as_validation_error(db, "a_key", "Already exists."):
+        pass
+
+    db.rollback.assert_not_called()
@@ -0,0 +1,142 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from plm.services.db.credentials import (
+    StaticCredentialProvider,
+    FileCredentialProvider,
+    CachedCredentialProvider,
+    get_credential_provider,
+)
+from plm.settings import PlmSettings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def get_settings(**kwargs):
+    return PlmSettings(
+        db_username="db_username",
+        db_name="db_name",
+        local_db_host="local_db_host",
+        local_db_port=544,
+        smtp_server="smtp_server",
+        smtp_port=211,
+        plm_email_address="plm_email_address",
+        plm_email_password="plm_email_password",
+        **kwargs,
+    )
+
+
+def test_static_credential_provider():
+    assert StaticCredentialProvider("secret").get_password() == "secret"
+
+
+def test_file_credential_provider(tmp_path):
+    password_file = tmp_path / "token"
+    password_file.write_text("token-1\n")
+    provider = FileCredentialProvider(str(password_file))
+
+    assert provider.get_password() == "token-1"
+
+    password_file.write_text("token-2\n")
+
+    assert provider.get_password() == "token-2"
+
+
+def test_cached_provider_resolves_once_within_ttl():
+    provider = MagicMock()
+    provider.get_password.return_value = "secret"
+    clock = FakeClock()
+    cached = CachedCredentialProvider(provider, 300, 60, clock=clock)
+
+    for _ in range(100):
+        assert cached.get_password() == "secret"
+    clock.now = 239
+    assert cached.get_password() == "secret"
+
+    provider.get_password.assert_called_once_with()
+
+
+@patch("plm.services.db.credentials.threading.Thread")
+def test_cached_provider_refreshes_ahead_in_background(mock_thread):
+    provider = MagicMock()
+    provider.get_password.side_effect = ["old", "new"]
+    clock = FakeClock()
+    cached = CachedCredentialProvider(provider, 300, 60, clock=clock)
+    cached.get_password()
+
+    clock.now = 250
+
+    # The cached value is served while the refresh is started, only once.
+    assert cached.get_password() == "old"
+    assert cached.get_password() == "old"
+    mock_thread.assert_called_once()
+    mock_thread.return_value.start.assert_called_once_with()
+
+    # Run the background refresh the thread would have run.
+    mock_thread.call_args[1]["target"]()
+
+    assert cached.get_password() == "new"
+    assert provider.get_password.call_count == 2
+
+
+@patch("plm.services.db.credentials.threading.Thread")
+def test_cached_provider_keeps_value_when_background_refresh_fails(mock_thread):
+    provider = MagicMock()
+    provider.get_password.side_effect = ["old", Exception("POP"), "new"]
+    clock = FakeClock()
+    cached = CachedCredentialProvider(provider, 300, 60, clock=clock)
+    cached.get_password()
+    clock.now = 250
+
+    assert cached.get_password() == "old"
+    mock_thread.call_args[1]["target"]()
+
+    assert cached.get_password() == "old"
+
+    clock.now = 300
+
+    assert cached.get_password() == "new"
+
+
+def test_cached_provider_refreshes_synchronously_once_expired():
+    provider = MagicMock()
+    provider.get_password.side_effect = ["old", "new"]
+    clock = FakeClock()
+    cached = CachedCredentialProvider(provider, 300, 60, clock=clock)
+    cached.get_password()
+
+    clock.now = 301
+
+    assert cached.get_password() == "new"
+
+
+def test_get_credential_provider_from_password():
+    provider = get_credential_provider(get_settings(db_password="secret"))
+
+    assert isinstance(provider, StaticCredentialProvider)
+    assert provider.get_password() == "secret"
+
+
+def test_get_credential_provider_from_file(tmp_path):
+    password_file = tmp_path / "token"
+    password_file.write_text("token")
+
+    provider = get_credential_provider(
+        get_settings(
+            db_password_file=str(password_file),
+            db_credential_ttl=30,
+            db_credential_refresh_ahead=5,
+        )
+    )
+
+    assert isinstance(provider, CachedCredentialProvider)
+    assert provider.ttl_seconds == 30
+    assert provider.refresh_ahead_seconds == 5
+    assert provider.get_password() == "token"
@@ -2,7 +2,15 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
-from plm.services.db.engine import get_engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+from plm.services.db.engine import (
+    get_engine,
+    get_async_engine,
+    get_pool_options,
+    get_pool_status,
+    get_ssl_mode,
+)
 from plm.models import Entity
 from plm.settings import PlmSettings
 from plm.services.db.session_with_user import SessionWithUser
@@ -22,6 +30,7 @@ def get_settings(
     smtp_port=None,
     plm_email_address=None,
     plm_email_password=None,
+    **kwargs,
 ):
     return PlmSettings(
         db_username=db_username,
@@ -33,6 +42,7 @@ def get_settings(
         smtp_port=smtp_port,
         plm_email_address=plm_email_address,
         plm_email_password=plm_email_password,
+        **kwargs,
     )
 
 
@@ -219,7 +229,13 @@ def test_get_engine_with_password(mock_event, mock_create_engine):
     assert created_engine == engine
     url = get_url("local_db_host", 544, "db_name", "db_username")
     mock_create_engine.assert_called_once_with(
-        url=url, connect_args={"sslmode": "allow"}
+        url=url,
+        connect_args={"sslmode": "allow"},
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
     )
 
     assert mock_event.listens_for.call_count == 2
@@ -236,3 +252,211 @@ def test_get_engine_with_password(mock_event, mock_create_engine):
     provide_token("", "", "", cparams)
     assert cparams["password"] == "db_password"
     mock_generate_token.assert_not_called()
+
+
+@patch("plm.services.db.engine.create_async_engine")
+@patch("plm.services.db.engine.event")
+def test_get_async_engine_with_password(mock_event, mock_create_async_engine):
+    engine = MagicMock()
+    mock_create_async_engine.return_value = engine
+    settings = get_settings(
+        db_username="db_username",
+        db_name="db_name",
+        local_db_host="local_db_host",
+        local_db_port=544,
+        db_password="db_password",
+        smtp_server="smtp_server",
+        smtp_port=211,
+        plm_email_address="plm_email_address",
+        plm_email_password="plm_email_password",
+    )
+
+    created_engine = get_async_engine(settings)
+
+    assert created_engine == engine
+    url = "postgresql+asyncpg://db_username@local_db_host:544/db_name"
+    mock_create_async_engine.assert_called_once_with(
+        url=url,
+        connect_args={"ssl": "allow"},
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+    )
+
+    assert mock_event.listens_for.call_count == 1
+    assert mock_event.listens_for.call_args_list[0][0][0] == engine.sync_engine
+    assert mock_event.listens_for.call_args_list[0][0][1] == "do_connect"
+    provide_token = mock_event.listens_for().mock_calls[0][1][0]
+
+    cparams = {}
+    provide_token("", "", "", cparams)
+    assert cparams["password"] == "db_password"
+
+
+def test_get_pool_options():
+    settings = get_settings(
+        db_username="db_username",
+        db_name="db_name",
+        local_db_host="local_db_host",
+        local_db_port=544,
+        db_password="db_password",
+        smtp_server="smtp_server",
+        smtp_port=211,
+        plm_email_address="plm_email_address",
+        plm_email_password="plm_email_password",
+        db_pool_size=20,
+        db_max_overflow=5,
+        db_pool_timeout=3,
+        db_pool_recycle=600,
+        db_pool_pre_ping=False,
+    )
+
+    assert get_pool_options(settings) == {
+        "pool_size": 20,
+        "max_overflow": 5,
+        "pool_timeout": 3,
+        "pool_recycle": 600,
+        "pool_pre_ping": False,
+    }
+
+
+def test_get_pool_options_with_external_pooler():
+    settings = get_settings(
+        db_username="db_username",
+        db_name="db_name",
+        local_db_host="local_db_host",
+        local_db_port=544,
+        db_password="db_password",
+        smtp_server="smtp_server",
+        smtp_port=211,
+        plm_email_address="plm_email_address",
+        plm_email_password="plm_email_password",
+        db_use_external_pooler=True,
+        db_pool_size=20,
+    )
+
+    assert get_pool_options(settings) == {"poolclass": NullPool}
+
+
+@patch("plm.services.db.engine.create_async_engine")
+@patch("plm.services.db.engine.event")
+def test_get_async_engine_with_external_pooler(mock_event, mock_create_async_engine):
+    settings = get_settings(
+        db_username="db_username",
+        db_name="db_name",
+        local_db_host="local_db_host",
+        local_db_port=544,
+        db_password="db_password",
+        smtp_server="smtp_server",
+        smtp_port=211,
+        plm_email_address="plm_email_address",
+        plm_email_password="plm_email_password",
+        db_use_external_pooler=True,
+    )
+
+    get_async_engine(settings)
+
+    mock_create_async_engine.assert_called_once_with(
+        url="postgresql+asyncpg://db_username@local_db_host:544/db_name",
+        connect_args={
+            "ssl": "allow",
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+        },
+        poolclass=NullPool,
+    )
+
+
+def test_get_pool_status():
+    engine = MagicMock()
+    engine.pool = QueuePool(creator=MagicMock, pool_size=1, max_overflow=2)
+    first = engine.pool.connect()
+    second = engine.pool.connect()
+    third = engine.pool.connect()
+    third.close()
+
+    assert get_pool_status(engine) == {
+        "pool_class": "QueuePool",
+        "size": 1,
+        "checked_out": 2,
+        "idle": 1,
+        "overflow": 2,
+    }
+
+
+def test_get_pool_status_without_pool():
+    engine = MagicMock()
+    engine.pool = NullPool(creator=MagicMock)
+
+    assert get_pool_status(engine) == {"pool_class": "NullPool"}
+
+
+@patch("plm.services.db.engine.create_engine")
+@patch("plm.services.db.engine.event")
+def test_get_engine_with_credential_provider(mock_event, mock_create_engine):
+    credentials = MagicMock()
+    credentials.get_password.return_value = "rotated-token"
+    settings = get_settings(
+        db_username="db_username",
+        db_name="db_name",
+        local_db_host="local_db_host",
+        local_db_port=544,
+        db_password="",
+        smtp_server="smtp_server",
+        smtp_port=211,
+        plm_email_address="plm_email_address",
+        plm_email_password="plm_email_password",
+    )
+
+    get_engine(settings, credentials)
+
+    assert mock_create_engine.call_args[1]["connect_args"] == {"sslmode": "require"}
+    provide_token = mock_event.listens_for().mock_calls[0][1][0]
+    credentials.get_password.assert_not_called()
+
+    cparams = {}
+    provide_token("", "", "", cparams)
+
+    assert cparams["password"] == "rotated-token"
+
+
+def get_ssl_settings(**kwargs):
+    return get_settings(
+        db_username="db_username",
+        db_name="db_name",
+        local_db_host="local_db_host",
+        local_db_port=544,
+        db_password=kwargs.pop("db_password", ""),
+        smtp_server="smtp_server",
+        smtp_port=211,
+        plm_email_address="plm_email_address",
+        plm_email_password="plm_email_password",
+        **kwargs,
+    )
+
+
+def test_get_ssl_mode():
+    assert get_ssl_mode(get_ssl_settings(db_password="password")) == "allow"
+    assert get_ssl_mode(get_ssl_settings(db_password_file="/run/token")) == "allow"
+    assert get_ssl_mode(get_ssl_settings()) == "require"
+    assert (
+        get_ssl_mode(get_ssl_settings(db_password="password", db_sslmode="verify-full"))
+        == "verify-full"
+    )
+
+
+@patch("plm.services.db.engine.create_async_engine")
+@patch("plm.services.db.engine.event")
+def test_engines_with_password_file_keep_the_ssl_mode(
+    mock_event, mock_create_async_engine
+):
+    settings = get_ssl_settings(db_password_file="/run/token")
+
+    with patch("plm.services.db.engine.create_engine") as mock_create_engine:
+        get_engine(settings, MagicMock())
+    get_async_engine(settings, MagicMock())
+
+    assert mock_create_engine.call_args[1]["connect_args"] == {"sslmode": "allow"}
+    assert mock_create_async_engine.call_args[1]["connect_args"] == {"ssl": "allow"}
@@ -0,0 +1,118 @@
+import logging
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import create_engine
+
+from plm.services.db import (
+    QueryStats,
+    get_query_stats,
+    instrument_engine,
+    query_stats_middleware,
+)
+from plm.services.db.instrumentation import _query_stats, describe_parameters
+
+
+def make_engine(slow_query_threshold_ms=10_000):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, slow_query_threshold_ms)
+    return engine
+
+
+def test_describe_parameters():
+    assert describe_parameters({"user_id": "u", "id": 1}) == "{user_id: str, id: int}"
+    assert describe_parameters({"ids": [1, 2, 3]}) == "{ids: list[int](3)}"
+    assert describe_parameters(("a", None)) == "tuple[NoneType|str](2)"
+    assert describe_parameters([{"a": 1}, {"a": 2}]) == "2 x {a: int}"
+
+
+def test_queries_are_counted_in_the_current_stats():
+    engine = make_engine()
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            conn.execute(text("select 2"))
+    finally:
+        _query_stats.reset(token)
+
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert stats.server_timing().endswith('desc="2 queries"')
+
+
+def test_failed_queries_leave_nothing_on_the_connection():
+    engine = make_engine()
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("select * from missing_table"))
+
+            conn.execute(text("select 1"))
+            info = dict(conn.connection.info)
+    finally:
+        _query_stats.reset(token)
+
+    assert stats.count == 1
+    assert info == {}
+
+
+def test_queries_outside_a_request_are_not_counted():
+    engine = make_engine()
+
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+
+    assert get_query_stats() is None
+
+
+def test_slow_queries_are_logged_without_values(caplog):
+    engine = make_engine(slow_query_threshold_ms=0)
+
+    with caplog.at_level(logging.WARNING):
+        with engine.connect() as conn:
+            conn.execute(text("select :secret"), {"secret": "hunter2"})
+
+    assert "Slow query" in caplog.text
+    assert "select ?" in caplog.text
+    assert "hunter2" not in caplog.text
+    assert "tuple[str](1)" in caplog.text
+
+
+def test_fast_queries_are_not_logged(caplog):
+    engine = make_engine()
+
+    with caplog.at_level(logging.WARNING):
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+
+    assert "Slow query" not in caplog.text
+
+
+def test_middleware_adds_server_timing_header():
+    engine = make_engine()
+    app = FastAPI()
+    app.middleware("http")(query_stats_middleware)
+
+    # A sync endpoint, so the queries run in a worker thread.
+    @app.get("/")
+    def endpoint():
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            conn.execute(text("select 2"))
+            conn.execute(text("select 3"))
+
+    response = TestClient(app).get("/")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="3 queries"')
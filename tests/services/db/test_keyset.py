@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+
+from plm.models import Task
+from plm.schemas import CursorParams
+from plm.services.db.keyset import encode_cursor, decode_cursor, paginate_by_keyset
+
+
+class FakeRow:
+    def __init__(self, id):
+        self.id = id
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90LWpzb24=", "eyJrIjogIjEifQ=="])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == [
+        {"message": "The cursor is not valid.", "properties": ["cursor"]}
+    ]
+
+
+def test_paginate_by_keyset_with_next_page():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [FakeRow(1), FakeRow(2), FakeRow(3)]
+    params = CursorParams(limit=2)
+
+    page = paginate_by_keyset(mock_db, select(Task), Task.id, params)
+
+    assert [item.id for item in page.items] == [1, 2]
+    assert decode_cursor(page.next_cursor) == 2
+    assert page.total is None
+    assert mock_db.exec.call_count == 1
+    expected_query = select(Task).order_by(Task.id).limit(3)
+    assert expected_query.compare(mock_db.exec.call_args_list[0][0][0])
+
+
+def test_paginate_by_keyset_last_page_with_total():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.one.return_value = 5
+    mock_db.exec.return_value.all.return_value = [FakeRow(5)]
+    params = CursorParams(cursor=encode_cursor(4), limit=2, include_total=True)
+
+    page = paginate_by_keyset(mock_db, select(Task), Task.id, params)
+
+    assert [item.id for item in page.items] == [5]
+    assert page.next_cursor is None
+    assert page.total == 5
+    assert mock_db.exec.call_count == 2
+    expected_query = select(Task).where(Task.id > 4).order_by(Task.id).limit(3)
+    assert expected_query.compare(mock_db.exec.call_args_list[1][0][0])
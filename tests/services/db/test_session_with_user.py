@@ -1,6 +1,8 @@
 from unittest.mock import patch
 
-from plm.services.db.session_with_user import SessionWithUser
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from plm.services.db.session_with_user import SessionWithUser, AsyncSessionWithUser
 
 
 @patch("plm.services.db.session_with_user.Session.__init__")
@@ -14,3 +16,23 @@ def test_session_with_user(mock_init):
 
     mock_init.assert_called_once_with(engine, autoflush=False)
     assert returned_user == user
+
+
+def test_session_with_user_accepts_bind_keyword():
+    with patch("plm.services.db.session_with_user.Session.__init__") as mock_init:
+        SessionWithUser(bind="engine", binds=None)
+
+    mock_init.assert_called_once_with("engine", autoflush=False, binds=None)
+
+
+def test_async_session_with_user():
+    engine = create_async_engine("postgresql+asyncpg://user@host:5432/db")
+    user = "user"
+
+    session = AsyncSessionWithUser(engine)
+    session.set_user(user)
+
+    assert isinstance(session.sync_session, SessionWithUser)
+    assert session.sync_session.autoflush is False
+    assert session.sync_session.get_user() == user
+    assert session.get_user() == user
@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import and_, func, tuple_
+
+from plm.models import Task, PersonalNote, Tombstone
+from plm.services.changes import (
+    CHANGES_MAX_LAG,
+    TOMBSTONE_RETENTION,
+    ChangePosition,
+    decode_change_cursor,
+    encode_change_cursor,
+    get_changes,
+    position_since,
+)
+
+now = datetime(2026, 1, 1, 12, 30)
+horizon = now + timedelta(hours=1)
+
+
+def make_task(id, minutes):
+    return Task(
+        id=id,
+        name=f"Task {id}",
+        status="To Do",
+        type="Work",
+        user_id="user-1",
+        correspondence_email_address="user@email.com",
+        created_by="dev",
+        created_on=now,
+        modified_on=now + timedelta(minutes=minutes) if minutes else None,
+    )
+
+
+def make_personal_note(id, minutes):
+    return PersonalNote(
+        id=id,
+        task_id=1,
+        name=f"Note {id}",
+        type="Observations",
+        note="Some text",
+        user_id="user-1",
+        correspondence_email_address="user@email.com",
+        created_by="dev",
+        created_on=now + timedelta(minutes=minutes),
+    )
+
+
+def make_tombstone(id, minutes):
+    return Tombstone(
+        id=id,
+        entity_type="personal_note",
+        entity_id=10 + id,
+        task_id=1,
+        user_id="user-1",
+        deleted_on=now + timedelta(minutes=minutes),
+    )
+
+
+def make_db(tasks, personal_notes, tombstones):
+    db = MagicMock()
+    db.execute.return_value.scalar_one.return_value = horizon
+    db.exec.return_value.all.side_effect = [tasks, personal_notes, tombstones]
+    return db
+
+
+def where(db, call):
+    return db.exec.call_args_list[call][0][0].whereclause
+
+
+def test_cursor_round_trip():
+    position = ChangePosition(now, 1, 42)
+
+    assert decode_change_cursor(encode_change_cursor(position)) == position
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30=", "eyJ0IjogMX0="])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_change_cursor(cursor)
+
+    assert e.value.status_code == 400
+
+
+def test_position_since():
+    assert position_since(None).changed_on == datetime.min
+
+    aware = datetime(2026, 1, 1, 14, 30, tzinfo=timezone(timedelta(hours=2)))
+    assert position_since(aware) == ChangePosition(now, 3, 0)
+
+
+def test_get_changes_merges_kinds_in_order():
+    db = make_db(
+        [make_task(1, 0), make_task(2, 20)],
+        [make_personal_note(3, 10)],
+        [make_tombstone(1, 10)],
+    )
+
+    response = get_changes(db, "user-1", position_since(None), limit=10)
+
+    assert [task.id for task in response.tasks] == [1, 2]
+    assert [note.id for note in response.personal_notes] == [3]
+    assert [(d.type, d.id) for d in response.deleted] == [("personal_note", 11)]
+    assert response.has_more is False
+    # Everything before the horizon has been returned, so the cursor moves up to it.
+    assert decode_change_cursor(response.next_cursor) == ChangePosition(
+        horizon - timedelta(microseconds=1), 3, 0
+    )
+
+
+def test_get_changes_pages():
+    db = make_db(
+        [make_task(1, 0), make_task(2, 20)],
+        [make_personal_note(3, 10)],
+        [make_tombstone(1, 10)],
+    )
+
+    response = get_changes(db, "user-1", position_since(None), limit=2)
+
+    assert [task.id for task in response.tasks] == [1]
+    assert [note.id for note in response.personal_notes] == [3]
+    assert response.deleted == []
+    assert response.has_more is True
+    assert decode_change_cursor(response.next_cursor) == ChangePosition(
+        now + timedelta(minutes=10), 1, 3
+    )
+    # Each kind reads at most one row more than the page.
+    assert all(c[0][0]._limit == 3 for c in db.exec.call_args_list)
+
+
+def test_get_changes_resumes_after_cursor():
+    db = make_db([], [], [])
+    position = ChangePosition(now, 1, 3)
+
+    response = get_changes(db, "user-1", position, limit=10)
+
+    assert response.has_more is False
+    assert decode_change_cursor(response.next_cursor) == ChangePosition(
+        horizon - timedelta(microseconds=1), 3, 0
+    )
+    # Tasks written at the same time come before notes, deletions after them.
+    task_changed_on = func.coalesce(Task.modified_on, Task.created_on)
+    assert where(db, 0).compare(
+        and_(
+            Task.user_id == "user-1",
+            task_changed_on > now,
+            task_changed_on < horizon,
+        )
+    )
+    note_changed_on = func.coalesce(PersonalNote.modified_on, PersonalNote.created_on)
+    assert where(db, 1).compare(
+        and_(
+            PersonalNote.user_id == "user-1",
+            tuple_(note_changed_on, PersonalNote.id) > tuple_(now, 3),
+            note_changed_on < horizon,
+        )
+    )
+    assert where(db, 2).compare(
+        and_(
+            Tombstone.user_id == "user-1",
+            Tombstone.deleted_on >= now,
+            Tombstone.deleted_on < horizon,
+        )
+    )
+
+
+def test_get_changes_horizon_ignores_exports_and_is_capped():
+    db = make_db([], [], [])
+
+    get_changes(db, "user-1", position_since(None), limit=10)
+
+    horizon_query = db.execute.call_args[0][0]
+    assert "application_name is distinct from :export_application_name" in str(
+        horizon_query
+    )
+    params = horizon_query.compile().params
+    assert params["export_application_name"] == "plm_export"
+    assert params["max_lag"] == CHANGES_MAX_LAG.total_seconds()
+
+
+def test_get_changes_rejects_positions_older_than_the_tombstones():
+    db = make_db([], [], [])
+    position = ChangePosition(
+        horizon - TOMBSTONE_RETENTION - timedelta(seconds=1), 0, 1
+    )
+
+    with pytest.raises(HTTPException) as e:
+        get_changes(db, "user-1", position, limit=10)
+
+    assert e.value.status_code == 400
+    db.exec.assert_not_called()
+
+
+def test_get_changes_of_idle_data_can_be_resumed():
+    last_written_on = horizon - timedelta(days=40)
+    task = make_task(1, 0)
+    task.created_on = last_written_on
+
+    response = get_changes(
+        make_db([task], [], []), "user-1", position_since(None), limit=10
+    )
+    assert [task.id for task in response.tasks] == [1]
+
+    db = make_db([], [], [])
+    position = decode_change_cursor(response.next_cursor)
+    response = get_changes(db, "user-1", position, limit=10)
+
+    assert response.tasks == []
+    # The changes made at the horizon of the previous sync are not skipped.
+    assert where(db, 2).compare(
+        and_(
+            Tombstone.user_id == "user-1",
+            Tombstone.deleted_on > horizon - timedelta(microseconds=1),
+            Tombstone.deleted_on < horizon,
+        )
+    )
+
+
+def test_get_changes_cursor_does_not_move_back():
+    position = ChangePosition(horizon + timedelta(minutes=1), 0, 1)
+
+    response = get_changes(make_db([], [], []), "user-1", position, limit=10)
+
+    assert decode_change_cursor(response.next_cursor) == position
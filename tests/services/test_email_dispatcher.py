@@ -0,0 +1,255 @@
+import smtplib
+from datetime import datetime
+from email import message_from_bytes, policy
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from plm.enums import EmailJobStatus
+from plm.models import EmailJob
+from plm.services.email_dispatcher import EmailDispatcher
+from plm.services.email_rendering import (
+    PersonalNoteEmailData,
+    TaskEmailData,
+    render_task_email,
+)
+
+
+class FakePool:
+    def __init__(self, smtp=None, connect_error=None):
+        self.smtp = smtp or MagicMock()
+        self.connect_error = connect_error
+        self.borrowed = 0
+
+    @contextmanager
+    def connection(self):
+        if self.connect_error:
+            raise self.connect_error
+        self.borrowed += 1
+        yield self.smtp
+
+
+def get_job(id, attempts=0, message=None):
+    return EmailJob(
+        id=id,
+        task_id=1,
+        user_id="user-1",
+        status=EmailJobStatus.Pending,
+        to_address=f"user{id}@email.com",
+        message=message or f"Subject: {id}\n\nBody {id}\n",
+        attempts=attempts,
+    )
+
+
+class RecordingSmtp(smtplib.SMTP):
+    """
+    Goes through send_message of smtplib, without a server.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sender_email_address = "plm@localhost.dev"
+        self.sent = []
+
+    def ehlo_or_helo_if_needed(self):
+        pass
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.sent.append((from_addr, to_addrs, msg))
+        return {}
+
+
+def run_jobs(dispatcher, jobs):
+    """
+    Runs the dispatcher once over the jobs, returning the session it used, and the
+    status of each job at each commit.
+    """
+    with patch("plm.services.email_dispatcher.Session") as mock_session:
+        db = mock_session.return_value.__enter__.return_value
+        db.exec.return_value.first.side_effect = [*jobs, None]
+        commits = []
+        db.commit.side_effect = lambda: commits.append(
+            [(job.status, job.attempts) for job in jobs]
+        )
+
+        processed = dispatcher.run_once()
+
+    return processed, db, commits
+
+
+def test_run_once_reuses_one_connection():
+    pool = FakePool()
+    jobs = [get_job(1), get_job(2)]
+
+    processed, db, _ = run_jobs(EmailDispatcher("engine", pool), jobs)
+
+    assert processed == 2
+    assert pool.borrowed == 1
+    assert pool.smtp.send_message.call_count == 2
+    message = pool.smtp.send_message.call_args[0][0]
+    assert message["Subject"] == "2"
+    assert pool.smtp.send_message.call_args[1] == {
+        "from_addr": pool.smtp.sender_email_address,
+        "to_addrs": "user2@email.com",
+    }
+    for job in jobs:
+        assert job.status == EmailJobStatus.Sent
+        assert job.attempts == 1
+        assert job.modified_by == "email-dispatcher"
+
+
+def test_run_once_claims_and_commits_each_job():
+    jobs = [get_job(1), get_job(2)]
+
+    _, db, commits = run_jobs(EmailDispatcher("engine", FakePool()), jobs)
+
+    query = db.exec.call_args[0][0]
+    assert query._for_update_arg.skip_locked
+    assert query._limit == 1
+    assert commits == [
+        [(EmailJobStatus.Sent, 1), (EmailJobStatus.Pending, 0)],
+        [(EmailJobStatus.Sent, 1), (EmailJobStatus.Sent, 1)],
+    ]
+
+
+def test_run_once_stops_at_batch_size():
+    jobs = [get_job(1), get_job(2), get_job(3)]
+
+    processed, _, _ = run_jobs(
+        EmailDispatcher("engine", FakePool(), batch_size=2), jobs
+    )
+
+    assert processed == 2
+    assert jobs[2].status == EmailJobStatus.Pending
+
+
+def test_run_once_sends_non_ascii_messages():
+    smtp = RecordingSmtp()
+    message = render_task_email(
+        TaskEmailData(
+            "Tâche 1",
+            "user@email.com",
+            [PersonalNoteEmailData("Note 1", "Reminder", "Café à 5 €")],
+        )
+    )
+    # Queued as plain text, before messages were rendered as MIME.
+    legacy = "Subject: PLM Reminder: Tâche 2\n\nPersonal Notes:\nCafé\n"
+    jobs = [get_job(1, message=message.as_string()), get_job(2, message=legacy)]
+
+    run_jobs(EmailDispatcher("engine", FakePool(smtp)), jobs)
+
+    assert [job.status for job in jobs] == [EmailJobStatus.Sent] * 2
+    assert all(isinstance(sent, bytes) for _, _, sent in smtp.sent)
+    from_addr, to_addrs, sent = smtp.sent[0]
+    assert (from_addr, to_addrs) == ("plm@localhost.dev", "user1@email.com")
+    received = message_from_bytes(sent, policy=policy.default)
+    assert received["Subject"] == "PLM Reminder: Tâche 1"
+    assert "Café à 5 €" in received.get_content()
+
+
+def test_run_once_fails_only_the_job_that_cannot_be_sent():
+    pool = FakePool()
+    pool.smtp.send_message.side_effect = [
+        {},
+        UnicodeEncodeError("ascii", "é", 0, 1, "ordinal not in range(128)"),
+        {},
+    ]
+    jobs = [get_job(1), get_job(2), get_job(3)]
+
+    processed, _, commits = run_jobs(EmailDispatcher("engine", pool), jobs)
+
+    assert processed == 3
+    assert commits[0][0] == (EmailJobStatus.Sent, 1)
+    assert [job.status for job in jobs] == [
+        EmailJobStatus.Sent,
+        EmailJobStatus.Pending,
+        EmailJobStatus.Sent,
+    ]
+    assert "ordinal not in range" in jobs[1].last_error
+    assert jobs[1].next_attempt_on is not None
+
+
+def test_run_once_retries_refused_message():
+    pool = FakePool()
+    pool.smtp.send_message.side_effect = [
+        smtplib.SMTPRecipientsRefused({"user1@email.com": (550, b"No such user")}),
+        {},
+    ]
+    jobs = [get_job(1), get_job(2)]
+
+    run_jobs(EmailDispatcher("engine", pool), jobs)
+
+    assert jobs[0].status == EmailJobStatus.Pending
+    assert jobs[0].attempts == 1
+    assert "No such user" in jobs[0].last_error
+    assert jobs[0].next_attempt_on is not None
+    assert jobs[1].status == EmailJobStatus.Sent
+
+
+def test_run_once_when_connection_breaks():
+    pool = FakePool()
+    pool.smtp.send_message.side_effect = [{}, smtplib.SMTPServerDisconnected("Gone")]
+    jobs = [get_job(1), get_job(2), get_job(3)]
+
+    processed, _, commits = run_jobs(EmailDispatcher("engine", pool), jobs)
+
+    assert processed == 2
+    assert jobs[0].status == EmailJobStatus.Sent
+    assert (jobs[1].status, jobs[1].last_error) == (EmailJobStatus.Pending, "Gone")
+    # Not claimed, so left for the next run.
+    assert jobs[2].attempts == 0
+    assert len(commits) == 2
+
+
+def test_run_once_when_server_is_down():
+    pool = FakePool(connect_error=ConnectionRefusedError("Refused"))
+    jobs = [get_job(1)]
+
+    run_jobs(EmailDispatcher("engine", pool), jobs)
+
+    assert jobs[0].status == EmailJobStatus.Pending
+    assert jobs[0].attempts == 1
+
+
+@patch("plm.services.email_dispatcher.funcs.now")
+def test_retries_back_off_exponentially(mock_now):
+    mock_now.return_value = datetime(2026, 1, 1)
+    pool = FakePool()
+    pool.smtp.send_message.side_effect = smtplib.SMTPDataError(451, b"Try later")
+    job = get_job(1, attempts=2)
+
+    run_jobs(EmailDispatcher("engine", pool, retry_backoff=30), [job])
+
+    assert job.attempts == 3
+    assert job.next_attempt_on == datetime(2026, 1, 1, 0, 2)
+
+
+def test_job_fails_after_max_attempts():
+    pool = FakePool()
+    pool.smtp.send_message.side_effect = smtplib.SMTPDataError(554, b"Rejected")
+    job = get_job(1, attempts=4)
+
+    run_jobs(EmailDispatcher("engine", pool, max_attempts=5), [job])
+
+    assert job.status == EmailJobStatus.Failed
+    assert job.attempts == 5
+
+
+def test_run_once_without_jobs():
+    pool = FakePool()
+
+    processed, db, _ = run_jobs(EmailDispatcher("engine", pool), [])
+
+    assert processed == 0
+    assert pool.borrowed == 0
+    db.commit.assert_not_called()
+
+
+def test_start_and_stop():
+    dispatcher = EmailDispatcher(None, FakePool(), poll_interval=60)
+    dispatcher.run_once = MagicMock(return_value=0)
+
+    dispatcher.start()
+    dispatcher.stop(timeout=5)
+
+    assert not dispatcher._thread.is_alive()
+    dispatcher.run_once.assert_called_once_with()
@@ -0,0 +1,128 @@
+from email import message_from_string, policy
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlmodel import select, and_
+
+from plm.models import Task, PersonalNote
+from plm.services.email_rendering import (
+    PersonalNoteEmailData,
+    TaskEmailData,
+    load_task_email_data,
+    render_task_email,
+)
+
+
+def make_row(note_name=None, note_type=None, note=None):
+    return SimpleNamespace(
+        name="Task 1",
+        correspondence_email_address="user@email.com",
+        note_name=note_name,
+        note_type=note_type,
+        note=note,
+    )
+
+
+def test_load_task_email_data_uses_a_single_query():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [
+        make_row("Note 1", "Progress Report", "First"),
+        make_row("Note 2", "Reminder", "Second"),
+    ]
+
+    task = load_task_email_data(mock_db, "user-1", 1)
+
+    assert task == TaskEmailData(
+        "Task 1",
+        "user@email.com",
+        [
+            PersonalNoteEmailData("Note 1", "Progress Report", "First"),
+            PersonalNoteEmailData("Note 2", "Reminder", "Second"),
+        ],
+    )
+    mock_db.exec.assert_called_once()
+    expected_query = (
+        select(
+            Task.name,
+            Task.correspondence_email_address,
+            PersonalNote.name.label("note_name"),
+            PersonalNote.type.label("note_type"),
+            PersonalNote.note,
+        )
+        .select_from(Task)
+        .outerjoin(
+            PersonalNote,
+            and_(PersonalNote.task_id == Task.id, PersonalNote.user_id == "user-1"),
+        )
+        .where(and_(Task.user_id == "user-1", Task.id == 1))
+        .order_by(PersonalNote.id)
+    )
+    assert expected_query.compare(mock_db.exec.call_args[0][0])
+
+
+def test_load_task_email_data_without_personal_notes():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = [make_row()]
+
+    task = load_task_email_data(mock_db, "user-1", 1)
+
+    assert task == TaskEmailData("Task 1", "user@email.com", [])
+
+
+def test_load_task_email_data_task_not_found():
+    mock_db = MagicMock()
+    mock_db.exec.return_value.all.return_value = []
+
+    assert load_task_email_data(mock_db, "user-1", 1) is None
+
+
+def test_render_task_email():
+    task = TaskEmailData(
+        "Task 1",
+        "user@email.com",
+        [
+            PersonalNoteEmailData("Note 1", "Progress Report", "Costs $5"),
+            PersonalNoteEmailData("Note 2", "Reminder", "Second"),
+        ],
+    )
+
+    message = render_task_email(task)
+
+    assert message["Subject"] == "PLM Reminder: Task 1"
+    assert message["To"] == "user@email.com"
+    assert message.get_content_type() == "text/plain"
+    assert message.get_content_charset() == "utf-8"
+    assert message.get_content() == (
+        "Personal Notes:\n"
+        "\nPersonal Note Name: Note 1\n"
+        "Personal Note Type: Progress Report\n"
+        "Personal Note Description: Costs $5\n"
+        "\nPersonal Note Name: Note 2\n"
+        "Personal Note Type: Reminder\n"
+        "Personal Note Description: Second\n"
+    )
+
+
+def test_render_task_email_with_non_ascii_text():
+    task = TaskEmailData(
+        "Tâche 1",
+        "user@email.com",
+        [PersonalNoteEmailData("Note 1", "Reminder", "Café à 5 €")],
+    )
+
+    message = render_task_email(task)
+    serialized = message.as_string()
+
+    assert serialized.isascii()
+    parsed = message_from_string(serialized, policy=policy.default)
+    assert parsed["Subject"] == "PLM Reminder: Tâche 1"
+    assert "Personal Note Description: Café à 5 €\n" in parsed.get_content()
+
+
+def test_render_task_email_does_not_inject_headers():
+    task = TaskEmailData("Task 1\r\nBcc: someone@else.com", "user@email.com", [])
+
+    message = render_task_email(task)
+
+    assert message["Subject"] == "PLM Reminder: Task 1 Bcc: someone@else.com"
+    assert message["Bcc"] is None
@@ -1,7 +1,9 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from plm.services.email_service import EmailSenderClient
+from plm.services.email_service import EmailSenderClient, connect_email_client
+from plm.settings import PlmSettings
 import smtplib
+from prometheus_client import REGISTRY
 
 
 @patch.object(smtplib.SMTP, "connect")
@@ -26,3 +28,83 @@ def test_email_setter_and_getter(mock_connect):
     client.set_sender_email_address(test_email)
 
     assert client.get_sender_email_address() == test_email
+
+
+@patch("plm.services.email_service.EmailSenderClient")
+def test_connect_email_client(mock_email_client):
+    settings = PlmSettings(
+        db_username="user",
+        db_name="name",
+        local_db_host="host",
+        local_db_port=513,
+        smtp_server="server",
+        smtp_port=123,
+        plm_email_address="test@localhost.dev",
+        plm_email_password="email-password",
+    )
+
+    client = connect_email_client(settings)
+
+    assert client == mock_email_client.return_value
+    mock_email_client.assert_called_once_with("server", 123)
+    client.starttls.assert_called_once_with()
+    client.login.assert_called_once_with("test@localhost.dev", "email-password")
+    client.set_sender_email_address.assert_called_once_with("test@localhost.dev")
+
+
+@patch("plm.services.email_service.EmailSenderClient")
+def test_connect_email_client_closes_on_failed_login(mock_email_client):
+    settings = PlmSettings(
+        db_username="user",
+        db_name="name",
+        local_db_host="host",
+        local_db_port=513,
+        smtp_server="server",
+        smtp_port=123,
+        smtp_use_starttls=False,
+        plm_email_address="test@localhost.dev",
+        plm_email_password="wrong",
+    )
+    mock_email_client.return_value.login.side_effect = smtplib.SMTPAuthenticationError(
+        535, b"Nope"
+    )
+
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        connect_email_client(settings)
+
+    mock_email_client.return_value.starttls.assert_not_called()
+    mock_email_client.return_value.close.assert_called_once_with()
+
+
+def _sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0
+
+
+@patch.object(smtplib.SMTP, "sendmail")
+@patch.object(smtplib.SMTP, "connect")
+def test_sendmail_records_duration(mock_connect, mock_sendmail):
+    mock_connect.return_value = (220, b"SMTP Mock")
+    client = EmailSenderClient("mock.smtp.com", 25)
+    before = _sample("plm_smtp_send_duration_seconds_count")
+
+    client.sendmail("from@localhost", ["to@localhost"], "Message")
+
+    mock_sendmail.assert_called_once_with(
+        "from@localhost", ["to@localhost"], "Message", (), ()
+    )
+    assert _sample("plm_smtp_send_duration_seconds_count") == before + 1
+
+
+@patch.object(smtplib.SMTP, "sendmail")
+@patch.object(smtplib.SMTP, "connect")
+def test_sendmail_counts_failures(mock_connect, mock_sendmail):
+    mock_connect.return_value = (220, b"SMTP Mock")
+    mock_sendmail.side_effect = smtplib.SMTPServerDisconnected()
+    client = EmailSenderClient("mock.smtp.com", 25)
+    labels = {"error": "SMTPServerDisconnected"}
+    before = _sample("plm_smtp_send_failures_total", labels)
+
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        client.sendmail("from@localhost", ["to@localhost"], "Message")
+
+    assert _sample("plm_smtp_send_failures_total", labels) == before + 1
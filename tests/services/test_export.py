@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from plm.services.export import (
+    EXPORT_BATCH_SIZE,
+    iter_task_exports,
+    to_csv,
+    to_ndjson,
+)
+
+now = datetime(2026, 1, 1, 12, 30)
+
+
+def make_row(task_id, note_id=None):
+    task = {
+        "id": task_id,
+        "name": f"Task {task_id}",
+        "status": "To Do",
+        "type": "Work",
+        "correspondence_email_address": "user@email.com",
+        "created_by": "dev",
+        "created_on": now,
+        "modified_by": None,
+        "modified_on": None,
+    }
+    note = {
+        "note_id": note_id,
+        "note_name": note_id and f"Note {note_id}",
+        "note_type": note_id and "Observations",
+        "note_note": note_id and "Some, text",
+        "note_correspondence_email_address": note_id and "user@email.com",
+        "note_created_by": note_id and "dev",
+        "note_created_on": note_id and now,
+        "note_modified_by": None,
+        "note_modified_on": None,
+    }
+    return SimpleNamespace(**task, **note)
+
+
+def make_db(rows):
+    mock_db = MagicMock()
+    mock_db.exec.return_value = iter(rows)
+    return mock_db
+
+
+def test_iter_task_exports_groups_notes_by_task():
+    mock_db = make_db([make_row(1, 10), make_row(1, 11), make_row(2), make_row(3, 12)])
+
+    task_exports = list(iter_task_exports(mock_db, "user-1"))
+
+    assert [task.id for task in task_exports] == [1, 2, 3]
+    assert [note.id for note in task_exports[0].personal_notes] == [10, 11]
+    assert task_exports[1].personal_notes == []
+    assert task_exports[2].personal_notes[0].name == "Note 12"
+    # Tagged, so the changes feed does not wait for the export to finish.
+    assert mock_db.execute.call_args[0][1] == {"name": "plm_export"}
+
+
+def test_iter_task_exports_streams_the_query():
+    mock_db = make_db([])
+
+    assert list(iter_task_exports(mock_db, "user-1")) == []
+
+    query = mock_db.exec.call_args[0][0]
+    assert query.get_execution_options()["stream_results"] is True
+    assert query.get_execution_options()["yield_per"] == EXPORT_BATCH_SIZE
+    sql = str(query)
+    assert "LEFT OUTER JOIN personal_note" in sql
+    assert "ORDER BY task.id, personal_note.id" in sql
+    # Only the columns of the response shapes are read.
+    assert "task.user_id" not in sql.split("FROM")[0]
+
+
+def test_to_ndjson_uses_the_response_shapes():
+    task_exports = iter_task_exports(make_db([make_row(1, 10), make_row(2)]), "user-1")
+
+    lines = list(to_ndjson(task_exports))
+
+    assert len(lines) == 2
+    assert all(line.endswith("\n") for line in lines)
+    first = json.loads(lines[0])
+    assert first["correspondenceEmailAddress"] == "user@email.com"
+    assert first["createdOn"] == now.isoformat()
+    assert "modifiedOn" not in first
+    assert first["personalNotes"][0]["note"] == "Some, text"
+    assert json.loads(lines[1])["personalNotes"] == []
+
+
+def test_to_csv_writes_a_line_per_note():
+    task_exports = iter_task_exports(
+        make_db([make_row(1, 10), make_row(1, 11), make_row(2)]), "user-1"
+    )
+
+    rows = list(csv.DictReader(io.StringIO("".join(to_csv(task_exports)))))
+
+    assert [(row["id"], row["personalNoteId"]) for row in rows] == [
+        ("1", "10"),
+        ("1", "11"),
+        ("2", ""),
+    ]
+    assert rows[0]["personalNoteNote"] == "Some, text"
+    assert rows[0]["createdOn"] == now.isoformat()
+    assert rows[0]["modifiedOn"] == ""
+
+
+def test_to_csv_without_tasks_writes_the_header():
+    assert "".join(to_csv([])).startswith("id,name,status,type,")
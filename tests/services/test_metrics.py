@@ -0,0 +1,89 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool, QueuePool
+
+from plm.endpoints.v1.metrics import router
+from plm.services.metrics import instrument_pool, metrics_middleware, observe_query
+
+app = FastAPI()
+app.middleware("http")(metrics_middleware)
+app.include_router(router)
+
+
+@app.get("/items/{itemId}")
+def get_item(itemId: int):
+    return {"id": itemId}
+
+
+client = TestClient(app)
+
+
+def _sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0
+
+
+def test_requests_are_labelled_with_the_route_template():
+    labels = {"method": "GET", "route": "/items/{itemId}", "status": "200"}
+    before = _sample("plm_http_request_duration_seconds_count", labels)
+
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert _sample("plm_http_request_duration_seconds_count", labels) == before + 2
+
+
+def test_unmatched_requests_share_a_label():
+    labels = {"method": "GET", "route": "<unmatched>", "status": "404"}
+    before = _sample("plm_http_request_duration_seconds_count", labels)
+
+    client.get("/missing/1")
+    client.get("/missing/2")
+
+    assert _sample("plm_http_request_duration_seconds_count", labels) == before + 2
+
+
+def test_observe_query():
+    queries = _sample("plm_db_queries_total")
+    duration = _sample("plm_db_query_duration_seconds_total")
+
+    observe_query(0.25)
+
+    assert _sample("plm_db_queries_total") == queries + 1
+    assert _sample("plm_db_query_duration_seconds_total") == duration + 0.25
+
+
+def test_instrument_pool(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'metrics.db'}", poolclass=QueuePool, pool_size=3
+    )
+    instrument_pool(engine, "test")
+    labels = {"pool": "test"}
+
+    assert _sample("plm_db_pool_size", labels) == 3
+
+    with engine.connect() as connection:
+        connection.execute(text("select 1"))
+        assert _sample("plm_db_pool_checked_out", labels) == 1
+
+    assert _sample("plm_db_pool_checked_out", labels) == 0
+
+
+def test_instrument_pool_ignores_pools_without_size():
+    engine = create_engine("sqlite://", poolclass=NullPool)
+
+    instrument_pool(engine, "unsized")
+
+    assert REGISTRY.get_sample_value("plm_db_pool_size", {"pool": "unsized"}) is None
+
+
+def test_metrics_endpoint():
+    client.get("/items/1")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/items/{itemId}"' in response.text
+    assert "plm_db_queries_total" in response.text
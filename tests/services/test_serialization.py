@@ -0,0 +1,98 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from plm.enums import TaskStatus, TaskTypes
+from plm.models import Task
+from plm.schemas import CursorPage, Page, PersonalNoteSparseResponse, TaskResponse
+from plm.services.serialization import page_response, to_json_dict
+
+tasks = [
+    Task(
+        id=1,
+        created_by="test@localdev.com",
+        created_on=datetime(2026, 1, 1, 12, 30, 15, 123456),
+        modified_by="other@localdev.com",
+        modified_on=datetime(2026, 1, 2),
+        name=" Tâche « 1 » ",
+        status=TaskStatus.ToDo,
+        type=TaskTypes.Work,
+        user_id="user-1",
+        correspondence_email_address="user@email.com",
+    ),
+    Task(
+        id=2,
+        created_by="test@localdev.com",
+        created_on=datetime(2026, 1, 1),
+        name='Task "2"\n',
+        status="Done",
+        type="Personal",
+        user_id="user-1",
+        correspondence_email_address="user@email.com",
+    ),
+]
+
+app = FastAPI()
+
+
+@app.get(
+    "/validated", response_model=Page[TaskResponse], response_model_exclude_none=True
+)
+def validated():
+    return Page(items=tasks, total=2, limit=50, offset=0)
+
+
+@app.get("/fast", response_model=Page[TaskResponse], response_model_exclude_none=True)
+def fast():
+    return page_response(Page(items=tasks, total=2, limit=50, offset=0), TaskResponse)
+
+
+@app.get(
+    "/validated-cursor",
+    response_model=CursorPage[TaskResponse],
+    response_model_exclude_none=True,
+)
+def validated_cursor():
+    return CursorPage(items=tasks, next_cursor="abc")
+
+
+@app.get(
+    "/fast-cursor",
+    response_model=CursorPage[TaskResponse],
+    response_model_exclude_none=True,
+)
+def fast_cursor():
+    return page_response(CursorPage(items=tasks, next_cursor="abc"), TaskResponse)
+
+
+client = TestClient(app)
+
+
+def test_to_json_dict_leaves_out_missing_and_none_fields():
+    row = SimpleNamespace(id=1, name="Note", modified_on=None)
+
+    assert to_json_dict(PersonalNoteSparseResponse, row) == {"id": 1, "name": "Note"}
+
+
+def test_page_response_is_byte_compatible():
+    expected = client.get("/validated")
+    response = client.get("/fast")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == expected.headers["content-type"]
+    assert response.content == expected.content
+
+
+def test_cursor_page_response_is_byte_compatible():
+    assert client.get("/fast-cursor").content == client.get("/validated-cursor").content
+
+
+def test_page_response_headers():
+    response = page_response(
+        Page(items=[], total=0, limit=50, offset=0), TaskResponse, {"ETag": '"1"'}
+    )
+
+    assert response.headers["etag"] == '"1"'
+    assert response.body == b'{"items":[],"total":0,"limit":50,"offset":0}'
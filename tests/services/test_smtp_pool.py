@@ -0,0 +1,183 @@
+import smtplib
+import socket
+from unittest.mock import MagicMock
+
+import pytest
+
+from plm.services.email_service import connect_email_client
+from plm.services.smtp_pool import SmtpConnectionPool
+from plm.settings import PlmSettings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def healthy_client():
+    client = MagicMock()
+    client.noop.return_value = (250, b"OK")
+    return client
+
+
+def test_connection_is_reused():
+    client = healthy_client()
+    connect = MagicMock(return_value=client)
+    pool = SmtpConnectionPool(connect)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second is client
+    connect.assert_called_once_with()
+    client.noop.assert_called_once_with()
+    assert pool.idle_count() == 1
+
+
+def test_unhealthy_connection_is_replaced():
+    broken = MagicMock()
+    broken.noop.side_effect = smtplib.SMTPServerDisconnected()
+    replacement = healthy_client()
+    connect = MagicMock(side_effect=[broken, replacement])
+    pool = SmtpConnectionPool(connect)
+
+    with pool.connection():
+        pass
+    with pool.connection() as client:
+        pass
+
+    assert client is replacement
+    broken.quit.assert_called_once_with()
+
+
+def test_idle_connection_expires():
+    old = healthy_client()
+    new = healthy_client()
+    clock = FakeClock()
+    pool = SmtpConnectionPool(
+        MagicMock(side_effect=[old, new]), idle_timeout=60, clock=clock
+    )
+
+    with pool.connection():
+        pass
+    clock.now = 61
+    with pool.connection() as client:
+        pass
+
+    assert client is new
+    old.noop.assert_not_called()
+    old.quit.assert_called_once_with()
+
+
+def test_connection_failing_while_borrowed_is_discarded():
+    client = healthy_client()
+    pool = SmtpConnectionPool(MagicMock(return_value=client))
+
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        with pool.connection():
+            raise smtplib.SMTPServerDisconnected()
+
+    assert pool.idle_count() == 0
+    client.quit.assert_called_once_with()
+
+
+def test_connection_is_returned_on_other_errors():
+    pool = SmtpConnectionPool(MagicMock(return_value=healthy_client()))
+
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError()
+
+    assert pool.idle_count() == 1
+
+
+def test_pool_is_bounded():
+    pool = SmtpConnectionPool(MagicMock(side_effect=healthy_client), max_size=1)
+
+    with pool.connection():
+        with pytest.raises(TimeoutError):
+            with pool.connection(timeout=0.01):
+                pass
+
+    with pool.connection(timeout=0.01):
+        pass
+
+
+def test_close():
+    client = healthy_client()
+    pool = SmtpConnectionPool(MagicMock(return_value=client))
+    with pool.connection():
+        pass
+
+    pool.close()
+
+    assert pool.idle_count() == 0
+    client.quit.assert_called_once_with()
+
+
+def test_pool_against_local_smtp_server():
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    from aiosmtpd.handlers import Sink
+    from aiosmtpd.smtp import AuthResult
+
+    class Handler(Sink):
+        def __init__(self):
+            self.messages = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages.append(envelope)
+            return "250 OK"
+
+    logins = []
+
+    def authenticator(server, session, envelope, mechanism, auth_data):
+        logins.append(auth_data.login)
+        return AuthResult(success=auth_data.password == b"email-password")
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    handler = Handler()
+    controller = controller_module.Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=port,
+        authenticator=authenticator,
+        auth_require_tls=False,
+    )
+    controller.start()
+
+    try:
+        settings = PlmSettings(
+            db_username="user",
+            db_name="name",
+            local_db_host="host",
+            local_db_port=513,
+            smtp_server="127.0.0.1",
+            smtp_port=port,
+            smtp_use_starttls=False,
+            plm_email_address="plm@localhost",
+            plm_email_password="email-password",
+        )
+        pool = SmtpConnectionPool(lambda: connect_email_client(settings))
+
+        for i in range(3):
+            with pool.connection() as smtp:
+                smtp.sendmail(
+                    from_addr=smtp.sender_email_address,
+                    to_addrs="user@localhost",
+                    msg=f"Subject: Test {i}\n\nBody",
+                )
+
+        pool.close()
+    finally:
+        controller.stop()
+
+    assert len(handler.messages) == 3
+    assert logins == [b"plm@localhost"]
@@ -1,7 +1,10 @@
 import pytest
 from fastapi import HTTPException
 
-from plm.services.validation_exceptions import raise_validation_exception
+from plm.services.validation_exceptions import (
+    raise_validation_exception,
+    collect_validation_errors,
+)
 
 
 def test_raise_single_error():
@@ -49,3 +52,32 @@ def test_raise_error_with_multiple_properties():
             "properties": ["message prop 1", "message prop 2"],
         }
     ]
+
+
+def test_collect_validation_errors():
+    def failing_check():
+        raise_validation_exception("first", "name")
+
+    def passing_check():
+        pass
+
+    def other_failing_check():
+        raise_validation_exception(["second", "third"])
+
+    assert collect_validation_errors(
+        failing_check, passing_check, other_failing_check
+    ) == [
+        {"message": "first", "properties": ["name"]},
+        {"message": "second"},
+        {"message": "third"},
+    ]
+
+
+def test_collect_validation_errors_does_not_swallow_other_errors():
+    def not_found():
+        raise HTTPException(404)
+
+    with pytest.raises(HTTPException) as excinfo:
+        collect_validation_errors(not_found)
+
+    assert excinfo.value.status_code == 404
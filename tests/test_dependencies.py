@@ -1,11 +1,14 @@
 from plm.dependencies import (
+    _dependencies,
     initialize_dependencies,
     reset_dependencies,
-    get_email_client,
+    close_dependencies,
+    get_smtp_pool,
     get_settings,
     get_auth0_user,
     get_calling_user,
     get_db,
+    get_async_db,
     get_db_without_user,
     PermissionCheck,
 )
@@ -96,13 +99,11 @@ async def test_get_auth0_user_without_authentication_as_admin():
         reset_dependencies()
 
 
-@patch("plm.dependencies.EmailSenderClient")
-def test_get_email_client(mock_email_client):
+@patch("plm.dependencies.connect_email_client")
+def test_get_smtp_pool(mock_connect_email_client):
     reset_dependencies()
 
     try:
-        mocked_client = MagicMock()
-        mocked_client.starttls = MagicMock()
         settings = PlmSettings(
             db_username="user",
             db_name="name",
@@ -113,14 +114,40 @@ def test_get_email_client(mock_email_client):
             smtp_port=123,
             plm_email_address="test@localhost.dev",
             plm_email_password="email-password",
+            smtp_pool_size=2,
+            smtp_pool_idle_timeout=30,
         )
         initialize_dependencies(settings, None)
-        mock_email_client.return_value.__enter__.return_value = mocked_client
 
-        email_client = next(get_email_client(settings))
+        smtp_pool = get_smtp_pool(settings)
 
-        assert email_client == mocked_client
+        assert smtp_pool.max_size == 2
+        assert smtp_pool.idle_timeout == 30
+        assert get_smtp_pool(settings) is smtp_pool
+        mock_connect_email_client.assert_not_called()
 
+        smtp_pool._connect()
+
+        mock_connect_email_client.assert_called_once_with(settings)
+    finally:
+        reset_dependencies()
+
+
+def test_close_dependencies():
+    reset_dependencies()
+
+    try:
+        smtp_pool = MagicMock()
+        initialize_dependencies(None, None)
+        close_dependencies()
+
+        smtp_pool.close.assert_not_called()
+
+        initialize_dependencies(None, None)
+        _dependencies["smtp_pool"] = smtp_pool
+        close_dependencies()
+
+        smtp_pool.close.assert_called_once_with()
     finally:
         reset_dependencies()
 
@@ -162,6 +189,32 @@ def test_get_db(mock_session):
         reset_dependencies()
 
 
+@pytest.mark.anyio
+@patch("plm.dependencies.AsyncSessionWithUser")
+async def test_get_async_db(mock_session):
+    reset_dependencies()
+
+    try:
+        user = "user"
+        session = MagicMock()
+        async_engine = "async_engine"
+        mock_session.return_value.__aenter__.return_value = session
+        initialize_dependencies(None, None, async_engine)
+
+        db_generator = get_async_db(user)
+        db = await db_generator.__anext__()
+
+        mock_session.assert_called_once_with(async_engine)
+        assert db == session
+        session.set_user.assert_called_once_with(user)
+
+        with pytest.raises(StopAsyncIteration):
+            await db_generator.__anext__()
+        mock_session.return_value.__aexit__.assert_called_once()
+    finally:
+        reset_dependencies()
+
+
 @patch("plm.dependencies.Session")
 def test_get_db_without_user(mock_session):
     reset_dependencies()
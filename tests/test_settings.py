@@ -38,3 +38,54 @@ def test_all_values():
     assert sut.smtp_port == 111
     assert sut.plm_email_address == "test_email_address"
     assert sut.plm_email_password == "test_email_password"
+
+
+def test_pool_defaults():
+    with patch.dict(os.environ, env_vars):
+        sut = PlmSettings()
+
+    assert sut.db_pool_size == 5
+    assert sut.db_max_overflow == 10
+    assert sut.db_pool_timeout == 30
+    assert sut.db_pool_recycle == 1800
+    assert sut.db_pool_pre_ping is True
+    assert sut.db_use_external_pooler is False
+
+
+def test_pool_values():
+    pool_env_vars = {
+        **env_vars,
+        "DB_POOL_SIZE": "20",
+        "DB_MAX_OVERFLOW": "0",
+        "DB_POOL_TIMEOUT": "5",
+        "DB_POOL_RECYCLE": "300",
+        "DB_POOL_PRE_PING": "false",
+        "DB_USE_EXTERNAL_POOLER": "true",
+    }
+
+    with patch.dict(os.environ, pool_env_vars):
+        sut = PlmSettings()
+
+    assert sut.db_pool_size == 20
+    assert sut.db_max_overflow == 0
+    assert sut.db_pool_timeout == 5
+    assert sut.db_pool_recycle == 300
+    assert sut.db_pool_pre_ping is False
+    assert sut.db_use_external_pooler is True
+
+
+def test_slow_query_threshold():
+    with patch.dict(os.environ, env_vars):
+        assert PlmSettings().db_slow_query_threshold_ms == 200
+
+    with patch.dict(os.environ, {**env_vars, "DB_SLOW_QUERY_THRESHOLD_MS": "50"}):
+        assert PlmSettings().db_slow_query_threshold_ms == 50
+
+
+def test_entity_cache_defaults():
+    with patch.dict(os.environ, env_vars):
+        sut = PlmSettings()
+
+    assert sut.entity_cache_enabled is False
+    assert sut.entity_cache_ttl == 30
+    assert sut.entity_cache_max_size == 10_000